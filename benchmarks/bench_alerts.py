@@ -0,0 +1,114 @@
+"""Microbenchmark for the price-level and price-move alert engines.
+
+Compares :class:`AlertEngine` with a linear scan over every level (what the
+original per-threshold checks cost once generalised to many levels), and
+:class:`MoveAlertEngine` with taking ``min``/``max`` over each window's
+prices on every tick.
+
+Usage: ``python benchmarks/bench_alerts.py [--ticks N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from crypto_float_monitor.alerts import AlertEngine, MoveAlertEngine, MoveRule
+
+
+class LinearAlerts:
+    def __init__(self, above: list[float], below: list[float], cooldown: float) -> None:
+        self.cooldown = cooldown
+        self.above = {level: [True, 0.0] for level in above}
+        self.below = {level: [True, 0.0] for level in below}
+
+    def update(self, price: float) -> int:
+        now = time.monotonic()
+        fired = 0
+        for level, state in self.above.items():
+            if price >= level:
+                if state[0] and now - state[1] >= self.cooldown:
+                    state[0], state[1] = False, now
+                    fired += 1
+            else:
+                state[0] = True
+        for level, state in self.below.items():
+            if price <= level:
+                if state[0] and now - state[1] >= self.cooldown:
+                    state[0], state[1] = False, now
+                    fired += 1
+            else:
+                state[0] = True
+        return fired
+
+
+class RescanMoves:
+    def __init__(self, rules: list[MoveRule]) -> None:
+        self.rules = rules
+        self.longest = max(rule.window_ms for rule in rules)
+        self.prices: list[tuple[int, float]] = []
+
+    def update(self, price: float, trade_time: int) -> int:
+        self.prices.append((trade_time, price))
+        while self.prices[0][0] <= trade_time - self.longest:
+            del self.prices[0]
+        fired = 0
+        for rule in self.rules:
+            window = [value for when, value in self.prices if when > trade_time - rule.window_ms]
+            low, high = min(window), max(window)
+            fired += price >= low * (1 + rule.percent / 100) or price <= high * (1 - rule.percent / 100)
+        return fired
+
+
+def random_walk(ticks: int, start: float = 67000.0) -> list[float]:
+    rng = random.Random(11)
+    prices = []
+    price = start
+    for _ in range(ticks):
+        price += rng.gauss(0, 4.5)
+        prices.append(round(price, 2))
+    return prices
+
+
+def per_tick_us(update, prices: list[float]) -> float:  # type: ignore[no-untyped-def]
+    start = time.perf_counter()
+    for price in prices:
+        update(price)
+    return (time.perf_counter() - start) / len(prices) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    prices = random_walk(args.ticks)
+    low, high = min(prices), max(prices)
+    print(f"{args.ticks} ticks, price range {low:.0f}-{high:.0f}")
+    for count in (2, 100, 1_000, 10_000):
+        rng = random.Random(count)
+        above = [rng.uniform(low, high) for _ in range(count // 2)]
+        below = [rng.uniform(low, high) for _ in range(count - count // 2)]
+        engine = AlertEngine(cooldown=60.0)
+        engine.set_levels(above, below)
+        linear = LinearAlerts(above, below, cooldown=60.0)
+        indexed_us = per_tick_us(engine.update, prices)
+        linear_us = per_tick_us(linear.update, prices if count <= 1_000 else prices[: args.ticks // 10])
+        print(f"{count:>6} levels: indexed {indexed_us:8.2f} us/tick   linear {linear_us:10.2f} us/tick")
+
+    # Move alerts: ticks 50 ms apart, so a 5-minute window holds 6,000 prices.
+    times = [index * 50 for index in range(len(prices))]
+    windows = (10_000, 60_000, 300_000)
+    for per_window in (1, 4, 16):
+        rules = [MoveRule(0.1 * (step + 1), window) for window in windows for step in range(per_window)]
+        deques = MoveAlertEngine(rules, cooldown=60.0)
+        rescan = RescanMoves(rules)
+        deque_us = per_tick_us(lambda index: deques.update(prices[index], times[index]), list(range(len(prices))))
+        sample = list(range(min(len(prices), 2_000)))
+        rescan_us = per_tick_us(lambda index: rescan.update(prices[index], times[index]), sample)
+        print(f"{len(rules):>6} move rules: deques {deque_us:8.2f} us/tick   rescan {rescan_us:10.2f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Cost of keeping a local order book from ``@depth@100ms`` diffs.
+
+Builds a synthetic book with the replay server's generator, snapshots it at
+each depth and replays the diffs that follow, timing decode, ``apply`` and the
+top-of-book read per event. ``dict+sort`` is the straightforward alternative:
+levels in dicts, sorted whenever the top is read.
+
+Usage: ``python benchmarks/bench_book.py [--events N] [--depths 1000,5000,20000]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from crypto_float_monitor.decoders import DepthUpdate, decode_depth_update
+from crypto_float_monitor.order_book import DepthSnapshot, OrderBook
+from crypto_float_monitor.replay_server import SyntheticBook
+
+
+class DictBook:
+    def __init__(self, snapshot: DepthSnapshot) -> None:
+        self.bids = {float(price): float(quantity) for price, quantity in snapshot.bids}
+        self.asks = {float(price): float(quantity) for price, quantity in snapshot.asks}
+
+    def apply(self, update: DepthUpdate) -> None:
+        for side, levels in ((self.bids, update.bids), (self.asks, update.asks)):
+            for price, quantity in levels:
+                if float(quantity):
+                    side[float(price)] = float(quantity)
+                else:
+                    side.pop(float(price), None)
+
+    def top(self) -> tuple[float, float]:
+        return sorted(self.bids, reverse=True)[0], sorted(self.asks)[0]
+
+
+def diff_frames(depth: int, events: int) -> tuple[DepthSnapshot, list[str]]:
+    rng = random.Random(depth)
+    price = 67000.0
+    book = SyntheticBook(price, max_levels=2 * depth)
+    snapshot = book.snapshot(depth)
+    frames = []
+    while len(frames) < events:
+        price += rng.gauss(0, 2.0)
+        diff = book.step(price)
+        if diff is None:
+            continue
+        first, bids, asks = diff
+        payload = {"e": "depthUpdate", "E": 0, "s": "BTCUSDT", "U": first, "u": book.update_id, "b": bids, "a": asks}
+        frames.append(json.dumps({"stream": "btcusdt@depth@100ms", "data": payload}, separators=(",", ":")))
+    return DepthSnapshot(int(snapshot["lastUpdateId"]), snapshot["bids"], snapshot["asks"]), frames  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--depths", default="1000,5000,20000", help="levels per side in the snapshot")
+    args = parser.parse_args()
+
+    for depth in (int(item) for item in args.depths.split(",")):
+        snapshot, frames = diff_frames(depth, args.events)
+        changes = sum(len(update.bids) + len(update.asks) for update in map(decode_depth_update, frames))  # type: ignore[union-attr]
+        started = time.perf_counter()
+        updates = [decode_depth_update(frame) for frame in frames]
+        decode_us = (time.perf_counter() - started) / len(frames) * 1e6
+
+        book = OrderBook("BTCUSDT")
+        book.load_snapshot(snapshot)
+        costs = []
+        for update in updates:
+            started = time.perf_counter()
+            book.apply(update)  # type: ignore[arg-type]
+            book.top()
+            costs.append(time.perf_counter() - started)
+        costs.sort()
+        mean_us = sum(costs) / len(costs) * 1e6
+        p99_us = costs[int(len(costs) * 0.99)] * 1e6
+
+        naive = DictBook(snapshot)
+        started = time.perf_counter()
+        for update in updates[: max(1, len(updates) // 10)]:
+            naive.apply(update)  # type: ignore[arg-type]
+            naive.top()
+        naive_us = (time.perf_counter() - started) / max(1, len(updates) // 10) * 1e6
+
+        print(
+            f"{depth:>6} levels/side, {changes / len(frames):4.1f} changes/event: decode {decode_us:6.1f} us   "
+            f"apply+top {mean_us:6.1f} us (p99 {p99_us:6.1f}, max {costs[-1] * 1e6:7.1f})   dict+sort {naive_us:9.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Microbenchmark for the trade frame decoders.
+
+Usage: ``python benchmarks/bench_decode.py [--frames FILE] [--repeat N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from crypto_float_monitor.decoders import DECODERS, decode_trade_json
+
+DEFAULT_FRAMES = Path(__file__).resolve().parent / "data" / "btcusdt_trades.ndjson"
+
+
+def load_frames(path: Path) -> list[str]:
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def bench(decoder, frames: list[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            decoder(frame)
+    elapsed = time.perf_counter() - start
+    return len(frames) * repeat / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, default=DEFAULT_FRAMES)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    expected = [decode_trade_json(frame) for frame in frames]
+    print(f"{len(frames)} frames x {args.repeat} repeats")
+    baseline = None
+    seen: dict[object, str] = {}
+    for name, decoder in DECODERS.items():
+        if decoder in seen:
+            print(f"{name:>8}: alias of {seen[decoder]}")
+            continue
+        seen[decoder] = name
+        if [decoder(frame) for frame in frames] != expected:
+            print(f"{name:>8}: output differs from the json decoder, skipped")
+            continue
+        rate = bench(decoder, frames, args.repeat)
+        baseline = baseline or rate
+        print(f"{name:>8}: {rate:>12,.0f} msg/s  ({rate / baseline:.2f}x json)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cost of the incremental indicators per trade and of warming them up.
+
+Feeds a random walk through an :class:`IndicatorSet` trade by trade, then
+warms a fresh set up from the same trades with numpy and with the pure-Python
+fallback. ``rescan`` is the straightforward alternative for the rolling
+window: recomputing VWAP and standard deviation over the window's trades on
+every trade.
+
+Usage: ``python benchmarks/bench_indicators.py [--ticks N] [--indicators ema_1m,vwap,std_5m]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from crypto_float_monitor import indicators
+from crypto_float_monitor.indicators import IndicatorSet, parse_indicator
+
+
+def random_walk(count: int) -> tuple[list[float], list[float], list[int]]:
+    rng = random.Random(7)
+    price, trade_time = 67000.0, 1_700_000_000_000
+    prices, quantities, times = [], [], []
+    for _ in range(count):
+        price += rng.gauss(0, 2.0)
+        trade_time += int(rng.expovariate(1 / 20))  # ~50 trades/s
+        prices.append(price)
+        quantities.append(rng.expovariate(20))
+        times.append(trade_time)
+    return prices, quantities, times
+
+
+def rescan_us(prices: list[float], quantities: list[float], times: list[int], window_ms: int, samples: int) -> float:
+    """Per-trade cost of recomputing one window from its trades, sampled near the end."""
+    first = 0
+    started = time.perf_counter()
+    for index in range(len(times) - samples, len(times)):
+        while times[first] <= times[index] - window_ms:
+            first += 1
+        window = prices[first : index + 1]
+        volume = sum(quantities[first : index + 1])
+        sum(price * quantity for price, quantity in zip(window, quantities[first : index + 1])) / volume
+        statistics.stdev(window)
+    return (time.perf_counter() - started) / samples * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500_000)
+    parser.add_argument("--indicators", default="ema_1m,ema_15m,vwap,vwap_5m,std_1m,std_5m")
+    args = parser.parse_args()
+    names = tuple(args.indicators.split(","))
+    prices, quantities, times = random_walk(args.ticks)
+
+    live = IndicatorSet(names)
+    started = time.perf_counter()
+    for price, quantity, trade_time in zip(prices, quantities, times):
+        live.update(price, quantity, trade_time)
+    update_us = (time.perf_counter() - started) / len(times) * 1e6
+
+    warm_ms = {}
+    for label, numpy in (("numpy", indicators.load_numpy), ("python", lambda: None)):
+        saved, indicators.load_numpy = indicators.load_numpy, numpy
+        try:
+            warmed = IndicatorSet(names)
+            started = time.perf_counter()
+            warmed.warm_up(prices, quantities, times)
+            warm_ms[label] = (time.perf_counter() - started) * 1e3
+        finally:
+            indicators.load_numpy = saved
+        drift = max(abs(value - live.values()[name]) / abs(value) for name, value in warmed.values().items())
+        warm_ms[label + " drift"] = drift
+
+    print(f"{len(names)} indicators ({', '.join(names)}), {len(times):,} trades")
+    print(f"  update       {update_us:7.2f} us/trade")
+    print(f"  warm-up      numpy {warm_ms['numpy']:8.1f} ms   python {warm_ms['python']:8.1f} ms")
+    print(f"  max relative difference from trade-by-trade: {max(warm_ms['numpy drift'], warm_ms['python drift']):.1e}")
+    windows = sorted({span for kind, span in map(parse_indicator, names) if kind == "std" and span})
+    for window_ms in windows:
+        print(f"  rescan {window_ms // 1000:>4}s window: {rescan_us(prices, quantities, times, window_ms, 2_000):9.1f} us/trade")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""GUI-thread cost of showing one price update.
+
+Replays the prices of recorded trades into the price text and times each
+update together with the repaint it causes (``processEvents`` after every
+call). ``label`` is the previous path: ``QLabel.setStyleSheet`` plus three
+chained ``replace`` calls for BRL on every update; ``display`` and
+``display+glyphs`` are :class:`PriceDisplay` without and with its glyph cache.
+Runs offscreen unless ``QT_QPA_PLATFORM`` is already set.
+
+Usage: ``python benchmarks/bench_render.py [--frames FILE] [--currency R$] [--updates N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6 import QtCore, QtGui, QtWidgets  # noqa: E402
+
+from crypto_float_monitor.decoders import decode_trade_json  # noqa: E402
+from crypto_float_monitor.price_display import PriceDisplay  # noqa: E402
+
+DEFAULT_FRAMES = Path(__file__).resolve().parent / "data" / "btcusdt_trades.ndjson"
+STYLE = "background-color: rgba(20, 20, 20, 210); border-radius: 12px; padding: 8px;"
+
+
+class LabelPath:
+    """The per-update work ``FloatingPriceWidget`` did before ``PriceDisplay``."""
+
+    def __init__(self, currency: str) -> None:
+        self.currency = currency
+        self.last: float | None = None
+        self.widget = QtWidgets.QLabel("Carregando…")
+        self.widget.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.widget.setFont(QtGui.QFont("Sans Serif", 26, QtGui.QFont.Weight.Bold))
+
+    def update(self, price: float) -> None:
+        color = "#38b000"
+        if self.last is not None:
+            if price > self.last:
+                color = "#38b000"
+            elif price < self.last:
+                color = "#ff4d4f"
+        self.widget.setStyleSheet(f"color: {color};")
+        formatted = f"{price:,.2f}"
+        if self.currency == "R$":
+            formatted = formatted.replace(",", "v").replace(".", ",").replace("v", ".")
+        prefix = f"{self.currency} " if self.currency else ""
+        self.widget.setText(f"{prefix}{formatted}".strip())
+        self.last = price
+
+
+def load_prices(path: Path) -> list[float]:
+    prices = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        tick = decode_trade_json(line) if line else None
+        if tick is not None:
+            prices.append(tick.price)
+    return prices
+
+
+def per_update_us(app: QtWidgets.QApplication, host: QtWidgets.QWidget, update: Callable[[float], object], prices: list[float]) -> float:
+    for price in prices[:200]:  # warm caches and the backing store
+        update(price)
+        app.processEvents()
+    start = time.perf_counter()
+    for price in prices:
+        update(price)
+        app.processEvents()
+    return (time.perf_counter() - start) / len(prices) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, default=DEFAULT_FRAMES)
+    parser.add_argument("--currency", default="$", help="price prefix; R$ switches to pt-BR separators")
+    parser.add_argument("--updates", type=int, default=20_000)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication([])
+    recorded = load_prices(args.frames)
+    prices = (recorded * (args.updates // len(recorded) + 1))[: args.updates]
+    repeats = sum(1 for previous, price in zip(prices, prices[1:]) if previous == price)
+    print(f"{len(prices)} updates, {repeats / len(prices):.0%} repeat the previous price, currency {args.currency!r}")
+
+    label = LabelPath(args.currency)
+    candidates: list[tuple[str, QtWidgets.QWidget, Callable[[float], object]]] = [("label", label.widget, label.update)]
+    for name, glyphs in (("display", False), ("display+glyphs", True)):
+        display = PriceDisplay(args.currency, glyph_cache=glyphs)
+        candidates.append((name, display, display.set_price))
+
+    baseline = None
+    for name, widget, update in candidates:
+        host = QtWidgets.QWidget()
+        host.setStyleSheet(STYLE)
+        layout = QtWidgets.QVBoxLayout(host)
+        layout.addWidget(widget)
+        host.setFixedWidth(300)
+        host.show()
+        cost = per_update_us(app, host, update, prices)
+        baseline = baseline or cost
+        print(f"{name:>15}: {cost:8.1f} us/update  ({baseline / cost:.2f}x label)")
+        host.close()
+
+
+if __name__ == "__main__":
+    main()
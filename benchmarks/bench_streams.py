@@ -0,0 +1,163 @@
+"""Bandwidth and CPU cost of each stream kind, engine and compression setting.
+
+Starts the local replay server with permessage-deflate enabled and, for every
+mode, runs a bare streaming core in its own process behind a TCP proxy that
+counts the bytes on the wire. For each mode it reports events per second,
+the frame text received (after decompression), the bytes on the wire and the
+client's CPU time per second of streaming (ms/s, i.e. thousandths of a core).
+The replay server is a stand-in: on the exchange the ratios between the kinds
+depend on the pair, ``bookTicker`` in particular can outpace trades on busy
+books.
+
+Usage: ``python benchmarks/bench_streams.py [--rate 500] [--seconds 5] [--kinds trade,miniTicker] [--json]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from crypto_float_monitor import metrics
+from crypto_float_monitor.decoders import STREAM_KINDS
+from crypto_float_monitor.loadtest import _free_port
+from crypto_float_monitor.stream_core import StreamSettings, create_stream
+
+# engine, compression; websocket-client cannot negotiate permessage-deflate.
+ENGINES = (("thread", False), ("asyncio", False), ("asyncio", True))
+
+
+class CountingProxy:
+    """Forwards TCP connections to ``upstream`` and counts the bytes sent back to clients."""
+
+    def __init__(self, upstream: tuple[str, int]) -> None:
+        self._upstream = upstream
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        self.received = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def take(self) -> int:
+        with self._lock:
+            received, self.received = self.received, 0
+        return received
+
+    def _accept(self) -> None:
+        while True:
+            client, _ = self._listener.accept()
+            server = socket.create_connection(self._upstream)
+            threading.Thread(target=self._pipe, args=(client, server, False), daemon=True).start()
+            threading.Thread(target=self._pipe, args=(server, client, True), daemon=True).start()
+
+    def _pipe(self, source: socket.socket, target: socket.socket, count: bool) -> None:
+        try:
+            while data := source.recv(65536):
+                target.sendall(data)
+                if count:
+                    with self._lock:
+                        self.received += len(data)
+        except OSError:
+            pass
+        finally:
+            for sock in (source, target):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+def run_client(base_url: str, kind: str, engine: str, compression: bool, symbols: list[str], seconds: float) -> None:
+    """Child process: stream for ``seconds`` and print what it cost as JSON."""
+    registry = metrics.enable()
+    settings = StreamSettings(
+        symbol=symbols[0],
+        watchlist=tuple(symbols[1:]),
+        base_url=base_url,
+        engine=engine,
+        stream_kind=kind,
+        compression=compression,
+    )
+    core = create_stream(settings, on_update=lambda: None)
+    started_cpu = time.process_time()
+    core.start()
+    time.sleep(seconds)
+    core.stop()
+    cpu = time.process_time() - started_cpu
+    frames = registry.get("cfm_messages_received_total")
+    text = registry.get("cfm_received_bytes_total")
+    print(json.dumps({"frames": frames.value if frames else 0, "text": text.value if text else 0, "cpu": cpu}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=500.0, help="trades per second on the replay server")
+    parser.add_argument("--seconds", type=float, default=5.0, help="streaming time per mode")
+    parser.add_argument("--kinds", default=",".join(STREAM_KINDS))
+    parser.add_argument("--symbols", default="BTCUSDT,ETHUSDT")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--client", nargs=4, metavar=("URL", "KIND", "ENGINE", "COMPRESSION"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    symbols = args.symbols.split(",")
+    if args.client:
+        url, kind, engine, compression = args.client
+        run_client(url, kind, engine, compression == "1", symbols, args.seconds)
+        return
+
+    port = _free_port()
+    command = [sys.executable, "-m", "crypto_float_monitor.replay_server", "--port", str(port)]
+    server = subprocess.Popen([*command, "--rate", str(args.rate), "--compression"], stdout=subprocess.PIPE, text=True)
+    assert server.stdout is not None
+    if not server.stdout.readline().startswith("ready"):
+        server.kill()
+        raise SystemExit("replay server failed to start")
+    proxy = CountingProxy(("127.0.0.1", port))
+    results = []
+    try:
+        for kind in args.kinds.split(","):
+            for engine, compression in ENGINES:
+                proxy.take()
+                child = subprocess.run(
+                    [
+                        sys.executable, __file__, "--seconds", str(args.seconds), "--symbols", args.symbols,
+                        "--client", f"ws://127.0.0.1:{proxy.port}/ws", kind, engine, "1" if compression else "0",
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                usage = json.loads(child.stdout.splitlines()[-1])
+                results.append(
+                    {
+                        "kind": kind,
+                        "engine": engine,
+                        "compression": compression,
+                        "events_per_s": usage["frames"] / args.seconds,
+                        "text_kb_per_s": usage["text"] / args.seconds / 1024,
+                        "wire_kb_per_s": proxy.take() / args.seconds / 1024,
+                        "cpu_ms_per_s": usage["cpu"] / args.seconds * 1000,
+                    }
+                )
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"replay server at {args.rate:g} trades/s over {len(symbols)} pairs, {args.seconds:g}s per mode")
+    print(f"{'kind':<12}{'engine':<17}{'events/s':>9}{'text KB/s':>11}{'wire KB/s':>11}{'CPU ms/s':>10}")
+    for row in results:
+        engine = f"{row['engine']}{' + deflate' if row['compression'] else ''}"
+        print(
+            f"{row['kind']:<12}{engine:<17}{row['events_per_s']:9,.0f}{row['text_kb_per_s']:11,.1f}"
+            f"{row['wire_kb_per_s']:11,.1f}{row['cpu_ms_per_s']:10,.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
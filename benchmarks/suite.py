@@ -0,0 +1,319 @@
+"""Hot-path benchmark suite with a stored baseline.
+
+Every case replays the recorded frames in ``benchmarks/data`` through one hot
+path and reports nanoseconds per operation:
+
+* ``decode.*`` - the trade decoders, and ``stream.handle_message``: a raw frame
+  through ``StreamCore._handle_message`` (decode, dedupe, history, candles,
+  coalescer), what every engine runs per message;
+* ``alerts.*`` - the level engine alone and ``FloatingPriceWidget._maybe_trigger_alert``
+  with levels and move alerts configured;
+* ``format.<currency>`` - :class:`PriceFormatter` for every currency prefix the
+  widget uses, over the recorded prices (``.cold`` with its cache disabled);
+* ``widget.price_update`` - ``FloatingPriceWidget._handle_price_update`` under
+  the offscreen Qt platform, ``.paint`` including the repaint it causes;
+* ``config.*`` - ``load_config`` and a ``save_alerts`` + ``load_config`` round trip
+  in a scratch config directory.
+
+Each case runs ``--rounds`` times, every round followed by a round of a fixed
+pure-Python calibration loop. A round's cost relative to the calibration
+round next to it cancels out most of what the machine's speed does between
+runs (frequency scaling, a busy neighbour); the median of those ratios is the
+case's ``relative`` cost. Results are printed as a table and, with ``--json``,
+written as JSON. When the baseline file exists, any case whose relative cost
+exceeds its baseline by more than ``--margin`` (a fraction: ``0.5`` is 50%)
+makes the run exit with status 1. Wall-clock nanoseconds are reported too, but
+only the relative costs are compared, so the gate catches slowdowns of a path
+rather than of the machine. ``config.save_alerts`` writes and renames a file
+on every operation, so the disk's latency, which calibration cannot see,
+dominates it; it gets twice the margin. Refresh the baseline with ``--save-baseline``
+after a deliberate change to a hot path.
+
+Usage: ``python benchmarks/suite.py [--only PREFIX] [--rounds N] [--json FILE]
+[--baseline FILE] [--margin 0.5] [--save-baseline]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# The config cases write here; set before anything reads the config location.
+_CONFIG_HOME = tempfile.mkdtemp(prefix="cfm-bench-")
+os.environ["XDG_CONFIG_HOME"] = _CONFIG_HOME
+atexit.register(shutil.rmtree, _CONFIG_HOME, True)
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+from crypto_float_monitor import config  # noqa: E402
+from crypto_float_monitor.alerts import AlertEngine, MoveRule  # noqa: E402
+from crypto_float_monitor.archive_replay import ArchiveReplayStream  # noqa: E402
+from crypto_float_monitor.decoders import decode_trade_json, get_decoder  # noqa: E402
+from crypto_float_monitor.price_display import PriceFormatter  # noqa: E402
+from crypto_float_monitor.stream_core import StreamSettings, ThreadedStream  # noqa: E402
+from crypto_float_monitor.widget import FloatingPriceWidget  # noqa: E402
+
+DATA = Path(__file__).resolve().parent / "data"
+DEFAULT_FRAMES = DATA / "btcusdt_trades.ndjson"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+CURRENCIES = ("$", "R$", "€", "")  # every prefix FloatingPriceWidget._currency_for_symbol returns
+FORMAT_VERSION = 2
+CALIBRATION_OPS = 2000
+DISK_BOUND = frozenset({"config.save_alerts"})  # compared with twice the margin
+
+# A case is built once from the frames and returns a callable that runs one
+# round and reports how many operations it performed.
+Round = Callable[[], int]
+
+
+class Cases:
+    def __init__(self, frames: list[str]) -> None:
+        self.frames = frames
+        ticks = [decode_trade_json(frame) for frame in frames]
+        self.prices = [tick.price for tick in ticks if tick is not None]
+        self.times = [tick.trade_time for tick in ticks if tick is not None]
+        self._app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([sys.argv[0]])
+        self._widget: FloatingPriceWidget | None = None
+
+    def build(self) -> dict[str, Callable[[], Round]]:
+        cases: dict[str, Callable[[], Round]] = {
+            "decode.fast": lambda: self._decode("fast"),
+            "decode.json": lambda: self._decode("json"),
+            "stream.handle_message": self._handle_message,
+            "alerts.levels": self._alert_levels,
+            "alerts.widget": self._widget_alerts,
+        }
+        for currency in CURRENCIES:
+            label = currency or "none"
+            cases[f"format.{label}"] = lambda currency=currency: self._format(currency, 4096)
+            cases[f"format.{label}.cold"] = lambda currency=currency: self._format(currency, 0)
+        cases["widget.price_update"] = lambda: self._price_update(paint=False)
+        cases["widget.price_update.paint"] = lambda: self._price_update(paint=True)
+        cases["config.load"] = self._config_load
+        cases["config.save_alerts"] = self._config_save
+        return cases
+
+    # ------------------------------------------------------------------
+    # Cases
+    # ------------------------------------------------------------------
+    def _decode(self, name: str) -> Round:
+        decode, frames = get_decoder(name), self.frames
+
+        def run() -> int:
+            for frame in frames:
+                decode(frame)
+            return len(frames)
+
+        return run
+
+    def _handle_message(self) -> Round:
+        core, frames = ThreadedStream(StreamSettings()), self.frames
+
+        def run() -> int:
+            # Otherwise every round after the first would only hit the duplicate check.
+            core._last_trade_ids.clear()
+            for frame in frames:
+                core._handle_message(frame)
+            core.drain()
+            return len(frames)
+
+        return run
+
+    def _alert_levels(self) -> Round:
+        engine, prices = AlertEngine(cooldown=60.0), self.prices
+        low, high = min(prices), max(prices)
+        step = (high - low) / 10
+        engine.set_levels([low + step * index for index in range(1, 10, 2)], [low + step * index for index in range(2, 10, 2)])
+
+        def run() -> int:
+            for price in prices:
+                engine.update(price)
+            return len(prices)
+
+        return run
+
+    def _widget_alerts(self) -> Round:
+        widget, prices, times = self._get_widget(), self.prices, self.times
+        low, high = min(prices), max(prices)
+        widget._set_alert_thresholds([high * 0.999, high], [low, low * 1.001])
+        widget._move_engine.set_rules([MoveRule(0.05, 5_000), MoveRule(0.2, 60_000), MoveRule(1.0, 300_000)])
+        widget._play_alert = lambda *_args: None  # type: ignore[method-assign]
+
+        def run() -> int:
+            for price, trade_time in zip(prices, times):
+                widget._maybe_trigger_alert(price, trade_time)
+            return len(prices)
+
+        return run
+
+    def _format(self, currency: str, max_entries: int) -> Round:
+        formatter, prices = PriceFormatter(currency, max_entries), self.prices
+
+        def run() -> int:
+            for price in prices:
+                formatter(price)
+            return len(prices)
+
+        return run
+
+    def _price_update(self, paint: bool) -> Round:
+        widget, prices, app = self._get_widget(), self.prices, self._app
+
+        def run() -> int:
+            for price in prices:
+                widget._handle_price_update(price)
+                if paint:
+                    app.processEvents()
+            return len(prices)
+
+        return run
+
+    def _config_load(self) -> Round:
+        config.ensure_config_file()
+
+        def run() -> int:
+            for _ in range(50):
+                config.load_config(create=False)
+            return 50
+
+        return run
+
+    def _config_save(self) -> Round:
+        config.ensure_config_file()
+        above = tuple(self.prices[:3])
+        below = tuple(self.prices[3:6])
+        moves = (MoveRule(1.5, 60_000), MoveRule(3.0, 300_000))
+
+        def run() -> int:
+            for _ in range(20):
+                config.save_alerts(above, below, moves)
+                config.load_config(create=False)
+            return 20
+
+        return run
+
+    def _get_widget(self) -> FloatingPriceWidget:
+        if self._widget is None:
+            # An empty archive stands in for the network: the widget gets a
+            # real core whose replay finishes immediately.
+            settings = StreamSettings(engine="replay")
+            core = ArchiveReplayStream(settings, root=Path(_CONFIG_HOME) / "no-ticks")
+            self._widget = FloatingPriceWidget(core=core)
+            # Marks the first price as shown, so no audio preload gets scheduled.
+            self._widget._price_shown = True
+            self._widget.show()
+            self._app.processEvents()
+        return self._widget
+
+
+def calibration() -> int:
+    """A fixed mix of what the hot paths do (dict lookups, float arithmetic, formatting)."""
+    table: dict[int, float] = {}
+    text = 0
+    for index in range(CALIBRATION_OPS):
+        key = index & 63
+        table[key] = table.get(key, 0.0) + index * 0.5
+        text += len(f"{table[key]:,.2f}")
+    return CALIBRATION_OPS
+
+
+def _timed(run: Round) -> float:
+    started = time.perf_counter_ns()
+    operations = run()
+    return (time.perf_counter_ns() - started) / operations
+
+
+def _median(values: list[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def measure(run: Round, rounds: int) -> dict[str, float]:
+    operations = run()  # warm caches and lazy imports
+    calibration()
+    samples, ratios = [], []
+    for _ in range(rounds):
+        sample = _timed(run)
+        samples.append(sample)
+        ratios.append(sample / _timed(calibration))
+    return {
+        "ops": operations,
+        "best_ns": round(min(samples), 1),
+        "median_ns": round(_median(samples), 1),
+        "relative": round(_median(ratios), 4),
+    }
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], margin: float) -> list[str]:
+    """Names of the cases whose relative cost exceeds their baseline's by more than ``margin``."""
+    slower = []
+    for name, result in results.items():
+        reference = baseline.get(name, {}).get("relative")
+        allowed = margin * 2 if name in DISK_BOUND else margin
+        if reference is not None and result["relative"] > reference * (1 + allowed):
+            slower.append(name)
+    return slower
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=Path, default=DEFAULT_FRAMES)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--only", default="", help="run only the cases whose name starts with this prefix")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--margin", type=float, default=0.5, help="allowed slowdown over the baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+
+    frames = [line for line in args.frames.read_text(encoding="utf-8").splitlines() if line]
+    cases = {name: build for name, build in Cases(frames).build().items() if name.startswith(args.only)}
+    baseline: dict[str, dict[str, float]] = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'case':<28}{'best ns/op':>12}{'median':>12}{'relative':>10}{'baseline':>10}{'change':>9}")
+    for name, build in cases.items():
+        result = results[name] = measure(build(), args.rounds)
+        reference = baseline.get(name, {}).get("relative")
+        change = f"{result['relative'] / reference - 1:+8.0%}" if reference else "     new"
+        reference_text = f"{reference:10,.2f}" if reference else f"{'-':>10}"
+        print(
+            f"{name:<28}{result['best_ns']:12,.0f}{result['median_ns']:12,.0f}"
+            f"{result['relative']:10,.2f}{reference_text}{change:>9}"
+        )
+
+    report = {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frames": args.frames.name,
+        "rounds": args.rounds,
+        "results": results,
+    }
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return
+    regressions = compare(results, baseline, args.margin)
+    if regressions:
+        print(f"Slower than the baseline by more than {args.margin:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Alert sounds decoded once to PCM and replayed with low latency.
+
+QtMultimedia is imported lazily (see ``FloatingPriceWidget``), so nothing here
+runs before the first price is on screen. When it cannot be loaded (no audio
+backend, a missing ``libpulse``), alerts carry on silently.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import wave
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+from PyQt6 import QtCore
+
+from .config import data_dir
+from .metrics import registry
+
+if TYPE_CHECKING:
+    from PyQt6.QtMultimedia import QAudioBuffer, QMediaPlayer, QSoundEffect
+
+DEBUG = False
+
+COALESCE_WINDOW = 0.3  # seconds; alerts of one key inside it share a single sound
+AUDIO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# What a broken QtMultimedia import or backend raises; raised inside a Qt slot they would abort the process.
+AUDIO_ERRORS = (ImportError, OSError, RuntimeError)
+
+
+def wav_cache_path(source: Path) -> Path:
+    """Cached PCM copy of ``source``; size and mtime in the name invalidate it when the asset changes."""
+    stat = source.stat()
+    return data_dir() / "sounds" / f"{source.stem}-{stat.st_size}-{int(stat.st_mtime)}.wav"
+
+
+def write_wav(path: Path, pcm: bytes, sample_rate: int, channels: int, sample_width: int) -> None:
+    """Write PCM as a WAV file atomically (temp file plus rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle, wave.open(handle, "wb") as out:
+            out.setnchannels(channels)
+            out.setsampwidth(sample_width)
+            out.setframerate(sample_rate)
+            out.writeframes(pcm)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _to_pcm(data: bytes, sample_format: str) -> tuple[bytes, int]:
+    """Decoder output as WAV-compatible PCM: ``(frames, sample width)``."""
+    if sample_format == "UInt8":
+        return data, 1
+    if sample_format == "Int16":
+        return data, 2
+    samples = array("h")
+    if sample_format == "Int32":
+        samples.extend(value >> 16 for value in array("i", data))
+    elif sample_format == "Float":
+        samples.extend(int(max(-1.0, min(1.0, value)) * 32767) for value in array("f", data))
+    else:
+        raise ValueError(f"unsupported sample format: {sample_format}")
+    return samples.tobytes(), 2
+
+
+class _PcmDecoder(QtCore.QObject):
+    """Decodes one compressed file with ``QAudioDecoder`` into a WAV file."""
+
+    done = QtCore.pyqtSignal(object)  # Path of the WAV, or None on failure
+
+    def __init__(self, source: Path, target: Path, parent: QtCore.QObject) -> None:
+        from PyQt6.QtMultimedia import QAudioDecoder
+
+        super().__init__(parent)
+        self._target = target
+        self._chunks: list[bytes] = []
+        self._format: tuple[int, int, str] | None = None
+        self._finished = False
+        self._decoder = QAudioDecoder(self)
+        self._decoder.bufferReady.connect(self._read)
+        self._decoder.finished.connect(self._finish)
+        self._decoder.error.connect(self._fail)
+        self._decoder.setSource(QtCore.QUrl.fromLocalFile(str(source)))
+        self._decoder.start()
+
+    def _read(self) -> None:
+        buffer: QAudioBuffer = self._decoder.read()
+        if not buffer.isValid():
+            return
+        if self._format is None:
+            audio_format = buffer.format()
+            self._format = (audio_format.sampleRate(), audio_format.channelCount(), audio_format.sampleFormat().name)
+        self._chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def _finish(self) -> None:
+        if self._finished:
+            return
+        if self._format is None:
+            self._fail()
+            return
+        self._finished = True
+        sample_rate, channels, sample_format = self._format
+        try:
+            pcm, width = _to_pcm(b"".join(self._chunks), sample_format)
+            write_wav(self._target, pcm, sample_rate, channels, width)
+        except (OSError, ValueError, wave.Error) as exc:
+            AlertAudio._log(f"Falha ao gravar {self._target}: {exc}")
+            self.done.emit(None)
+            return
+        self.done.emit(self._target)
+
+    def _fail(self, *_: object) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        AlertAudio._log(f"Falha ao decodificar áudio: {self._decoder.errorString()}")
+        self.done.emit(None)
+
+
+class _Voice:
+    """Playback state of one alert key."""
+
+    __slots__ = ("source", "effect", "player", "decoding", "burst_started", "count", "fired_at")
+
+    def __init__(self, source: Path | None) -> None:
+        self.source = source
+        self.effect: QSoundEffect | None = None
+        self.player: QMediaPlayer | None = None
+        self.decoding = False
+        self.burst_started = 0.0
+        self.count = 0
+        self.fired_at: float | None = None
+
+
+class AlertAudio(QtCore.QObject):
+    """Plays alert sounds from decoded PCM with a per-key burst window.
+
+    ``preload`` decodes every MP3 once into a WAV under ``data_dir()/sounds``
+    (reused on later runs) and loads it into a ``QSoundEffect``, which plays
+    straight from memory. Until that is ready, or if decoding fails, a
+    ``QMediaPlayer`` whose source was set during preload stands in, so no
+    alert reopens a file.
+
+    Alerts of one key within ``COALESCE_WINDOW`` of the sound starting do not
+    restart it; they add to the burst's count, reported with ``played(key,
+    count)`` so the UI can show it. The time from the alert firing until Qt
+    reports the sound playing is observed into ``cfm_alert_audio_seconds``
+    when metrics are enabled and kept in ``last_latency``.
+
+    If QtMultimedia fails to load or play, the error is logged, ``available``
+    turns false and every later alert only emits ``played``.
+    """
+
+    played = QtCore.pyqtSignal(str, int)
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None, clock: Callable[[], float] = time.perf_counter) -> None:
+        super().__init__(parent)
+        self._clock = clock
+        self._voices: dict[str, _Voice] = {}
+        self._decoders: list[_PcmDecoder] = []
+        self.last_latency: float | None = None
+        self.available = True
+        metrics = registry()
+        self._latency = (
+            metrics.histogram("cfm_alert_audio_seconds", "Alert fired to sound playing.", AUDIO_BUCKETS)
+            if metrics is not None
+            else None
+        )
+
+    def preload(self, sounds: dict[str, Path]) -> None:
+        """Decode (or load the cached PCM of) every sound ahead of the first alert."""
+        if not self.available:
+            return
+        try:
+            self._preload(sounds)
+        except AUDIO_ERRORS as exc:
+            self._disable(exc)
+
+    def play(self, key: str, path: Path | None, count: int = 1, fired_at: float | None = None) -> None:
+        """Sound ``key`` for ``count`` alerts fired at ``fired_at`` (``clock`` time, default now)."""
+        now = self._clock()
+        voice = self._voice(key, path)
+        if voice.count and now - voice.burst_started < COALESCE_WINDOW:
+            voice.count += count
+            self.played.emit(key, voice.count)
+            return
+        voice.burst_started = now
+        voice.count = count
+        self.played.emit(key, count)
+        if voice.source is None:
+            self._log(f"Arquivo de áudio para alerta '{key}' não encontrado.")
+            return
+        if not self.available:
+            return
+        voice.fired_at = now if fired_at is None else fired_at
+        if voice.effect is None and not voice.decoding:
+            self.preload({key: voice.source})  # first alert before the idle preload
+            if not self.available:
+                return
+        try:
+            self._sound(voice)
+        except AUDIO_ERRORS as exc:
+            self._disable(exc)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _preload(self, sounds: dict[str, Path]) -> None:
+        for key, path in sounds.items():
+            voice = self._voice(key, path)
+            if voice.effect is not None or voice.decoding or voice.source is None:
+                continue
+            try:
+                cached = wav_cache_path(voice.source)
+            except OSError:
+                continue
+            if cached.exists():
+                self._load_effect(voice, cached)
+                continue
+            if voice.player is None:
+                self._prime_player(voice)
+            voice.decoding = True
+            decoder = _PcmDecoder(voice.source, cached, self)
+            decoder.done.connect(lambda wav, voice=voice, decoder=decoder: self._decoded(voice, decoder, wav))
+            self._decoders.append(decoder)
+
+    def _sound(self, voice: _Voice) -> None:
+        effect = voice.effect
+        if effect is not None and effect.isLoaded():
+            effect.stop()
+            effect.play()
+            return
+        player = voice.player or self._prime_player(voice)
+        player.stop()  # rewinds without touching the source, so nothing is reopened
+        player.play()
+
+    def _disable(self, exc: BaseException) -> None:
+        self.available = False
+        self._log(f"Áudio indisponível, alertas seguem sem som: {exc}")
+
+    def _voice(self, key: str, path: Path | None) -> _Voice:
+        voice = self._voices.get(key)
+        if voice is None or voice.source != path:
+            voice = self._voices[key] = _Voice(path)
+        return voice
+
+    def _load_effect(self, voice: _Voice, wav: Path) -> None:
+        from PyQt6.QtMultimedia import QSoundEffect
+
+        effect = QSoundEffect(self)
+        effect.setVolume(1.0)
+        effect.playingChanged.connect(lambda voice=voice, effect=effect: self._started(voice, effect.isPlaying()))
+        effect.setSource(QtCore.QUrl.fromLocalFile(str(wav)))
+        voice.effect = effect
+
+    def _prime_player(self, voice: _Voice) -> QMediaPlayer:
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+
+        output = QAudioOutput(self)
+        output.setVolume(1.0)
+        player = QMediaPlayer(self)
+        player.setAudioOutput(output)
+        player.setSource(QtCore.QUrl.fromLocalFile(str(voice.source)))
+        player.playbackStateChanged.connect(
+            lambda state, voice=voice: self._started(voice, state == QMediaPlayer.PlaybackState.PlayingState)
+        )
+        voice.player = player
+        return player
+
+    def _decoded(self, voice: _Voice, decoder: _PcmDecoder, wav: Path | None) -> None:
+        self._decoders.remove(decoder)
+        decoder.deleteLater()
+        voice.decoding = False
+        # The key may have been pointed at another file while decoding ran.
+        if wav is not None and self.available and any(current is voice for current in self._voices.values()):
+            try:
+                self._load_effect(voice, wav)
+            except AUDIO_ERRORS as exc:
+                self._disable(exc)
+
+    def _started(self, voice: _Voice, playing: bool) -> None:
+        if not playing or voice.fired_at is None:
+            return
+        latency = self._clock() - voice.fired_at
+        voice.fired_at = None
+        self.last_latency = latency
+        if self._latency is not None:
+            self._latency.observe(latency)
+        self._log(f"Alerta tocando {latency * 1000:.1f} ms após disparar")
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[AlertAudio] {message}", flush=True)
@@ -0,0 +1,476 @@
+"""Price-level, price-move and indicator alert engines, independent of Qt."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Mapping
+
+from .klines import format_interval, interval_ms
+
+ABOVE = "above"
+BELOW = "below"
+CROSSES = "crosses"
+DIRECTIONS = (ABOVE, BELOW)
+RULE_OPERATORS = (ABOVE, BELOW, CROSSES)
+PRICE = "price"  # operand name of the price itself in indicator rules
+
+
+@dataclass(frozen=True)
+class AlertHit:
+    direction: str
+    level: float
+    price: float
+
+
+@dataclass(frozen=True)
+class MoveRule:
+    """A move of ``percent`` or more within ``window_ms``, in either direction."""
+
+    percent: float
+    window_ms: int
+
+    def __str__(self) -> str:
+        return f"{self.percent:g}%/{format_interval(self.window_ms)}"
+
+
+@dataclass(frozen=True)
+class MoveHit:
+    direction: str  # ``above`` for a rise, ``below`` for a drop
+    rule: MoveRule
+    price: float
+    reference: float  # the window's low (rise) or high (drop) the move is measured from
+
+
+def parse_move_rule(text: str) -> MoveRule:
+    """Parse ``"1.5%/60s"`` (a bare number of seconds also works: ``"1.5%/60"``)."""
+    percent, _, window = text.replace(" ", "").partition("/")
+    try:
+        value = float(percent.rstrip("%"))
+        window_ms = int(window) * 1000 if window.isdigit() else interval_ms(window)
+    except ValueError:
+        raise ValueError(f"invalid move alert: {text!r} (expected e.g. 1.5%/60s)") from None
+    if value <= 0 or window_ms <= 0:
+        raise ValueError(f"invalid move alert: {text!r} (percent and window must be positive)")
+    return MoveRule(value, window_ms)
+
+
+@dataclass(frozen=True)
+class IndicatorRule:
+    """``left op factor * right``, e.g. ``price crosses vwap`` or ``std_1m above 2 * std_15m``.
+
+    Operands are ``"price"``, an indicator name or (``right`` only) a number.
+    """
+
+    left: str
+    op: str
+    right: str | float
+    factor: float = 1.0
+
+    @property
+    def operands(self) -> tuple[str, ...]:
+        """Names the rule reads, ``"price"`` included."""
+        return (self.left,) if isinstance(self.right, float) else (self.left, self.right)
+
+    def __str__(self) -> str:
+        right = f"{self.right:g}" if isinstance(self.right, float) else self.right
+        scale = f"{self.factor:g} * " if self.factor != 1.0 else ""
+        return f"{self.left} {self.op} {scale}{right}"
+
+
+@dataclass(frozen=True)
+class RuleHit:
+    direction: str
+    rule: IndicatorRule
+    value: float  # the left operand
+    threshold: float  # factor times the right operand
+
+
+class _LevelBook:
+    """Sorted levels of one direction with per-level re-arm and cooldown state.
+
+    Only finite levels are kept: a ``NaN`` compares false with everything and
+    would break the ordering the bisects rely on.
+    """
+
+    def __init__(self, levels: Iterable[float] = ()) -> None:
+        ordered = sorted({float(level) for level in levels if math.isfinite(level)})
+        self.levels = array("d", ordered)
+        self.ready = bytearray(b"\x01" * len(ordered))
+        self.last_fired = array("d", bytes(8 * len(ordered)))
+        # Levels crossed while still cooling down fire once the cooldown ends.
+        # The heap orders them by that time; entries whose level re-armed in the
+        # meantime are dropped from ``pending`` and skipped lazily when popped.
+        self.pending: set[float] = set()
+        self.pending_heap: list[tuple[float, float]] = []
+
+    def add(self, level: float) -> None:
+        if not math.isfinite(level):
+            return
+        index = bisect_left(self.levels, level)
+        if index < len(self.levels) and self.levels[index] == level:
+            return
+        self.levels.insert(index, level)
+        self.ready.insert(index, 1)
+        self.last_fired.insert(index, 0.0)
+
+    def remove(self, level: float) -> None:
+        index = bisect_left(self.levels, level)
+        if index == len(self.levels) or self.levels[index] != level:
+            return
+        del self.levels[index]
+        del self.ready[index]
+        del self.last_fired[index]
+        self.pending.discard(level)
+
+
+class AlertEngine:
+    """Many ``above``/``below`` price levels for one symbol.
+
+    Levels live in sorted arrays, so each ``update`` bisects for the levels
+    between the previous and the current price: O(log n + crossings) per tick
+    no matter how many levels are configured. Semantics per level match the
+    original single-threshold alerts: an ``above`` level fires when the price
+    is at or over it, then re-arms once the price drops back under it (and
+    symmetrically for ``below``); a level never fires twice within
+    ``cooldown`` seconds, but one crossed during its cooldown fires as soon as
+    the cooldown ends if the price is still beyond it.
+    """
+
+    def __init__(self, cooldown: float = 60.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.cooldown = cooldown
+        self._clock = clock
+        self._books = {ABOVE: _LevelBook(), BELOW: _LevelBook()}
+        self._previous: float | None = None
+
+    def levels(self, direction: str) -> tuple[float, ...]:
+        return tuple(self._books[direction].levels)
+
+    def set_levels(self, above: Iterable[float] = (), below: Iterable[float] = ()) -> None:
+        """Replace every level; all of them start armed."""
+        self._books = {ABOVE: _LevelBook(above), BELOW: _LevelBook(below)}
+        # The next price is evaluated like the first one, so levels already
+        # beyond it fire straight away, as a freshly configured threshold would.
+        self._previous = None
+
+    def add_level(self, direction: str, level: float) -> None:
+        """Add one armed level; the others keep their re-arm and cooldown state."""
+        self._books[direction].add(float(level))
+        # The next price is judged against every level, like the first one: the
+        # new level fires if it is already beyond it, the others re-arm or fire
+        # exactly as they would have on a regular update.
+        self._previous = None
+
+    def remove_level(self, direction: str, level: float) -> None:
+        self._books[direction].remove(float(level))
+
+    def update(self, price: float) -> list[AlertHit]:
+        """Feed one price and return the levels that fired."""
+        now = self._clock()
+        previous = self._previous
+        self._previous = price
+        hits: list[AlertHit] = []
+
+        above = self._books[ABOVE]
+        if above.levels:
+            levels = above.levels
+            if previous is None:
+                # No previous price to compare with (first price, or a level was
+                # added): every level is judged against this one.
+                split = bisect_right(levels, price)
+                self._rearm(above, split, len(levels))
+                self._reach(above, ABOVE, 0, split, price, now, hits)
+            elif price > previous:
+                # Levels in (previous, price] are now at or under the price.
+                self._reach(above, ABOVE, bisect_right(levels, previous), bisect_right(levels, price), price, now, hits)
+            elif price < previous:
+                # Levels in (price, previous] are back above the price: re-arm.
+                self._rearm(above, bisect_right(levels, price), bisect_right(levels, previous))
+            if above.pending:
+                self._flush_pending(above, ABOVE, price, now, hits)
+
+        below = self._books[BELOW]
+        if below.levels:
+            levels = below.levels
+            if previous is None:
+                split = bisect_left(levels, price)
+                self._rearm(below, 0, split)
+                self._reach(below, BELOW, split, len(levels), price, now, hits)
+            elif price < previous:
+                # Levels in [price, previous) are now at or over the price.
+                self._reach(below, BELOW, bisect_left(levels, price), bisect_left(levels, previous), price, now, hits)
+            elif price > previous:
+                self._rearm(below, bisect_left(levels, previous), bisect_left(levels, price))
+            if below.pending:
+                self._flush_pending(below, BELOW, price, now, hits)
+        return hits
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _reach(
+        self,
+        book: _LevelBook,
+        direction: str,
+        lo: int,
+        hi: int,
+        price: float,
+        now: float,
+        hits: list[AlertHit],
+    ) -> None:
+        for index in range(lo, hi):
+            if not book.ready[index]:
+                continue
+            if now - book.last_fired[index] >= self.cooldown:
+                book.ready[index] = 0
+                book.last_fired[index] = now
+                hits.append(AlertHit(direction, book.levels[index], price))
+            elif book.levels[index] not in book.pending:
+                book.pending.add(book.levels[index])
+                heapq.heappush(book.pending_heap, (book.last_fired[index] + self.cooldown, book.levels[index]))
+
+    @staticmethod
+    def _rearm(book: _LevelBook, lo: int, hi: int) -> None:
+        for index in range(lo, hi):
+            book.ready[index] = 1
+            book.pending.discard(book.levels[index])
+
+    def _flush_pending(
+        self,
+        book: _LevelBook,
+        direction: str,
+        price: float,
+        now: float,
+        hits: list[AlertHit],
+    ) -> None:
+        heap = book.pending_heap
+        while heap and heap[0][0] <= now:
+            due, level = heap[0]
+            if level not in book.pending:
+                heapq.heappop(heap)  # re-armed or removed since it was queued
+                continue
+            index = bisect_left(book.levels, level)
+            if due != book.last_fired[index] + self.cooldown:
+                heapq.heappop(heap)  # queued for an earlier cooldown; a current entry exists
+                continue
+            if now - book.last_fired[index] < self.cooldown:
+                break  # float rounding around the boundary; due on a later tick
+            heapq.heappop(heap)
+            book.pending.discard(level)
+            book.ready[index] = 0
+            book.last_fired[index] = now
+            hits.append(AlertHit(direction, level, price))
+        if not book.pending:
+            heap.clear()
+
+
+class _MoveThreshold:
+    """Re-arm and cooldown state of one :class:`MoveRule`, per direction."""
+
+    __slots__ = ("rule", "rise", "drop", "ready_rise", "ready_drop", "fired_rise", "fired_drop")
+
+    def __init__(self, rule: MoveRule) -> None:
+        self.rule = rule
+        self.rise = 1.0 + rule.percent / 100.0
+        self.drop = 1.0 - rule.percent / 100.0
+        self.ready_rise = self.ready_drop = True
+        self.fired_rise = self.fired_drop = float("-inf")
+
+
+class _MoveWindow:
+    """Low and high of the prices in ``(t - window_ms, t]`` via monotonic deques.
+
+    ``lows`` holds increasing prices (oldest first) and ``highs`` decreasing
+    ones: a new price drops every entry it beats from the back, and entries
+    that left the window are dropped from the front, so the extreme is always
+    at the front. Each price enters and leaves each deque once: amortised O(1).
+    """
+
+    __slots__ = ("window_ms", "lows", "highs", "thresholds")
+
+    def __init__(self, window_ms: int) -> None:
+        self.window_ms = window_ms
+        self.lows: deque[tuple[int, float]] = deque()
+        self.highs: deque[tuple[int, float]] = deque()
+        self.thresholds: list[_MoveThreshold] = []
+
+    def push(self, price: float, trade_time: int) -> tuple[float, float]:
+        cutoff = trade_time - self.window_ms
+        lows, highs = self.lows, self.highs
+        while lows and lows[-1][1] >= price:
+            lows.pop()
+        lows.append((trade_time, price))
+        while lows[0][0] <= cutoff:
+            lows.popleft()
+        while highs and highs[-1][1] <= price:
+            highs.pop()
+        highs.append((trade_time, price))
+        while highs[0][0] <= cutoff:
+            highs.popleft()
+        return lows[0][1], highs[0][1]
+
+
+class MoveAlertEngine:
+    """Percent-move alerts over rolling trade-time windows.
+
+    A rule fires ``above`` when the price is ``percent`` or more over the
+    lowest price of the last ``window_ms`` and ``below`` when it is that much
+    under the highest. Rules sharing a window share its deques, so each
+    window costs amortised O(1) per price and each rule one comparison per
+    direction. Re-arm and cooldown follow the price levels: a direction fires
+    when its condition starts to hold, re-arms once it no longer does, never
+    fires twice within ``cooldown`` seconds, and fires as soon as its cooldown
+    ends if the move still holds.
+
+    Fed from coalesced frames, the engine sees each bar's open, extremes and
+    last trade with their own trade times (:meth:`PriceBar.timed_path`), so a
+    window only misses trades that never became a bar extreme. Bars a slow
+    relay subscriber receives folded carry only their last trade's time, and
+    their extremes are dated with it.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[MoveRule] = (),
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cooldown = cooldown
+        self._clock = clock
+        self._windows: dict[int, _MoveWindow] = {}
+        self._last_time = 0
+        self.set_rules(rules)
+
+    @property
+    def rules(self) -> tuple[MoveRule, ...]:
+        return tuple(threshold.rule for window in self._windows.values() for threshold in window.thresholds)
+
+    def set_rules(self, rules: Iterable[MoveRule]) -> None:
+        """Replace the rules; windows and rules kept from before keep their prices and state."""
+        kept = {threshold.rule: threshold for window in self._windows.values() for threshold in window.thresholds}
+        windows: dict[int, _MoveWindow] = {}
+        for rule in dict.fromkeys(rules):
+            window = windows.get(rule.window_ms)
+            if window is None:
+                window = windows[rule.window_ms] = self._windows.get(rule.window_ms) or _MoveWindow(rule.window_ms)
+                window.thresholds = []
+            window.thresholds.append(kept.get(rule) or _MoveThreshold(rule))
+        self._windows = windows
+
+    def reset(self) -> None:
+        """Forget every price seen (e.g. after switching pairs); rules start armed."""
+        rules = self.rules
+        self._windows = {}
+        self._last_time = 0
+        self.set_rules(rules)
+
+    def update(self, price: float, trade_time: int) -> list[MoveHit]:
+        """Feed one price with its trade time (ms) and return the moves that fired."""
+        hits: list[MoveHit] = []
+        if not self._windows:
+            return hits
+        if trade_time < self._last_time:
+            trade_time = self._last_time  # never let the windows run backwards
+        self._last_time = trade_time
+        now = self._clock()
+        cooldown = self.cooldown
+        for window in self._windows.values():
+            low, high = window.push(price, trade_time)
+            for threshold in window.thresholds:
+                if price < low * threshold.rise:
+                    threshold.ready_rise = True
+                elif threshold.ready_rise and now - threshold.fired_rise >= cooldown:
+                    threshold.ready_rise = False
+                    threshold.fired_rise = now
+                    hits.append(MoveHit(ABOVE, threshold.rule, price, low))
+                if price > high * threshold.drop:
+                    threshold.ready_drop = True
+                elif threshold.ready_drop and now - threshold.fired_drop >= cooldown:
+                    threshold.ready_drop = False
+                    threshold.fired_drop = now
+                    hits.append(MoveHit(BELOW, threshold.rule, price, high))
+        return hits
+
+
+class RuleEngine:
+    """Alert rules over indicator values, with the level alerts' semantics.
+
+    An ``above``/``below`` rule fires when its condition becomes true, then
+    re-arms once it is false again; ``crosses`` fires on every change of side
+    (as ``above`` or ``below``), but not on the first evaluation, which has
+    nothing to cross from. A rule never fires twice within ``cooldown``
+    seconds; one triggered during its cooldown fires on the first update after
+    the cooldown if it still holds. Rules whose operands have no value yet
+    are skipped without changing state.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[IndicatorRule] = (),
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.cooldown = cooldown
+        self._clock = clock
+        self.set_rules(rules)
+
+    @property
+    def rules(self) -> tuple[IndicatorRule, ...]:
+        return self._rules
+
+    def set_rules(self, rules: Iterable[IndicatorRule]) -> None:
+        """Replace every rule; all of them start armed."""
+        self._rules = tuple(rules)
+        self._sides: list[bool | None] = [None] * len(self._rules)  # last evaluated condition
+        self._ready = bytearray(b"\x01" * len(self._rules))
+        self._pending: list[str | None] = [None] * len(self._rules)  # crossing waiting for the cooldown
+        self._last_fired = [-self.cooldown] * len(self._rules)
+
+    def update(self, values: Mapping[str, float]) -> list[RuleHit]:
+        """Evaluate every rule against ``values`` (indicator names plus ``"price"``)."""
+        now = self._clock()
+        hits: list[RuleHit] = []
+        for index, rule in enumerate(self._rules):
+            value = values.get(rule.left)
+            right = rule.right if isinstance(rule.right, float) else values.get(rule.right)
+            if value is None or right is None:
+                continue
+            threshold = rule.factor * right
+            if rule.op == CROSSES:
+                self._cross(index, rule, value, threshold, now, hits)
+                continue
+            holds = value > threshold if rule.op == ABOVE else value < threshold
+            if not holds:
+                self._ready[index] = 1
+            elif self._ready[index] and now - self._last_fired[index] >= self.cooldown:
+                self._ready[index] = 0
+                self._last_fired[index] = now
+                hits.append(RuleHit(rule.op, rule, value, threshold))
+        return hits
+
+    def _cross(
+        self,
+        index: int,
+        rule: IndicatorRule,
+        value: float,
+        threshold: float,
+        now: float,
+        hits: list[RuleHit],
+    ) -> None:
+        previous = self._sides[index]
+        side = previous if value == threshold else value > threshold
+        self._sides[index] = side
+        if previous is not None and side != previous:
+            # Crossing back while a crossing waits cancels it, like a re-armed level.
+            pending = self._pending[index]
+            self._pending[index] = None if pending is not None else (ABOVE if side else BELOW)
+        direction = self._pending[index]
+        if direction is not None and now - self._last_fired[index] >= self.cooldown:
+            self._pending[index] = None
+            self._last_fired[index] = now
+            hits.append(RuleHit(direction, rule, value, threshold))
@@ -0,0 +1,87 @@
+"""Replays recorded ticks through the regular stream callbacks."""
+
+from __future__ import annotations
+
+import dataclasses
+import heapq
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .stream_core import StreamCore, StreamSettings
+from .recorder import TickArchive
+
+
+class ArchiveReplayStream(StreamCore):
+    """Feeds ticks from a :class:`TickArchive` instead of a live connection.
+
+    Every symbol in the settings is read from its memory-mapped segments and
+    merged in trade-time order, then pushed through ``_handle_tick`` exactly as
+    live trades are, so the widget, history, sparkline, alerts and headless
+    output behave as they did when the ticks were recorded. ``settings.replay_speed`` scales the
+    original pacing (``2`` plays twice as fast, ``0`` as fast as possible).
+    Replayed ticks are never recorded again.
+    """
+
+    def __init__(
+        self,
+        settings: StreamSettings | None = None,
+        *,
+        root: Path | None = None,
+        start_time: int = 0,
+        end_time: int = 2**63 - 1,
+        **callbacks: Any,
+    ) -> None:
+        settings = dataclasses.replace(settings or StreamSettings(), record_ticks=False)
+        super().__init__(settings, **callbacks)
+        self._archive = TickArchive(root)
+        self._warm_archive = None  # the replay itself feeds the indicators from the archive
+        self._start_time = start_time
+        self._end_time = end_time
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ArchiveReplayStream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._log("Replay parado.")
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _send_text(self, text: str) -> bool:
+        return False  # nothing to subscribe to; the symbol set is fixed per run
+
+    def _run(self) -> None:
+        symbols = self.symbols
+        self._report_status("Replay")
+        self._log(f"Reproduzindo {', '.join(symbols)} de {self._archive.root}")
+        streams = [self._archive.ticks(symbol, self._start_time, self._end_time) for symbol in symbols]
+        speed = self._settings.replay_speed
+        first_time: int | None = None
+        started = time.monotonic()
+        count = 0
+        for tick in heapq.merge(*streams, key=lambda tick: tick.trade_time):
+            if self._stop_event.is_set():
+                break
+            if speed > 0:
+                if first_time is None:
+                    first_time = tick.trade_time
+                delay = (tick.trade_time - first_time) / 1000 / speed - (time.monotonic() - started)
+                if delay > 0 and self._stop_event.wait(delay):
+                    break
+            self._handle_tick(tick)
+            count += 1
+        for stream in streams:
+            stream.close()
+        self._log(f"{count} ticks reproduzidos.")
+        self._report_status("Replay concluído")
@@ -0,0 +1,137 @@
+"""asyncio streaming engine: every connection shares one event loop thread."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any
+
+from .stream_core import Lane, StreamCore, StreamSettings
+
+try:  # Optional dependency (pip install crypto-float-monitor[async]).
+    from websockets.asyncio.client import ClientConnection
+    from websockets.asyncio.client import connect as _ws_connect
+except ImportError:  # pragma: no cover - depends on the environment
+    ClientConnection = None  # type: ignore[assignment,misc]
+    _ws_connect = None
+
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_shared_loop_lock = threading.Lock()
+
+
+def websockets_available() -> bool:
+    return _ws_connect is not None
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop, starting its daemon thread on first use."""
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="CryptoFloatMonitorLoop", daemon=True)
+            thread.start()
+            _shared_loop = loop
+        return _shared_loop
+
+
+class AsyncStream(StreamCore):
+    """Drop-in replacement for :class:`ThreadedStream` running on asyncio.
+
+    Any number of instances run as tasks on :func:`shared_loop`, so the thread
+    count stays at one regardless of how many streams are open. ``stop`` only
+    cancels the task: the pending receive or reconnect sleep is interrupted
+    right away and nothing on the calling thread waits for it. With ``redundant``
+    set, the task runs one sub-task per connection plus a stall watchdog.
+
+    With ``compression`` set (the default) connections offer permessage-deflate,
+    which the server may accept or ignore.
+    """
+
+    def __init__(self, settings: StreamSettings | None = None, **callbacks: Any) -> None:
+        if _ws_connect is None:
+            raise RuntimeError("The asyncio engine requires the 'websockets' package.")
+        super().__init__(settings, **callbacks)
+        self._loop = shared_loop()
+        self._future: concurrent.futures.Future[None] | None = None
+
+    def start(self) -> None:
+        if self._future and not self._future.done():
+            return
+        self._log("Agendando stream no loop asyncio...")
+        self._future = asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+
+    def stop(self) -> None:
+        future, self._future = self._future, None
+        if future is not None:
+            future.cancel()
+        self._close_resources()
+        self._log("Streamer parado.")
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _send_text(self, text: str) -> bool:
+        sent = False
+        for lane in self._lanes:
+            ws = lane.connection
+            if isinstance(ws, ClientConnection):
+                asyncio.run_coroutine_threadsafe(ws.send(text), self._loop)
+                sent = True
+        return sent
+
+    async def _run(self) -> None:
+        tasks = [asyncio.ensure_future(self._run_lane(lane)) for lane in self._lanes]
+        if len(self._lanes) > 1:
+            tasks.append(asyncio.ensure_future(self._watch()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_lane(self, lane: Lane) -> None:
+        while True:
+            if not any(other.connected for other in self._lanes):
+                self._report_status("Connecting…")
+            url, url_symbols = self._next_url()
+            self._log(f"Conectando em {url} (conexão {lane.index})")
+            try:
+                async with _ws_connect(
+                    url,
+                    ping_interval=self._settings.ping_interval,
+                    ping_timeout=self._settings.ping_timeout,
+                    compression="deflate" if self._settings.compression else None,
+                ) as ws:
+                    lane.connection = ws
+                    self._lane_opened(lane)
+                    self._log(f"WebSocket aberto (conexão {lane.index}).")
+                    self._sync_subscriptions(url_symbols)
+                    async for message in ws:
+                        self._lane_message(lane, message)  # type: ignore[arg-type]
+            except Exception as exc:  # CancelledError is a BaseException and propagates
+                self._report_status(f"Erro: {exc}")
+                self._log(f"Erro no stream: {exc}")
+            finally:
+                self._lane_closed(lane)
+
+            delay = self._lane_backoff(lane)
+            if not any(other.connected for other in self._lanes):
+                self._report_status("Reconectando…")
+            self._log(f"Aguardando {delay:.1f}s para reconectar (conexão {lane.index})...")
+            await asyncio.sleep(delay)
+
+    async def _watch(self) -> None:
+        interval = min(1.0, max(0.1, self._settings.stall_timeout / 4))
+        while True:
+            await asyncio.sleep(interval)
+            for lane in self._stalled_lanes():
+                ws = lane.connection
+                if not isinstance(ws, ClientConnection):
+                    continue
+                self._log(f"Conexão {lane.index} parada há {self._settings.stall_timeout}s; reciclando.")
+                lane.connected = False
+                # Drop the TCP connection without a close handshake the stalled
+                # peer would never answer; the receive loop then reconnects.
+                ws.transport.abort()
@@ -1,121 +1,169 @@
-"""Binance WebSocket streaming utilities."""
+"""Qt adapter over the streaming engines in :mod:`crypto_float_monitor.stream_core`."""
 
 from __future__ import annotations
 
-import json
-import ssl
-import threading
+import math
 import time
-from dataclasses import dataclass
 
 from PyQt6 import QtCore
-import websocket
 
-DEBUG = False
+from .coalescing import PriceBar
+from .indicators import IndicatorStore
+from .klines import CandleAggregator
+from .metrics import stream_metrics
+from .stream_core import StreamCore, StreamSettings, create_stream, stream_name
+from .tick_history import TickHistoryStore
+
+__all__ = ["BinancePriceStreamer", "StreamSettings", "create_streamer", "stream_name"]
 
 DEBUG = False
 
 
-@dataclass(frozen=True)
-class StreamSettings:
-    symbol: str = "BTCUSDT"
-    base_url: str = "wss://stream.binance.com:9443/ws"
-    reconnect_delay: float = 3.0
+class BinancePriceStreamer(QtCore.QObject):
+    """Re-emits a :class:`StreamCore` engine through Qt signals.
 
-    @property
-    def stream_url(self) -> str:
-        return f"{self.base_url}/{self.symbol.lower()}@trade"
+    When the settings carry a watchlist, ``symbol_price_updated`` is emitted per
+    pair; ``price_updated`` keeps reporting only the primary symbol.
 
+    Trades are folded into the core's coalescer on the network thread and
+    flushed on the Qt thread at most ``refresh_hz`` times per second, so a burst
+    of trades costs a single queued signal. ``bar_updated`` carries the whole
+    interval (open/high/low/last, trade count and volume) for consumers that
+    must not miss intermediate extremes. ``candle_closed``, ``gap_detected``
+    and ``status_changed`` forward the core callbacks of the same name, and
+    ``book_updated(symbol, top)`` its ``on_book`` when ``depth`` is set.
 
-class BinancePriceStreamer(QtCore.QObject):
-    """Connects to Binance and emits trade prices via Qt signals."""
+    ``history``, ``candles`` and ``indicators`` are the core's stores, readable
+    from the Qt thread without copying.
+    """
 
     price_updated = QtCore.pyqtSignal(float)
+    symbol_price_updated = QtCore.pyqtSignal(str, float)
+    bar_updated = QtCore.pyqtSignal(object)
     status_changed = QtCore.pyqtSignal(str)
-
-    def __init__(self, settings: StreamSettings | None = None, parent: QtCore.QObject | None = None) -> None:
+    candle_closed = QtCore.pyqtSignal(str, str, object)
+    gap_detected = QtCore.pyqtSignal(str, int, int)
+    book_updated = QtCore.pyqtSignal(str, object)
+    _updates_pending = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        settings: StreamSettings | None = None,
+        parent: QtCore.QObject | None = None,
+        *,
+        core: StreamCore | None = None,
+    ) -> None:
         super().__init__(parent)
-        self._settings = settings or StreamSettings()
-        self._stop_event = threading.Event()
-        self._thread: threading.Thread | None = None
-        self._ws_app: websocket.WebSocketApp | None = None
-        self._log(f"Inicializando streamer para {self._settings.symbol}")
+        self._core = core or create_stream(settings)
+        self._settings = self._core.settings
+        self._core.on_update = self._on_update
+        self._core.on_candle = self.candle_closed.emit
+        self._core.on_gap = self.gap_detected.emit
+        self._core.on_status = self.status_changed.emit
+        self._core.on_book = self.book_updated.emit
+        self._primary = self._core.primary
+        self._metrics = stream_metrics()
+        self._pending_since = 0.0
+        self._last_flush = 0.0
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_updates)
+        self._updates_pending.connect(self._schedule_flush, QtCore.Qt.ConnectionType.QueuedConnection)
+        if core is not None:
+            # A core started before this adapter may already hold bars whose
+            # on_update went nowhere; pick them up once the event loop runs.
+            QtCore.QTimer.singleShot(0, self._flush_updates)
+
+    @property
+    def core(self) -> StreamCore:
+        return self._core
+
+    @property
+    def history(self) -> TickHistoryStore:
+        return self._core.history
+
+    @property
+    def candles(self) -> CandleAggregator:
+        return self._core.candles
+
+    @property
+    def indicators(self) -> IndicatorStore | None:
+        return self._core.indicators
+
+    @property
+    def symbols(self) -> tuple[str, ...]:
+        return self._core.symbols
 
     def start(self) -> None:
-        if self._thread and self._thread.is_alive():
-            return
-        self._stop_event.clear()
-        self._log("Iniciando thread de stream...")
-        self._thread = threading.Thread(target=self._run, name="BinancePriceStreamer", daemon=True)
-        self._thread.start()
+        self._core.start()
 
     def stop(self) -> None:
-        self._stop_event.set()
-        self._log("Solicitando parada do streamer...")
-        if self._ws_app:
-            try:
-                self._ws_app.close()
-            except Exception:
-                pass
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
+        self._core.stop()
         self._log("Streamer parado.")
 
+    def subscribe(self, *symbols: str) -> None:
+        """Add pairs to the live connection without reconnecting."""
+        self._core.subscribe(*symbols)
+
+    def unsubscribe(self, *symbols: str) -> None:
+        """Drop pairs from the live connection; the primary symbol is always kept."""
+        self._core.unsubscribe(*symbols)
+
+    def set_symbols(self, symbol: str, watchlist: tuple[str, ...] = ()) -> None:
+        """Switch the primary symbol and watchlist without reconnecting."""
+        self._core.set_symbols(symbol, watchlist)
+        self._primary = self._core.primary
+
     # ---------------------------------------------------------------------
     # Internal helpers
     # ---------------------------------------------------------------------
-    def _run(self) -> None:
-        while not self._stop_event.is_set():
-            self.status_changed.emit("Connecting…")
-            self._log(f"Conectando em {self._settings.stream_url}")
-            self._ws_app = websocket.WebSocketApp(
-                self._settings.stream_url,
-                on_open=self._on_open,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close,
-            )
-            try:
-                self._ws_app.run_forever(
-                    sslopt={"cert_reqs": ssl.CERT_REQUIRED},
-                    ping_interval=20,
-                    ping_timeout=10,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                self.status_changed.emit(f"Erro: {exc}")
-                self._log(f"Erro no stream: {exc}")
-            finally:
-                self._ws_app = None
-
-            if self._stop_event.is_set():
-                break
-
-            self.status_changed.emit("Reconectando…")
-            self._log(f"Aguardando {self._settings.reconnect_delay}s para reconectar...")
-            time.sleep(self._settings.reconnect_delay)
-
-    def _on_open(self, *_: object) -> None:
-        self.status_changed.emit("Conectado")
-        self._log("WebSocket aberto.")
-
-    def _on_close(self, *_: object) -> None:
-        self.status_changed.emit("Desconectado")
-        self._log("WebSocket fechado.")
-
-    def _on_error(self, _ws: websocket.WebSocketApp, error: Exception) -> None:
-        self.status_changed.emit(f"Erro: {error}")
-        self._log(f"Erro recebido: {error}")
-
-    def _on_message(self, _ws: websocket.WebSocketApp, message: str) -> None:
-        try:
-            payload = json.loads(message)
-            price = float(payload["p"])
-        except (ValueError, KeyError, TypeError):
+    def _on_update(self) -> None:
+        # Network thread: the coalescer just went from empty to pending.
+        if self._metrics is not None:
+            self._pending_since = time.perf_counter()
+        self._updates_pending.emit()
+
+    @QtCore.pyqtSlot()
+    def _schedule_flush(self) -> None:
+        if self._metrics is not None:
+            self._metrics.queue_delay.observe(time.perf_counter() - self._pending_since)
+        if self._flush_timer.isActive():
+            return
+        remaining = self._settings.frame_interval - (time.monotonic() - self._last_flush)
+        if remaining > 0:
+            self._flush_timer.start(math.ceil(remaining * 1000))
             return
-        self.price_updated.emit(price)
-        self._log(f"Preço recebido: {price}")
+        self._flush_updates()
+
+    @QtCore.pyqtSlot()
+    def _flush_updates(self) -> None:
+        self._last_flush = time.monotonic()
+        bars: dict[str, PriceBar] = self._core.drain()
+        metrics = self._metrics
+        if metrics is not None:
+            now_ms = time.time() * 1000
+            for bar in bars.values():
+                metrics.event_latency.observe((now_ms - bar.trade_time) / 1000)
+            started = time.perf_counter()
+        for symbol, bar in bars.items():
+            self.bar_updated.emit(bar)
+            self.symbol_price_updated.emit(symbol, bar.last)
+            if symbol == self._primary:
+                self.price_updated.emit(bar.last)
+        if metrics is not None:
+            metrics.slot_seconds.observe(time.perf_counter() - started)
 
     def _log(self, message: str) -> None:
         if not DEBUG:
             return
-        print(f"[BinancePriceStreamer] {message}", flush=True)
+        print(f"[{type(self).__name__}] {message}", flush=True)
+
+
+def create_streamer(
+    settings: StreamSettings | None = None,
+    parent: QtCore.QObject | None = None,
+    *,
+    core: StreamCore | None = None,
+) -> BinancePriceStreamer:
+    """Qt streamer over the engine selected by ``settings.engine`` (or over an existing ``core``)."""
+    return BinancePriceStreamer(settings, parent, core=core)
@@ -0,0 +1,99 @@
+"""Collapse bursts of trades into one update per symbol and display frame."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class PriceBar:
+    """Summary of every trade a symbol received since the previous frame.
+
+    ``trade_time`` is the last trade's time; ``open_time``, ``high_time`` and
+    ``low_time`` are when the open and the current extremes traded.
+    """
+
+    symbol: str
+    open: float
+    high: float
+    low: float
+    last: float
+    count: int = 1
+    volume: float = 0.0
+    trade_time: int = 0
+    high_is_latest: bool = True
+    open_time: int = 0
+    high_time: int = 0
+    low_time: int = 0
+
+    def add(self, price: float, quantity: float, trade_time: int) -> None:
+        if price > self.high:
+            self.high = price
+            self.high_time = trade_time
+            self.high_is_latest = True
+        elif price < self.low:
+            self.low = price
+            self.low_time = trade_time
+            self.high_is_latest = False
+        self.last = price
+        self.count += 1
+        self.volume += quantity
+        self.trade_time = trade_time
+
+    def path(self) -> tuple[float, ...]:
+        """Open, both extremes in the order they were reached, then last.
+
+        Feeding this sequence to threshold checks reproduces every crossing a
+        tick-by-tick evaluation would have seen.
+        """
+        if self.high_is_latest:
+            return (self.open, self.low, self.high, self.last)
+        return (self.open, self.high, self.low, self.last)
+
+    def timed_path(self) -> tuple[tuple[float, int], ...]:
+        """``path`` with the trade time at which each of its prices traded."""
+        opened = (self.open, self.open_time)
+        high = (self.high, self.high_time)
+        low = (self.low, self.low_time)
+        last = (self.last, self.trade_time)
+        return (opened, low, high, last) if self.high_is_latest else (opened, high, low, last)
+
+
+class PriceCoalescer:
+    """Thread-safe latest-value slot holding at most one pending bar per symbol."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, PriceBar] = {}
+
+    def push(self, symbol: str, price: float, quantity: float = 0.0, trade_time: int = 0) -> bool:
+        """Fold a trade into the pending bar.
+
+        Returns ``True`` when the slot was empty, i.e. the consumer needs to be
+        woken up; later pushes before the next ``drain`` only update the bar.
+        """
+        with self._lock:
+            was_empty = not self._pending
+            bar = self._pending.get(symbol)
+            if bar is None:
+                self._pending[symbol] = PriceBar(
+                    symbol=symbol,
+                    open=price,
+                    high=price,
+                    low=price,
+                    last=price,
+                    volume=quantity,
+                    trade_time=trade_time,
+                    open_time=trade_time,
+                    high_time=trade_time,
+                    low_time=trade_time,
+                )
+            else:
+                bar.add(price, quantity, trade_time)
+        return was_empty
+
+    def drain(self) -> dict[str, PriceBar]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
@@ -3,17 +3,50 @@
 from __future__ import annotations
 
 import json
+import math
 import os
-from dataclasses import dataclass
+import tempfile
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Final
+from typing import Final, Iterable
+
+from .alerts import PRICE, RULE_OPERATORS, IndicatorRule, MoveRule, parse_move_rule
+from .decoders import stream_kind
+from .indicators import parse_indicator
+from .klines import format_interval, interval_ms
 
 CONFIG_DIR_NAME: Final[str] = "crypto-float-monitor"
 CONFIG_FILE_NAME: Final[str] = "config.json"
+PRICE_SOURCES: Final[tuple[str, ...]] = ("trade", "mid")
+MAX_HISTORY_CAPACITY: Final[int] = 10_000_000  # trades per pair, about 320 MB each
 DEFAULT_CONFIG: Final[dict[str, object]] = {
     "symbol": "BTCUSDT",
     "alert_above": None,
     "alert_below": None,
+    "move_alerts": [],
+    "watchlist": [],
+    "refresh_hz": 30,
+    "engine": "thread",
+    "stream_kind": "trade",
+    "compression": True,
+    "stream_process": False,
+    "history_capacity": 100000,
+    "sparkline_minutes": 0,
+    "glyph_cache": False,
+    "record_ticks": False,
+    "replay_speed": 1,
+    "candle_intervals": ["1s", "1m", "5m", "1h"],
+    "redundant": False,
+    "stall_timeout": 5,
+    "relay": False,
+    "depth": False,
+    "depth_snapshot": "",
+    "price_source": "trade",
+    "indicators": [],
+    "indicator_alerts": [],
+    "show_indicators": False,
+    "metrics": False,
+    "metrics_port": 0,
 }
 
 
@@ -24,16 +57,23 @@ def _config_base_dir() -> Path:
     return Path.home() / ".config"
 
 
+def data_dir() -> Path:
+    """Directory for app data such as recorded ticks (``$XDG_DATA_HOME``)."""
+    base = os.environ.get("XDG_DATA_HOME")
+    root = Path(base).expanduser() if base else Path.home() / ".local" / "share"
+    return root / CONFIG_DIR_NAME
+
+
 def _config_file_path() -> Path:
     return _config_base_dir() / CONFIG_DIR_NAME / CONFIG_FILE_NAME
 
 
-def _ensure_config_file() -> dict[str, object]:
+def _ensure_config_file(create: bool = True) -> dict[str, object]:
     path = _config_file_path()
-    path.parent.mkdir(parents=True, exist_ok=True)
 
     if not path.exists():
-        _write_config(DEFAULT_CONFIG.copy())
+        if create:
+            _write_config(DEFAULT_CONFIG.copy())
         return DEFAULT_CONFIG.copy()
 
     try:
@@ -42,14 +82,34 @@ def _ensure_config_file() -> dict[str, object]:
             raise ValueError("config must be an object")
     except Exception:
         raw = DEFAULT_CONFIG.copy()
-        _write_config(raw)
+        if create:
+            _write_config(raw)
     return {**DEFAULT_CONFIG, **raw}
 
 
+def ensure_config_file() -> None:
+    """Write the default config file if it is missing or unreadable."""
+    _ensure_config_file()
+
+
 def _write_config(data: dict[str, object]) -> None:
+    # Write a sibling temp file and rename it over the config, so readers
+    # (including the file watcher) never see a half-written file.
     path = _config_file_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(data, indent=2))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 def _coerce_threshold(value: object) -> float | None:
@@ -62,27 +122,244 @@ def _coerce_threshold(value: object) -> float | None:
     return number
 
 
+def _coerce_refresh_hz(value: object) -> float:
+    """A finite rate of at least 0; the default for ``null``, ``NaN`` or anything else invalid.
+
+    ``0`` (no frame cap) only comes from an explicit ``0``, so a typo never
+    brings back one repaint per trade.
+    """
+    number = None if isinstance(value, bool) else _coerce_threshold(value)
+    if number is None or not math.isfinite(number) or number < 0:
+        return float(DEFAULT_CONFIG["refresh_hz"])  # type: ignore[arg-type]
+    return number
+
+
+def _coerce_port(value: object) -> int:
+    """A TCP port in 0..65535; 0 (no metrics endpoint) for anything else, ``NaN`` and ``Infinity`` included."""
+    number = None if isinstance(value, bool) else _coerce_threshold(value)
+    if number is None or not math.isfinite(number) or not number.is_integer() or not 0 <= number <= 65535:
+        return 0
+    return int(number)
+
+
+def _coerce_levels(value: object) -> tuple[float, ...]:
+    """Accept a single number (the original format) or a list of numbers; ``NaN`` and infinities are dropped."""
+    items = value if isinstance(value, (list, tuple)) else [value]
+    levels = (_coerce_threshold(item) for item in items)
+    return tuple(sorted({level for level in levels if level is not None and math.isfinite(level)}))
+
+
+def _serialize_levels(levels: Iterable[float]) -> float | list[float] | None:
+    ordered = sorted(set(levels))
+    if not ordered:
+        return None
+    if len(ordered) == 1:
+        return ordered[0]
+    return ordered
+
+
+def _coerce_moves(value: object) -> tuple[MoveRule, ...]:
+    """Rules such as ``{"percent": 1.5, "window": "60s"}`` (or ``"window": 60`` seconds); invalid ones are dropped."""
+    if not isinstance(value, (list, tuple)):
+        return ()
+    rules = []
+    for item in value:
+        if not isinstance(item, dict):
+            continue
+        window = item.get("window")
+        if isinstance(window, float):
+            window = f"{window:g}"  # 60.0 is 60 seconds, 1.5 stays invalid
+        try:
+            rules.append(parse_move_rule(f"{item.get('percent')}/{window}"))
+        except ValueError:
+            continue
+    return tuple(sorted(set(rules), key=lambda rule: (rule.window_ms, rule.percent)))
+
+
+def _serialize_moves(rules: Iterable[MoveRule]) -> list[dict[str, object]]:
+    ordered = sorted(set(rules), key=lambda rule: (rule.window_ms, rule.percent))
+    return [{"percent": rule.percent, "window": format_interval(rule.window_ms)} for rule in ordered]
+
+
+def _coerce_symbols(value: object) -> tuple[str, ...]:
+    if not isinstance(value, (list, tuple)):
+        return ()
+    symbols = (str(item).strip().upper() for item in value if item)
+    return tuple(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def _coerce_intervals(value: object) -> tuple[str, ...]:
+    if not isinstance(value, (list, tuple)):
+        return tuple(DEFAULT_CONFIG["candle_intervals"])  # type: ignore[arg-type]
+    intervals = []
+    for item in value:
+        try:
+            interval_ms(str(item))
+        except ValueError:
+            continue
+        intervals.append(str(item))
+    return tuple(dict.fromkeys(intervals))
+
+
+def _coerce_choice(value: object, choices: tuple[str, ...]) -> str:
+    """``value`` lower-cased if it is one of ``choices``, otherwise the first (default) choice."""
+    text = str(value or "").lower()
+    return text if text in choices else choices[0]
+
+
+def _coerce_indicators(value: object) -> tuple[str, ...]:
+    if not isinstance(value, (list, tuple)):
+        return ()
+    names = []
+    for item in value:
+        try:
+            parse_indicator(str(item).strip())
+        except ValueError:
+            continue
+        names.append(str(item).strip())
+    return tuple(dict.fromkeys(names))
+
+
+def _coerce_operand(value: object) -> str | float:
+    """An indicator name, ``"price"`` or a number; raises ``ValueError`` otherwise."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    name = str(value).strip()
+    if name != PRICE:
+        parse_indicator(name)
+    return name
+
+
+def _coerce_rules(value: object) -> tuple[IndicatorRule, ...]:
+    """Rules such as ``{"left": "price", "op": "crosses", "right": "vwap"}``; invalid ones are dropped."""
+    if not isinstance(value, (list, tuple)):
+        return ()
+    rules = []
+    for item in value:
+        if not isinstance(item, dict):
+            continue
+        try:
+            left = _coerce_operand(item.get("left", PRICE))
+            right = _coerce_operand(item.get("right"))
+            factor = float(item.get("factor", 1.0))
+        except (TypeError, ValueError):
+            continue
+        op = str(item.get("op", "")).lower()
+        if isinstance(left, float) or op not in RULE_OPERATORS:
+            continue
+        rules.append(IndicatorRule(left, op, right, factor))
+    return tuple(dict.fromkeys(rules))
+
+
+def _coerce_capacity(value: object) -> int:
+    """Trades kept per pair in 1..MAX_HISTORY_CAPACITY; the default for non-numeric or non-finite values.
+
+    The history is preallocated, so an unbounded value would fail at startup with a ``MemoryError``.
+    """
+    number = None if isinstance(value, bool) else _coerce_threshold(value)
+    if number is None or not math.isfinite(number):
+        return int(DEFAULT_CONFIG["history_capacity"])  # type: ignore[arg-type]
+    return min(MAX_HISTORY_CAPACITY, max(1, int(number)))
+
+
 @dataclass(frozen=True)
 class AppConfig:
     symbol: str
-    alert_above: float | None
-    alert_below: float | None
+    alert_above: tuple[float, ...]
+    alert_below: tuple[float, ...]
+    move_alerts: tuple[MoveRule, ...] = ()
+    watchlist: tuple[str, ...] = ()
+    refresh_hz: float = 30.0
+    engine: str = "thread"
+    stream_kind: str = "trade"
+    compression: bool = True
+    stream_process: bool = False
+    history_capacity: int = 100_000
+    sparkline_minutes: float = 0.0
+    glyph_cache: bool = False
+    record_ticks: bool = False
+    replay_speed: float = 1.0
+    candle_intervals: tuple[str, ...] = ("1s", "1m", "5m", "1h")
+    redundant: bool = False
+    stall_timeout: float = 5.0
+    relay: bool = False
+    depth: bool = False
+    depth_snapshot: str = ""
+    price_source: str = "trade"
+    indicators: tuple[str, ...] = ()
+    indicator_alerts: tuple[IndicatorRule, ...] = ()
+    show_indicators: bool = False
+    metrics: bool = False
+    metrics_port: int = 0
 
 
-def load_config() -> AppConfig:
-    data = _ensure_config_file()
+# Fields a running app applies from a reloaded config; the rest need a restart.
+LIVE_FIELDS: Final[frozenset[str]] = frozenset(
+    {"symbol", "watchlist", "alert_above", "alert_below", "move_alerts", "indicator_alerts"}
+)
+
+
+def config_path() -> Path:
+    return _config_file_path()
+
+
+def changed_fields(old: AppConfig, new: AppConfig) -> tuple[str, ...]:
+    """Names of the fields whose values differ between two configs."""
+    return tuple(field.name for field in fields(AppConfig) if getattr(old, field.name) != getattr(new, field.name))
+
+
+def indicator_names(config: AppConfig) -> tuple[str, ...]:
+    """Indicators to compute: the configured ones plus any an alert rule reads."""
+    referenced = (name for rule in config.indicator_alerts for name in rule.operands if name != PRICE)
+    return tuple(dict.fromkeys((*config.indicators, *referenced)))
+
+
+def load_config(create: bool = True) -> AppConfig:
+    """Read the config; with ``create=False`` a missing file is not written (see :func:`ensure_config_file`)."""
+    data = _ensure_config_file(create)
     symbol = str(data.get("symbol", DEFAULT_CONFIG["symbol"]))
-    alert_above = _coerce_threshold(data.get("alert_above"))
-    alert_below = _coerce_threshold(data.get("alert_below"))
+    alert_above = _coerce_levels(data.get("alert_above"))
+    alert_below = _coerce_levels(data.get("alert_below"))
     return AppConfig(
         symbol=symbol.upper(),
         alert_above=alert_above,
         alert_below=alert_below,
+        move_alerts=_coerce_moves(data.get("move_alerts")),
+        watchlist=_coerce_symbols(data.get("watchlist")),
+        refresh_hz=_coerce_refresh_hz(data.get("refresh_hz")),
+        engine=str(data.get("engine") or DEFAULT_CONFIG["engine"]).lower(),
+        stream_kind=stream_kind(str(data.get("stream_kind") or "")),
+        compression=bool(data.get("compression", True)),
+        stream_process=bool(data.get("stream_process")),
+        history_capacity=_coerce_capacity(data.get("history_capacity")),
+        sparkline_minutes=max(0.0, _coerce_threshold(data.get("sparkline_minutes")) or 0.0),
+        glyph_cache=bool(data.get("glyph_cache")),
+        record_ticks=bool(data.get("record_ticks")),
+        replay_speed=max(0.0, _coerce_threshold(data.get("replay_speed")) or 0.0),
+        candle_intervals=_coerce_intervals(data.get("candle_intervals")),
+        redundant=bool(data.get("redundant")),
+        stall_timeout=max(0.0, _coerce_threshold(data.get("stall_timeout")) or 0.0),
+        relay=bool(data.get("relay")),
+        depth=bool(data.get("depth")),
+        depth_snapshot=str(data.get("depth_snapshot") or ""),
+        price_source=_coerce_choice(data.get("price_source"), PRICE_SOURCES),
+        indicators=_coerce_indicators(data.get("indicators")),
+        indicator_alerts=_coerce_rules(data.get("indicator_alerts")),
+        show_indicators=bool(data.get("show_indicators")),
+        metrics=bool(data.get("metrics")),
+        metrics_port=_coerce_port(data.get("metrics_port")),
     )
 
 
-def save_alerts(alert_above: float | None, alert_below: float | None) -> None:
+def save_alerts(
+    alert_above: Iterable[float],
+    alert_below: Iterable[float],
+    move_alerts: Iterable[MoveRule] | None = None,
+) -> None:
+    """Write the alert levels (and the move alerts, unless ``None``) back to the config file."""
     data = _ensure_config_file()
-    data["alert_above"] = alert_above
-    data["alert_below"] = alert_below
+    data["alert_above"] = _serialize_levels(alert_above)
+    data["alert_below"] = _serialize_levels(alert_below)
+    if move_alerts is not None:
+        data["move_alerts"] = _serialize_moves(move_alerts)
     _write_config(data)
@@ -0,0 +1,133 @@
+"""Qt file watcher that hot-reloads the config and batches alert saves."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+from typing import Iterable, Optional
+
+from PyQt6 import QtCore
+
+from . import config
+from .alerts import MoveRule
+from .config import LIVE_FIELDS, AppConfig, changed_fields
+
+DEBUG = False
+
+RELOAD_DELAY_MS = 200  # editors often write a file in several steps
+SAVE_DELAY_MS = 500
+
+
+class ConfigWatcher(QtCore.QObject):
+    """Reloads the config file when it changes on disk and reports the diff.
+
+    ``config_changed(previous, current)`` is emitted only when a reload parses
+    to a different :class:`AppConfig`, so the app's own writes (which update
+    the known state first) and no-op saves from editors are ignored. Fields
+    outside :data:`~crypto_float_monitor.config.LIVE_FIELDS` cannot be applied
+    to a running stream; changing them prints a note that a restart is needed.
+
+    ``save_alerts`` coalesces rapid edits: only the latest alerts are written,
+    ``SAVE_DELAY_MS`` after the last call, through the atomic
+    :func:`config.save_alerts`.
+    """
+
+    config_changed = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, current: AppConfig, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self._config = current
+        self._path = config.config_path()
+        self._pending_alerts: tuple[tuple[float, ...], tuple[float, ...], tuple[MoveRule, ...] | None] | None = None
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_reload)
+        self._watcher.directoryChanged.connect(self._schedule_reload)
+        self._reload_timer = self._single_shot(RELOAD_DELAY_MS, self._reload)
+        self._save_timer = self._single_shot(SAVE_DELAY_MS, self.flush)
+        self.watch()
+
+    @property
+    def config(self) -> AppConfig:
+        return self._config
+
+    def save_alerts(
+        self,
+        alert_above: Iterable[float],
+        alert_below: Iterable[float],
+        move_alerts: Iterable[MoveRule] | None = None,
+    ) -> None:
+        above = tuple(sorted(set(alert_above)))
+        below = tuple(sorted(set(alert_below)))
+        if move_alerts is None:
+            moves = self._pending_alerts[2] if self._pending_alerts is not None else None
+            self._config = replace(self._config, alert_above=above, alert_below=below)
+        else:
+            moves = tuple(sorted(set(move_alerts), key=lambda rule: (rule.window_ms, rule.percent)))
+            self._config = replace(self._config, alert_above=above, alert_below=below, move_alerts=moves)
+        self._pending_alerts = (above, below, moves)
+        self._save_timer.start()
+
+    def watch(self) -> None:
+        """(Re)attach to the config file and its directory, e.g. after the file was first created."""
+        # Atomic replaces (ours and most editors') swap the inode, which drops
+        # the file from the watch list; the directory watch brings it back.
+        directory = str(self._path.parent)
+        if self._path.parent.exists() and directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        if self._path.exists() and str(self._path) not in self._watcher.files():
+            self._watcher.addPath(str(self._path))
+
+    def flush(self) -> None:
+        """Write pending alerts now (also called on shutdown)."""
+        self._save_timer.stop()
+        pending, self._pending_alerts = self._pending_alerts, None
+        if pending is None:
+            return
+        try:
+            config.save_alerts(*pending)
+        except OSError as exc:
+            print(f"[ConfigWatcher] Falha ao salvar alertas: {exc}", file=sys.stderr, flush=True)
+            return
+        self._log(f"Alertas salvos em {self._path}")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _single_shot(self, interval_ms: int, slot: object) -> QtCore.QTimer:
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval_ms)
+        timer.timeout.connect(slot)
+        return timer
+
+    @QtCore.pyqtSlot(str)
+    def _schedule_reload(self, _path: str) -> None:
+        self._reload_timer.start()
+
+    def _reload(self) -> None:
+        self.watch()
+        if not self._path.exists():
+            return
+        # Unsaved dialog edits are newer than whatever is on disk; merge them in first.
+        self.flush()
+        current = config.load_config(create=False)
+        previous = self._config
+        if current == previous:
+            return
+        changed = changed_fields(previous, current)
+        self._config = current
+        self._log(f"Configuração recarregada: {', '.join(changed)}")
+        restart = [name for name in changed if name not in LIVE_FIELDS]
+        if restart:
+            print(
+                f"[ConfigWatcher] Alteração em {', '.join(restart)} só terá efeito após reiniciar.",
+                file=sys.stderr,
+                flush=True,
+            )
+        self.config_changed.emit(previous, current)
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[ConfigWatcher] {message}", flush=True)
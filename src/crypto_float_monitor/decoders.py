@@ -0,0 +1,264 @@
+"""Decoders that turn raw Binance stream frames into :class:`TradeTick` values.
+
+Every stream kind maps onto the same tick, so the rest of the app does not
+care which one is subscribed:
+
+* ``trade`` - one tick per trade (``t`` is the trade id);
+* ``aggTrade`` - one tick per taker order and price, with the summed quantity
+  (``a``, the aggregate trade id, is the id);
+* ``bookTicker`` - the mid price of the best bid and ask, quantity ``0``,
+  stamped with the local clock (spot frames carry no event time) and keyed
+  by the book update id ``u``;
+* ``miniTicker`` - the last price once a second, quantity ``0``, keyed by its
+  event time.
+
+Only ``trade`` and ``aggTrade`` ids count every event, so only they reveal
+missed messages (:data:`SEQUENTIAL_KINDS`).
+
+``@depth`` diff frames decode to :class:`DepthUpdate` (see
+:mod:`crypto_float_monitor.order_book`).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from typing import Any, Callable, NamedTuple
+
+try:  # Optional accelerated backend (pip install crypto-float-monitor[fast]).
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+STREAM_KINDS: tuple[str, ...] = ("trade", "aggTrade", "bookTicker", "miniTicker")
+# Kinds whose ids advance by one per event: a skipped id means missed messages.
+SEQUENTIAL_KINDS: frozenset[str] = frozenset({"trade", "aggTrade"})
+
+
+class TradeTick(NamedTuple):
+    symbol: str
+    price: float
+    quantity: float
+    trade_time: int
+    trade_id: int
+    buyer_is_maker: bool
+
+
+class DepthUpdate(NamedTuple):
+    """One ``depthUpdate`` event: absolute quantities for the levels that changed in ``U..u``."""
+
+    symbol: str
+    first_update_id: int
+    final_update_id: int
+    event_time: int
+    bids: list[list[str]]  # [[price, quantity], ...] as sent; quantity "0" removes the level
+    asks: list[list[str]]
+
+
+TradeDecoder = Callable[[str], "TradeTick | None"]
+
+
+def _tick_from_payload(payload: Any) -> TradeTick | None:
+    try:
+        if "stream" in payload:
+            # Combined-stream envelope: {"stream": "btcusdt@trade", "data": {...}}
+            payload = payload["data"]
+        return TradeTick(
+            str(payload.get("s") or ""),
+            float(payload["p"]),
+            float(payload.get("q", 0.0)),
+            int(payload.get("T", 0)),
+            int(payload.get("t", 0)),
+            bool(payload.get("m", False)),
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def decode_trade_json(message: str) -> TradeTick | None:
+    """Reference decoder: full ``json.loads`` of the frame."""
+    try:
+        payload = json.loads(message)
+    except ValueError:
+        return None
+    return _tick_from_payload(payload)
+
+
+def decode_trade_orjson(message: str) -> TradeTick | None:
+    """Same as :func:`decode_trade_json` on top of ``orjson`` when it is installed."""
+    if _orjson is None:
+        return decode_trade_json(message)
+    try:
+        payload = _orjson.loads(message)
+    except _orjson.JSONDecodeError:
+        return None
+    return _tick_from_payload(payload)
+
+
+# Binance serialises trade events with a fixed key order:
+# {"e":"trade","E":..,"s":"BTCUSDT","t":..,"p":"..","q":"..","T":..,"m":true,"M":true}
+_TRADE_FIELDS = re.compile(
+    r'"s":"([^"]*)","t":(\d+),"p":"([^"]*)","q":"([^"]*)","T":(\d+),"m":(t)?'
+)
+
+
+def decode_trade_scan(message: str) -> TradeTick | None:
+    """Pull only ``s``/``t``/``p``/``q``/``T``/``m`` straight out of the raw frame.
+
+    A single regex pass over the text avoids building a dict per trade. Frames
+    that do not match the expected layout (subscription acks, reordered keys,
+    bad numbers) fall back to a full parse, through ``orjson`` when available.
+    """
+    match = _TRADE_FIELDS.search(message)
+    if match is None:
+        return _decode_full(message)
+    symbol, trade_id, price, quantity, trade_time, maker = match.groups()
+    try:
+        return TradeTick(symbol, float(price), float(quantity), int(trade_time), int(trade_id), maker is not None)
+    except ValueError:
+        return _decode_full(message)
+
+
+_decode_full: TradeDecoder = decode_trade_orjson if _orjson is not None else decode_trade_json
+_loads: Callable[[str], Any] = _orjson.loads if _orjson is not None else json.loads
+decode_trade_fast: TradeDecoder = decode_trade_scan
+
+DECODERS: dict[str, TradeDecoder] = {
+    "json": decode_trade_json,
+    "scan": decode_trade_scan,
+    "fast": decode_trade_fast,
+}
+if _orjson is not None:
+    DECODERS["orjson"] = decode_trade_orjson
+
+
+def decode_depth_update(message: str) -> DepthUpdate | None:
+    """Decode a raw or combined ``@depth`` diff frame; ``None`` for anything else."""
+    try:
+        payload = _loads(message)
+        if "stream" in payload:
+            payload = payload["data"]
+        return DepthUpdate(
+            str(payload["s"]),
+            int(payload["U"]),
+            int(payload["u"]),
+            int(payload.get("E", 0)),
+            payload["b"],
+            payload["a"],
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _agg_trade_tick(payload: Any) -> TradeTick:
+    return TradeTick(
+        str(payload.get("s") or ""),
+        float(payload["p"]),
+        float(payload.get("q", 0.0)),
+        int(payload.get("T", 0)),
+        int(payload["a"]),
+        bool(payload.get("m", False)),
+    )
+
+
+def _book_ticker_tick(payload: Any) -> TradeTick:
+    mid = (float(payload["b"]) + float(payload["a"])) / 2
+    # Futures frames carry an event time; spot ones do not.
+    event_time = int(payload.get("E") or time.time() * 1000)
+    return TradeTick(str(payload.get("s") or ""), mid, 0.0, event_time, int(payload["u"]), False)
+
+
+def _mini_ticker_tick(payload: Any) -> TradeTick:
+    event_time = int(payload["E"])
+    return TradeTick(str(payload.get("s") or ""), float(payload["c"]), 0.0, event_time, event_time, False)
+
+
+def _payload_decoder(build: Callable[[Any], TradeTick], loads: Callable[[str], Any]) -> TradeDecoder:
+    """Full-parse decoder for one stream kind: ``loads`` the frame, unwrap it and ``build`` the tick."""
+
+    def decode(message: str) -> TradeTick | None:
+        try:
+            payload = loads(message)
+            if "stream" in payload:
+                payload = payload["data"]
+            return build(payload)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    return decode
+
+
+# Same fixed key order as the trade events, for the scan decoders below:
+# {"e":"aggTrade","E":..,"s":"BTCUSDT","a":..,"p":"..","q":"..","f":..,"l":..,"T":..,"m":true,"M":true}
+_AGG_TRADE_FIELDS = re.compile(
+    r'"s":"([^"]*)","a":(\d+),"p":"([^"]*)","q":"([^"]*)","f":\d+,"l":\d+,"T":(\d+),"m":(t)?'
+)
+# {"u":400900217,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}
+_BOOK_TICKER_FIELDS = re.compile(r'"u":(\d+),"s":"([^"]*)","b":"([^"]*)","B":"[^"]*","a":"([^"]*)"')
+# {"e":"24hrMiniTicker","E":..,"s":"BTCUSDT","c":"..","o":"..","h":"..","l":"..","v":"..","q":".."}
+_MINI_TICKER_FIELDS = re.compile(r'"E":(\d+),"s":"([^"]*)","c":"([^"]*)"')
+
+_decode_agg_trade_full = _payload_decoder(_agg_trade_tick, _loads)
+_decode_book_ticker_full = _payload_decoder(_book_ticker_tick, _loads)
+_decode_mini_ticker_full = _payload_decoder(_mini_ticker_tick, _loads)
+
+
+def decode_agg_trade_scan(message: str) -> TradeTick | None:
+    """``aggTrade`` counterpart of :func:`decode_trade_scan`."""
+    match = _AGG_TRADE_FIELDS.search(message)
+    if match is None:
+        return _decode_agg_trade_full(message)
+    symbol, agg_id, price, quantity, trade_time, maker = match.groups()
+    try:
+        return TradeTick(symbol, float(price), float(quantity), int(trade_time), int(agg_id), maker is not None)
+    except ValueError:
+        return _decode_agg_trade_full(message)
+
+
+def decode_book_ticker_scan(message: str) -> TradeTick | None:
+    """``bookTicker`` counterpart of :func:`decode_trade_scan`."""
+    match = _BOOK_TICKER_FIELDS.search(message)
+    if match is None:
+        return _decode_book_ticker_full(message)
+    update_id, symbol, bid, ask = match.groups()
+    try:
+        mid = (float(bid) + float(ask)) / 2
+    except ValueError:
+        return _decode_book_ticker_full(message)
+    return TradeTick(symbol, mid, 0.0, int(time.time() * 1000), int(update_id), False)
+
+
+def decode_mini_ticker_scan(message: str) -> TradeTick | None:
+    """``miniTicker`` counterpart of :func:`decode_trade_scan`."""
+    match = _MINI_TICKER_FIELDS.search(message)
+    if match is None:
+        return _decode_mini_ticker_full(message)
+    event_time, symbol, close = match.groups()
+    try:
+        return TradeTick(symbol, float(close), 0.0, int(event_time), int(event_time), False)
+    except ValueError:
+        return _decode_mini_ticker_full(message)
+
+
+# The other kinds only have a reference ``json`` decoder and the fast one.
+KIND_DECODERS: dict[str, dict[str, TradeDecoder]] = {
+    "trade": DECODERS,
+    "aggTrade": {"json": _payload_decoder(_agg_trade_tick, json.loads), "fast": decode_agg_trade_scan},
+    "bookTicker": {"json": _payload_decoder(_book_ticker_tick, json.loads), "fast": decode_book_ticker_scan},
+    "miniTicker": {"json": _payload_decoder(_mini_ticker_tick, json.loads), "fast": decode_mini_ticker_scan},
+}
+
+
+def stream_kind(name: str) -> str:
+    """Canonical spelling of a stream kind (any case); ``"trade"`` for unknown names."""
+    for kind in STREAM_KINDS:
+        if kind.lower() == name.lower():
+            return kind
+    return STREAM_KINDS[0]
+
+
+def get_decoder(name: str, kind: str = "trade") -> TradeDecoder:
+    """Return a registered decoder for ``kind`` frames, defaulting to the fastest available one."""
+    decoders = KIND_DECODERS.get(kind, DECODERS)
+    return decoders.get(name, decoders["fast"])
@@ -0,0 +1,134 @@
+"""Headless mode: stream trades or conflated snapshots to stdout without Qt.
+
+Used by ``crypto-float-monitor --headless``. Every trade (or, with a snapshot
+interval, one bar per symbol per interval) is written as NDJSON or CSV to a
+buffered stdout that the main thread flushes a few times per second, so the
+output keeps up with the full exchange rate and pipes cleanly into other tools.
+Connection status goes to stderr.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Callable, TextIO
+
+from .coalescing import PriceBar
+from .decoders import TradeTick
+from .stream_core import StreamSettings, create_stream
+
+FORMATS = ("ndjson", "csv")
+FLUSH_INTERVAL = 0.25  # seconds between stdout flushes
+
+TICK_CSV_HEADER = "symbol,trade_id,price,quantity,trade_time,buyer_is_maker\n"
+BAR_CSV_HEADER = "time,symbol,open,high,low,last,count,volume,trade_time\n"
+
+
+def tick_ndjson(symbol: str, tick: TradeTick) -> str:
+    maker = "true" if tick.buyer_is_maker else "false"
+    return (
+        f'{{"symbol":"{symbol}","trade_id":{tick.trade_id},"price":{tick.price!r},'
+        f'"quantity":{tick.quantity!r},"trade_time":{tick.trade_time},"buyer_is_maker":{maker}}}\n'
+    )
+
+
+def tick_csv(symbol: str, tick: TradeTick) -> str:
+    maker = "1" if tick.buyer_is_maker else "0"
+    return f"{symbol},{tick.trade_id},{tick.price!r},{tick.quantity!r},{tick.trade_time},{maker}\n"
+
+
+def bar_ndjson(now_ms: int, bar: PriceBar) -> str:
+    return (
+        f'{{"time":{now_ms},"symbol":"{bar.symbol}","open":{bar.open!r},"high":{bar.high!r},'
+        f'"low":{bar.low!r},"last":{bar.last!r},"count":{bar.count},"volume":{bar.volume!r},'
+        f'"trade_time":{bar.trade_time}}}\n'
+    )
+
+
+def bar_csv(now_ms: int, bar: PriceBar) -> str:
+    return (
+        f"{now_ms},{bar.symbol},{bar.open!r},{bar.high!r},{bar.low!r},{bar.last!r},"
+        f"{bar.count},{bar.volume!r},{bar.trade_time}\n"
+    )
+
+
+class _Output:
+    """stdout shared by the network thread (writes) and the main thread (flushes)."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+        self.closed = threading.Event()
+
+    def write(self, text: str) -> None:
+        with self._lock:
+            try:
+                self._stream.write(text)
+            except BrokenPipeError:
+                self.closed.set()
+
+    def flush(self) -> None:
+        with self._lock:
+            try:
+                self._stream.flush()
+            except BrokenPipeError:
+                self.closed.set()
+
+
+def run_headless(
+    settings: StreamSettings,
+    output_format: str = "ndjson",
+    snapshot_interval: float = 0.0,
+    stream: TextIO | None = None,
+) -> int:
+    """Stream until SIGINT/SIGTERM or until the reader closes the pipe; returns the exit code."""
+    output = _Output(stream or sys.stdout)
+    csv = output_format == "csv"
+    on_tick: Callable[[str, TradeTick], None] | None = None
+    if snapshot_interval > 0:
+        if csv:
+            output.write(BAR_CSV_HEADER)
+        format_bar = bar_csv if csv else bar_ndjson
+    else:
+        if csv:
+            output.write(TICK_CSV_HEADER)
+        format_tick = tick_csv if csv else tick_ndjson
+
+        def write_tick(symbol: str, tick: TradeTick) -> None:
+            output.write(format_tick(symbol, tick))
+
+        on_tick = write_tick
+
+    def on_status(status: str) -> None:
+        print(f"[headless] {status}", file=sys.stderr, flush=True)
+
+    core = create_stream(settings, on_tick=on_tick, on_status=on_status)
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    core.start()
+    next_snapshot = time.monotonic() + snapshot_interval
+    try:
+        while not stop.is_set() and not output.closed.is_set():
+            timeout = FLUSH_INTERVAL
+            if snapshot_interval > 0:
+                timeout = min(timeout, max(0.0, next_snapshot - time.monotonic()))
+            stop.wait(timeout)
+            if snapshot_interval > 0 and time.monotonic() >= next_snapshot:
+                next_snapshot += snapshot_interval
+                now_ms = int(time.time() * 1000)
+                for bar in core.drain().values():
+                    output.write(format_bar(now_ms, bar))
+            output.flush()
+    finally:
+        core.stop()
+        output.flush()
+    if output.closed.is_set():
+        # The reader went away (e.g. ``| head``): silence the final flush at exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
@@ -0,0 +1,390 @@
+"""Incremental price indicators fed trade by trade, independent of Qt.
+
+Indicators are named ``kind`` or ``kind_span`` with Binance-style spans:
+
+* ``ema_1m`` - exponential moving average of the price with a one-minute
+  time constant;
+* ``vwap`` - volume-weighted average price since 00:00 UTC;
+* ``vwap_5m`` - volume-weighted average price over the last five minutes;
+* ``std_5m`` - standard deviation of the trade prices over the last five minutes.
+
+Every update is O(1): nothing re-scans history. ``warm_up`` computes the same
+state from stored ticks in one vectorized pass when numpy is installed.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from typing import Iterable, Sequence
+
+from .klines import interval_ms
+from .vector import load_numpy
+
+KINDS = ("ema", "vwap", "std")
+SESSION_MS = 86_400_000  # the session VWAP resets at 00:00 UTC
+WINDOW_BUCKETS = 60  # rolling windows slide in steps of 1/60 of their length
+EMA_WARM_UP_SPANS = 5  # ticks older than this many time constants weigh < 1%
+
+
+def parse_indicator(name: str) -> tuple[str, int]:
+    """``(kind, span_ms)`` of an indicator name; the span is 0 for the session VWAP."""
+    kind, _, span = name.partition("_")
+    if kind not in KINDS or (not span and kind != "vwap"):
+        raise ValueError(f"invalid indicator: {name!r}")
+    try:
+        return kind, interval_ms(span) if span else 0
+    except ValueError:
+        raise ValueError(f"invalid indicator: {name!r}") from None
+
+
+class Ema:
+    """Time-decayed EMA of the price path.
+
+    The price is taken to hold between trades, so a trade's weight grows
+    with the time until the next one and bursts of trades within the same
+    millisecond count once (the last one), not once per message.
+    """
+
+    __slots__ = ("span_ms", "value", "_held", "_last_time")
+
+    def __init__(self, span_ms: int) -> None:
+        self.span_ms = span_ms
+        self.value = math.nan
+        self._held = 0.0
+        self._last_time = -1
+
+    def update(self, price: float, trade_time: int) -> None:
+        if trade_time > self._last_time:
+            if self._last_time < 0:
+                self.value = price
+            else:
+                decay = math.exp((self._last_time - trade_time) / self.span_ms)
+                self.value = self._held + decay * (self.value - self._held)
+            self._last_time = trade_time
+        self._held = price
+
+    def warm_up(self, np, first_price: float, prices, times) -> None:  # noqa: ANN001 - numpy arrays
+        """``prices`` are the last trade of each millisecond in ``times``; ``first_price`` the very first trade."""
+        # value = p0 w0 + sum_k h_(k-1) (w_k - w_(k-1)) with w_k = exp((t_k - t_N) / span)
+        # and h the held prices: the recurrence in ``update`` unrolled.
+        weights = np.exp((times - times[-1]) / self.span_ms)
+        self.value = float(first_price * weights[0] + np.dot(prices[:-1], np.diff(weights)))
+        self._held = float(prices[-1])
+        self._last_time = int(times[-1])
+
+
+class SessionVwap:
+    """VWAP of the current UTC day."""
+
+    __slots__ = ("session", "notional", "volume")
+
+    def __init__(self) -> None:
+        self.session = -1
+        self.notional = 0.0
+        self.volume = 0.0
+
+    @property
+    def value(self) -> float:
+        return self.notional / self.volume if self.volume else math.nan
+
+    def update(self, price: float, quantity: float, trade_time: int) -> None:
+        session = trade_time // SESSION_MS
+        if session > self.session:
+            self.session = session
+            self.notional = self.volume = 0.0
+        self.notional += price * quantity
+        self.volume += quantity
+
+    def warm_up(self, np, prices, quantities, times) -> None:  # noqa: ANN001 - numpy arrays
+        self.session = int(times[-1]) // SESSION_MS
+        today = times >= self.session * SESSION_MS
+        self.notional = float(np.dot(prices[today], quantities[today]))
+        self.volume = float(quantities[today].sum())
+
+
+class RollingWindow:
+    """VWAP and price standard deviation over a sliding time window.
+
+    The window is cut into ``WINDOW_BUCKETS`` buckets. The open bucket
+    accumulates count, mean and squared deviations with Welford's update;
+    when a trade opens a new bucket, the buckets still inside the window are
+    merged once (Chan et al.) into the ``closed`` aggregate, and reads merge
+    that with the open bucket. Per trade that is O(1); a roll costs
+    O(``WINDOW_BUCKETS``) once per bucket, not per trade. Between rolls the
+    window covers between ``window_ms - bucket_ms`` and ``window_ms``.
+    """
+
+    __slots__ = (
+        "window_ms",
+        "bucket_ms",
+        "_ids",
+        "_counts",
+        "_means",
+        "_m2s",
+        "_notionals",
+        "_volumes",
+        "_bucket",
+        "_count",
+        "_mean",
+        "_m2",
+        "_notional",
+        "_volume",
+        "_closed",
+    )
+
+    def __init__(self, window_ms: int) -> None:
+        self.window_ms = window_ms
+        self.bucket_ms = max(1, window_ms // WINDOW_BUCKETS)
+        self._reset(-(-window_ms // self.bucket_ms))
+
+    def _reset(self, slots: int) -> None:
+        self._ids = array("q", [-1] * slots)
+        self._counts = array("d", bytes(8 * slots))
+        self._means = array("d", bytes(8 * slots))
+        self._m2s = array("d", bytes(8 * slots))
+        self._notionals = array("d", bytes(8 * slots))
+        self._volumes = array("d", bytes(8 * slots))
+        self._bucket = -1
+        self._count = self._mean = self._m2 = self._notional = self._volume = 0.0
+        self._closed = (0.0, 0.0, 0.0, 0.0, 0.0)  # count, mean, m2, notional, volume
+
+    @property
+    def vwap(self) -> float:
+        volume = self._closed[4] + self._volume
+        return (self._closed[3] + self._notional) / volume if volume else math.nan
+
+    @property
+    def std(self) -> float:
+        count, mean, m2 = self._closed[:3]
+        total = count + self._count
+        if total < 2:
+            return math.nan
+        delta = self._mean - mean
+        m2 += self._m2 + delta * delta * count * self._count / total
+        return math.sqrt(max(0.0, m2) / (total - 1))
+
+    def update(self, price: float, quantity: float, trade_time: int) -> None:
+        bucket = trade_time // self.bucket_ms
+        if bucket > self._bucket:
+            self._roll(bucket)
+        # A late trade (older than the open bucket) is folded into the open bucket.
+        self._count += 1.0
+        delta = price - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (price - self._mean)
+        self._notional += price * quantity
+        self._volume += quantity
+
+    def warm_up(self, np, prices, quantities, times) -> None:  # noqa: ANN001 - numpy arrays
+        self._reset(len(self._ids))
+        buckets = times // self.bucket_ms
+        last = int(buckets[-1])
+        inside = buckets > last - len(self._ids)
+        prices, quantities, buckets = prices[inside], quantities[inside], buckets[inside]
+        ids, positions = np.unique(buckets, return_inverse=True)
+        counts = np.bincount(positions).astype(np.float64)
+        means = np.bincount(positions, weights=prices) / counts
+        m2s = np.bincount(positions, weights=(prices - means[positions]) ** 2)
+        notionals = np.bincount(positions, weights=prices * quantities)
+        volumes = np.bincount(positions, weights=quantities)
+        slots = len(self._ids)
+        for index in range(len(ids) - 1):
+            slot = int(ids[index]) % slots
+            self._ids[slot] = int(ids[index])
+            self._counts[slot] = counts[index]
+            self._means[slot] = means[index]
+            self._m2s[slot] = m2s[index]
+            self._notionals[slot] = notionals[index]
+            self._volumes[slot] = volumes[index]
+        self._bucket = last
+        self._closed = self._merge_closed(last)
+        self._count, self._mean, self._m2 = float(counts[-1]), float(means[-1]), float(m2s[-1])
+        self._notional, self._volume = float(notionals[-1]), float(volumes[-1])
+
+    def _roll(self, bucket: int) -> None:
+        if self._count:
+            slot = self._bucket % len(self._ids)
+            self._ids[slot] = self._bucket
+            self._counts[slot] = self._count
+            self._means[slot] = self._mean
+            self._m2s[slot] = self._m2
+            self._notionals[slot] = self._notional
+            self._volumes[slot] = self._volume
+        self._bucket = bucket
+        self._count = self._mean = self._m2 = self._notional = self._volume = 0.0
+        self._closed = self._merge_closed(bucket)
+
+    def _merge_closed(self, bucket: int) -> tuple[float, float, float, float, float]:
+        """Merge the stored buckets that are still inside the window ending with ``bucket``."""
+        oldest = bucket - len(self._ids)
+        count = mean = m2 = notional = volume = 0.0
+        for slot, bucket_id in enumerate(self._ids):
+            if not oldest < bucket_id < bucket:
+                continue
+            other = self._counts[slot]
+            total = count + other
+            delta = self._means[slot] - mean
+            mean += delta * other / total
+            m2 += self._m2s[slot] + delta * delta * count * other / total
+            count = total
+            notional += self._notionals[slot]
+            volume += self._volumes[slot]
+        return count, mean, m2, notional, volume
+
+
+class IndicatorSet:
+    """Every configured indicator of one symbol."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = tuple(dict.fromkeys(names))
+        self._emas: dict[int, Ema] = {}
+        self._session: SessionVwap | None = None
+        self._windows: dict[int, RollingWindow] = {}
+        self._getters: list[tuple[str, object, str]] = []
+        for name in self.names:
+            kind, span = parse_indicator(name)
+            if kind == "ema":
+                ema = self._emas.setdefault(span, Ema(span))
+                self._getters.append((name, ema, "value"))
+            elif kind == "vwap" and not span:
+                self._session = self._session or SessionVwap()
+                self._getters.append((name, self._session, "value"))
+            else:
+                window = self._windows.setdefault(span, RollingWindow(span))
+                self._getters.append((name, window, kind))
+        self._ema_list = tuple(self._emas.values())
+        self._window_list = tuple(self._windows.values())
+
+    def update(self, price: float, quantity: float, trade_time: int) -> None:
+        for ema in self._ema_list:
+            ema.update(price, trade_time)
+        if self._session is not None:
+            self._session.update(price, quantity, trade_time)
+        for window in self._window_list:
+            window.update(price, quantity, trade_time)
+
+    def values(self) -> dict[str, float]:
+        """Current value of every indicator that has one (``NaN`` ones are left out)."""
+        values = {}
+        for name, source, attribute in self._getters:
+            value = getattr(source, attribute)
+            if value == value:
+                values[name] = value
+        return values
+
+    def warm_up(self, prices: Sequence[float], quantities: Sequence[float], times: Sequence[int]) -> None:
+        """Set every indicator from stored trades (oldest first) as if they had been fed one by one.
+
+        Uses numpy when it is installed; otherwise replays the trades through
+        ``update``. Either way the indicators should be fresh: warming up
+        replaces their state rather than adding to it.
+        """
+        if not len(times):
+            return
+        np = load_numpy()
+        if np is None:
+            for price, quantity, trade_time in zip(prices, quantities, times):
+                self.update(price, quantity, trade_time)
+            return
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        # ``update`` folds late trades into the newest time seen, so the vector
+        # path sees the running maximum as well.
+        times = np.maximum.accumulate(np.asarray(times, dtype=np.int64))
+        for ema in self._ema_list:
+            # Only the last trade of each millisecond moves the EMA.
+            last_of_ms = np.append(times[1:] != times[:-1], True)
+            ema.warm_up(np, float(prices[0]), prices[last_of_ms], times[last_of_ms])
+        if self._session is not None:
+            self._session.warm_up(np, prices, quantities, times)
+        for window in self._window_list:
+            window.warm_up(np, prices, quantities, times)
+
+
+class IndicatorStore:
+    """One :class:`IndicatorSet` per symbol, fed from the stream thread.
+
+    ``hold(symbol)`` creates a symbol's set in a warming-up state: trades fed
+    to it are buffered until ``release`` installs the values computed from
+    stored history (typically on another thread) and replays the buffered
+    trades the history did not already contain.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = tuple(dict.fromkeys(names))
+        for name in self.names:
+            parse_indicator(name)
+        self._sets: dict[str, IndicatorSet] = {}
+        self._pending: dict[str, list[tuple[float, float, int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._sets
+
+    def get(self, symbol: str) -> IndicatorSet:
+        symbol = symbol.upper()
+        indicators = self._sets.get(symbol)
+        if indicators is None:
+            indicators = self._sets[symbol] = IndicatorSet(self.names)
+        return indicators
+
+    def update(self, symbol: str, price: float, quantity: float, trade_time: int, trade_id: int) -> None:
+        if self._pending:
+            with self._lock:
+                pending = self._pending.get(symbol)
+                if pending is not None:
+                    pending.append((price, quantity, trade_time, trade_id))
+                    return
+        # Looked up after the pending check: ``release`` publishes the warmed
+        # set before it stops buffering.
+        indicators = self._sets.get(symbol) or self.get(symbol)
+        indicators.update(price, quantity, trade_time)
+
+    def values(self, symbol: str) -> dict[str, float]:
+        """Indicator values of ``symbol``; empty while it is still warming up."""
+        symbol = symbol.upper()
+        indicators = self._sets.get(symbol)
+        if indicators is None or symbol in self._pending:
+            return {}
+        return indicators.values()
+
+    def lookback_start(self, trade_time: int) -> int:
+        """Earliest trade time a warm-up ending at ``trade_time`` reads."""
+        start = trade_time
+        for name in self.names:
+            kind, span = parse_indicator(name)
+            if not span:
+                start = min(start, trade_time - trade_time % SESSION_MS)
+            else:
+                start = min(start, trade_time - span * (EMA_WARM_UP_SPANS if kind == "ema" else 1))
+        return start
+
+    def hold(self, symbol: str) -> None:
+        symbol = symbol.upper()
+        with self._lock:
+            self._pending[symbol] = []
+            self._sets[symbol] = IndicatorSet(self.names)
+
+    def release(
+        self,
+        symbol: str,
+        prices: Sequence[float],
+        quantities: Sequence[float],
+        times: Sequence[int],
+        last_trade_id: int = -1,
+    ) -> None:
+        """Warm ``symbol`` up from stored trades, then replay the buffered ones newer than ``last_trade_id``."""
+        symbol = symbol.upper()
+        indicators = IndicatorSet(self.names)
+        indicators.warm_up(prices, quantities, times)
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is None:
+                return  # not held (any more)
+            for price, quantity, trade_time, trade_id in pending:
+                if trade_id > last_trade_id:
+                    indicators.update(price, quantity, trade_time)
+            self._sets[symbol] = indicators
+            del self._pending[symbol]
@@ -0,0 +1,212 @@
+"""Incremental OHLCV candles built from the trade stream, independent of Qt."""
+
+from __future__ import annotations
+
+from array import array
+from typing import NamedTuple
+
+from .tick_history import TickWindow
+from .vector import load_numpy
+
+DEFAULT_INTERVALS = ("1s", "1m", "5m", "1h")
+_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+
+class Candle(NamedTuple):
+    open_time: int  # ms, aligned to the interval
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    trades: int
+
+
+def interval_ms(interval: str) -> int:
+    """Length of a Binance-style interval such as ``"1s"``, ``"5m"`` or ``"4h"``."""
+    count, unit = interval[:-1], interval[-1:]
+    if unit not in _UNIT_MS or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"invalid candle interval: {interval!r}")
+    return int(count) * _UNIT_MS[unit]
+
+
+def format_interval(milliseconds: int) -> str:
+    """Inverse of :func:`interval_ms`, in the largest unit that divides evenly (``90_000`` is ``"90s"``)."""
+    for unit in ("d", "h", "m", "s"):
+        if milliseconds > 0 and milliseconds % _UNIT_MS[unit] == 0:
+            return f"{milliseconds // _UNIT_MS[unit]}{unit}"
+    raise ValueError(f"not a whole number of seconds: {milliseconds!r} ms")
+
+
+class CandleSeries:
+    """Candles of one symbol and interval.
+
+    The open candle lives in plain attributes and each trade touches only
+    those, so ``update`` is O(1). Closed candles are appended column-wise to
+    typed arrays (``open_times``, ``opens``, ``highs``, ``lows``, ``closes``,
+    ``volumes``, ``trades``) holding at most about ``capacity`` entries. A
+    candle closes when the first trade of a later interval arrives; intervals
+    without trades produce no candle.
+    """
+
+    def __init__(self, interval: str, capacity: int = 10_000) -> None:
+        self.interval = interval
+        self.interval_ms = interval_ms(interval)
+        self.capacity = max(1, capacity)
+        self._clear()
+
+    def __len__(self) -> int:
+        return len(self.open_times)
+
+    def update(self, price: float, quantity: float, trade_time: int) -> Candle | None:
+        """Fold one trade in; returns the candle it closed, if any."""
+        start = trade_time - trade_time % self.interval_ms
+        if start <= self._start:  # same interval (or a late trade for it)
+            if price > self._high:
+                self._high = price
+            elif price < self._low:
+                self._low = price
+            self._close = price
+            self._volume += quantity
+            self._trades += 1
+            return None
+        closed = self._close_current() if self._trades else None
+        self._start = start
+        self._open = self._high = self._low = self._close = price
+        self._volume = quantity
+        self._trades = 1
+        return closed
+
+    def current(self) -> Candle | None:
+        """The candle still being built."""
+        if not self._trades:
+            return None
+        return Candle(self._start, self._open, self._high, self._low, self._close, self._volume, self._trades)
+
+    def last(self, count: int) -> list[Candle]:
+        """The newest ``count`` closed candles, oldest first."""
+        first = max(0, len(self.open_times) - count)
+        return [
+            Candle(*row)
+            for row in zip(
+                self.open_times[first:],
+                self.opens[first:],
+                self.highs[first:],
+                self.lows[first:],
+                self.closes[first:],
+                self.volumes[first:],
+                self.trades[first:],
+            )
+        ]
+
+    def rebuild(self, window: TickWindow) -> None:
+        """Replace every candle with ones computed from ``window`` in a single pass.
+
+        Uses numpy when it is installed (``reduceat`` over interval boundaries);
+        otherwise replays the window through ``update``.
+        """
+        self._clear()
+        if not len(window):
+            return
+        np = load_numpy()
+        if np is None:
+            for prices, quantities, times in zip(window.prices, window.quantities, window.times):
+                for price, quantity, trade_time in zip(prices, quantities, times):
+                    self.update(price, quantity, trade_time)
+            return
+
+        prices = np.concatenate([np.frombuffer(chunk, dtype=np.float64) for chunk in window.prices])
+        quantities = np.concatenate([np.frombuffer(chunk, dtype=np.float64) for chunk in window.quantities])
+        times = np.concatenate([np.frombuffer(chunk, dtype=np.int64) for chunk in window.times])
+        starts = times - times % self.interval_ms
+        firsts = np.concatenate(([0], np.flatnonzero(starts[1:] != starts[:-1]) + 1))
+        lasts = np.append(firsts[1:], len(times)) - 1
+        columns = (
+            (self.open_times, starts[firsts]),
+            (self.opens, prices[firsts]),
+            (self.highs, np.maximum.reduceat(prices, firsts)),
+            (self.lows, np.minimum.reduceat(prices, firsts)),
+            (self.closes, prices[lasts]),
+            (self.volumes, np.add.reduceat(quantities, firsts)),
+            (self.trades, (lasts - firsts + 1).astype(np.int64)),
+        )
+        # The newest candle may still receive trades, so it stays open.
+        keep = slice(max(0, len(firsts) - 1 - self.capacity), len(firsts) - 1)
+        for target, values in columns:
+            target.frombytes(values[keep].tobytes())
+        self._start = int(starts[firsts[-1]])
+        self._open = float(columns[1][1][-1])
+        self._high = float(columns[2][1][-1])
+        self._low = float(columns[3][1][-1])
+        self._close = float(columns[4][1][-1])
+        self._volume = float(columns[5][1][-1])
+        self._trades = int(columns[6][1][-1])
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _clear(self) -> None:
+        self.open_times = array("q")
+        self.opens = array("d")
+        self.highs = array("d")
+        self.lows = array("d")
+        self.closes = array("d")
+        self.volumes = array("d")
+        self.trades = array("q")
+        self._start = -1
+        self._open = self._high = self._low = self._close = self._volume = 0.0
+        self._trades = 0
+
+    def _close_current(self) -> Candle:
+        candle = Candle(self._start, self._open, self._high, self._low, self._close, self._volume, self._trades)
+        self.open_times.append(self._start)
+        self.opens.append(self._open)
+        self.highs.append(self._high)
+        self.lows.append(self._low)
+        self.closes.append(self._close)
+        self.volumes.append(self._volume)
+        self.trades.append(self._trades)
+        # Trim in chunks so the amortised cost per candle stays constant.
+        excess = len(self.open_times) - self.capacity
+        if excess >= max(1, self.capacity // 4):
+            for column in (self.open_times, self.opens, self.highs, self.lows, self.closes, self.volumes, self.trades):
+                del column[:excess]
+        return candle
+
+
+class CandleAggregator:
+    """One :class:`CandleSeries` per symbol and interval, fed trade by trade."""
+
+    def __init__(self, intervals: tuple[str, ...] = DEFAULT_INTERVALS, capacity: int = 10_000) -> None:
+        for interval in intervals:
+            interval_ms(interval)
+        self.intervals = tuple(dict.fromkeys(intervals))
+        self.capacity = capacity
+        self._series: dict[str, tuple[CandleSeries, ...]] = {}
+
+    def series(self, symbol: str, interval: str) -> CandleSeries:
+        return self._series_for(symbol.upper())[self.intervals.index(interval)]
+
+    def symbols(self) -> tuple[str, ...]:
+        return tuple(self._series)
+
+    def update(self, symbol: str, price: float, quantity: float, trade_time: int) -> list[tuple[str, Candle]]:
+        """Fold one trade into every interval; returns the ``(interval, candle)`` pairs it closed."""
+        series = self._series.get(symbol) or self._series_for(symbol)
+        closed: list[tuple[str, Candle]] = []
+        for candles in series:
+            candle = candles.update(price, quantity, trade_time)
+            if candle is not None:
+                closed.append((candles.interval, candle))
+        return closed
+
+    def rebuild(self, symbol: str, window: TickWindow) -> None:
+        """Recompute every interval of ``symbol`` from stored ticks."""
+        for candles in self._series_for(symbol.upper()):
+            candles.rebuild(window)
+
+    def _series_for(self, symbol: str) -> tuple[CandleSeries, ...]:
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._series[symbol] = tuple(CandleSeries(interval, self.capacity) for interval in self.intervals)
+        return series
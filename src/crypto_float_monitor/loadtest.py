@@ -0,0 +1,211 @@
+"""End-to-end load test: replay server -> streamer -> FloatingPriceWidget.
+
+Each run spawns :mod:`crypto_float_monitor.replay_server` in a child process,
+points a real widget at it under the offscreen Qt platform and reports the
+sustained trade rate, exchange-to-render latency, trades lost on the way and
+how long the GUI event loop stalled.
+
+Usage: ``crypto-float-monitor-loadtest --rates 100,1000,5000 --duration 10``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+STALL_PROBE_INTERVAL_MS = 5
+STALL_THRESHOLD = 0.05  # seconds of event-loop lateness counted as a stall
+
+
+@dataclass(frozen=True)
+class LoadTestResult:
+    target_rate: float
+    sent: int
+    received: int
+    lost: int
+    frames: int
+    sustained_rate: float
+    latency_p50_ms: float
+    latency_p90_ms: float
+    latency_p99_ms: float
+    latency_max_ms: float
+    stall_total_ms: float
+    stall_max_ms: float
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(args: argparse.Namespace, rate: float, port: int) -> subprocess.Popen[str]:
+    command = [
+        sys.executable,
+        "-m",
+        "crypto_float_monitor.replay_server",
+        "--port",
+        str(port),
+        "--rate",
+        str(rate),
+        "--duration",
+        str(args.duration),
+        "--burst-rate",
+        str(args.burst_rate),
+        "--burst-every",
+        str(args.burst_every),
+        "--burst-length",
+        str(args.burst_length),
+    ]
+    if args.frames:
+        command += ["--frames", str(args.frames)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    assert process.stdout is not None
+    ready = process.stdout.readline()
+    if not ready.startswith("ready"):
+        process.kill()
+        raise RuntimeError("replay server failed to start")
+    return process
+
+
+def _run_once(args: argparse.Namespace, rate: float) -> LoadTestResult:
+    from PyQt6 import QtCore, QtWidgets
+
+    from .binance_client import StreamSettings
+    from .coalescing import PriceBar
+    from .widget import FloatingPriceWidget
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    port = _free_port()
+    server = _start_server(args, rate, port)
+    settings = StreamSettings(
+        base_url=f"ws://127.0.0.1:{port}/ws",
+        refresh_hz=args.refresh_hz,
+        engine=args.engine,
+        stream_process=args.stream_process,
+    )
+    widget = FloatingPriceWidget(settings=settings)
+    widget.show()
+
+    latencies: list[float] = []
+    received = 0
+    frames = 0
+    first_frame: float | None = None
+    last_frame = 0.0
+    stalls: list[float] = []
+    last_probe = time.perf_counter()
+
+    def on_bar(bar: PriceBar) -> None:
+        # Connected after the widget's own slot, so the label is already updated.
+        nonlocal received, frames, first_frame, last_frame
+        now = time.time()
+        received += bar.count
+        frames += 1
+        first_frame = first_frame or now
+        last_frame = now
+        latencies.append(now * 1000 - bar.trade_time)
+
+    def on_probe() -> None:
+        nonlocal last_probe
+        now = time.perf_counter()
+        lateness = now - last_probe - STALL_PROBE_INTERVAL_MS / 1000
+        last_probe = now
+        if lateness >= STALL_THRESHOLD:
+            stalls.append(lateness)
+
+    def check_server() -> None:
+        if server.poll() is not None:
+            # Give the last queued frame a chance to render before stopping.
+            QtCore.QTimer.singleShot(300, app.quit)
+            poll_timer.stop()
+
+    widget._streamer.bar_updated.connect(on_bar)
+    probe_timer = QtCore.QTimer()
+    probe_timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+    probe_timer.timeout.connect(on_probe)
+    probe_timer.start(STALL_PROBE_INTERVAL_MS)
+    poll_timer = QtCore.QTimer()
+    poll_timer.timeout.connect(check_server)
+    poll_timer.start(100)
+
+    app.exec()
+    probe_timer.stop()
+    widget.close()
+    output, _ = server.communicate(timeout=5)
+    sent = next((int(line[5:]) for line in output.splitlines() if line.startswith("sent=")), 0)
+
+    ordered = sorted(latencies)
+    active = (last_frame - first_frame) if first_frame else 0.0
+    return LoadTestResult(
+        target_rate=rate,
+        sent=sent,
+        received=received,
+        lost=max(0, sent - received),
+        frames=frames,
+        sustained_rate=received / active if active > 0 else 0.0,
+        latency_p50_ms=_percentile(ordered, 0.50),
+        latency_p90_ms=_percentile(ordered, 0.90),
+        latency_p99_ms=_percentile(ordered, 0.99),
+        latency_max_ms=ordered[-1] if ordered else 0.0,
+        stall_total_ms=sum(stalls) * 1000,
+        stall_max_ms=max(stalls, default=0.0) * 1000,
+    )
+
+
+def _print_table(results: list[LoadTestResult]) -> None:
+    header = (
+        f"{'target':>8} {'sent':>8} {'recv':>8} {'lost':>6} {'frames':>7} {'msg/s':>9} "
+        f"{'p50ms':>7} {'p90ms':>7} {'p99ms':>7} {'maxms':>7} {'stall':>8} {'maxstall':>8}"
+    )
+    print(header)
+    for r in results:
+        print(
+            f"{r.target_rate:>8.0f} {r.sent:>8} {r.received:>8} {r.lost:>6} {r.frames:>7} "
+            f"{r.sustained_rate:>9.0f} {r.latency_p50_ms:>7.1f} {r.latency_p90_ms:>7.1f} "
+            f"{r.latency_p99_ms:>7.1f} {r.latency_max_ms:>7.1f} {r.stall_total_ms:>8.1f} "
+            f"{r.stall_max_ms:>8.1f}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure streamer-to-widget throughput and latency.")
+    parser.add_argument("--rates", default="100,1000,5000", help="comma-separated messages per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per rate")
+    parser.add_argument("--frames", type=Path, help="NDJSON file with recorded trade frames")
+    parser.add_argument("--burst-rate", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=float, default=0.0)
+    parser.add_argument("--burst-length", type=float, default=0.0)
+    parser.add_argument("--refresh-hz", type=float, default=30.0)
+    parser.add_argument("--engine", choices=("thread", "asyncio"), default="thread")
+    parser.add_argument("--stream-process", action="store_true", help="stream and decode in a child process")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    rates = [float(rate) for rate in args.rates.split(",") if rate.strip()]
+    results = [_run_once(args, rate) for rate in rates]
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,32 +2,185 @@
 
 from __future__ import annotations
 
-import sys
+import time
+
+_STARTED = time.perf_counter()  # before the imports below, which are part of start-up
 
-from PyQt6 import QtWidgets
+import argparse
+import sys
 
-from .binance_client import StreamSettings
-from .config import load_config
-from .widget import FloatingPriceWidget
+from . import metrics
+from .config import AppConfig, ensure_config_file, indicator_names, load_config
+from .decoders import STREAM_KINDS
+from .headless import FORMATS, run_headless
+from .startup import StartupProfile
+from .stream_core import StreamSettings, create_stream
 
 DEBUG = False
 
 
-def main() -> None:
-    config = load_config()
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="crypto-float-monitor", description="Floating real-time crypto price.")
+    parser.add_argument("--headless", action="store_true", help="stream to stdout without opening a window")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson", help="headless output format")
+    parser.add_argument(
+        "--snapshot",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="headless: one conflated bar per symbol every N seconds instead of every trade",
+    )
+    parser.add_argument("--symbol", help="override the configured symbol")
+    parser.add_argument("--watchlist", help="comma-separated extra symbols (overrides the config)")
+    parser.add_argument("--base-url", help="WebSocket base URL, e.g. a local replay server")
+    parser.add_argument("--stream-kind", choices=STREAM_KINDS, help="stream subscribed per pair (overrides the config)")
+    parser.add_argument(
+        "--relay",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="share one exchange connection with other local instances (overrides the config)",
+    )
+    parser.add_argument(
+        "--depth",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="keep a local order book from the depth stream for mid/spread/imbalance (overrides the config)",
+    )
+    parser.add_argument(
+        "--stream-process",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="receive and decode trades in a child process (overrides the config)",
+    )
+    parser.add_argument(
+        "--relay-daemon",
+        action="store_true",
+        help="only run the relay hub, taking over when the current owner exits",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print a phase-by-phase start-up timing breakdown to stderr once the first price is shown",
+    )
+    return parser
+
+
+def _stream_settings(config: AppConfig, args: argparse.Namespace) -> StreamSettings:
+    watchlist = config.watchlist
+    if args.watchlist is not None:
+        watchlist = tuple(symbol.strip().upper() for symbol in args.watchlist.split(",") if symbol.strip())
+    extra = {"base_url": args.base_url} if args.base_url else {}
+    return StreamSettings(
+        symbol=(args.symbol or config.symbol).upper(),
+        watchlist=watchlist,
+        refresh_hz=config.refresh_hz,
+        engine=config.engine,
+        stream_kind=args.stream_kind or config.stream_kind,
+        compression=config.compression,
+        stream_process=config.stream_process if args.stream_process is None else args.stream_process,
+        history_capacity=config.history_capacity,
+        record_ticks=config.record_ticks,
+        replay_speed=config.replay_speed,
+        candle_intervals=config.candle_intervals,
+        redundant=config.redundant,
+        stall_timeout=config.stall_timeout,
+        relay=config.relay if args.relay is None else args.relay,
+        depth=config.depth if args.depth is None else args.depth,
+        depth_snapshot=config.depth_snapshot,
+        indicators=indicator_names(config),
+        **extra,
+    )
+
+
+def _enable_metrics(config: AppConfig) -> None:
+    if not (config.metrics or config.metrics_port):
+        return
+    registry = metrics.enable()
+    if config.metrics_port:
+        try:
+            metrics.MetricsServer(registry, port=config.metrics_port).start()
+        except OSError as exc:
+            print(f"[Main] Não foi possível servir métricas na porta {config.metrics_port}: {exc}", flush=True)
+
+
+def _run_gui(config: AppConfig, settings: StreamSettings, qt_args: list[str], profile: StartupProfile) -> int:
+    # The connection handshake runs on the engine's own thread while Qt is
+    # imported and the widget is built; the widget attaches to it afterwards.
+    core = create_stream(settings)
+    core.start()
+    profile.mark("stream start")
+
+    # Qt is only imported here so the headless mode never loads it.
+    from PyQt6 import QtCore, QtWidgets
+
+    from .config_watcher import ConfigWatcher
+    from .widget import FloatingPriceWidget
+
+    profile.mark("Qt import")
     if DEBUG:
         print("[Main] Inicializando QApplication...", flush=True)
-    app = QtWidgets.QApplication(sys.argv)
-    settings = StreamSettings(symbol=config.symbol)
+    app = QtWidgets.QApplication(qt_args)
+    profile.mark("QApplication")
+    watcher = ConfigWatcher(config, app)
     widget = FloatingPriceWidget(
-        settings=settings,
         alert_above=config.alert_above,
         alert_below=config.alert_below,
+        move_alerts=config.move_alerts,
+        sparkline_minutes=config.sparkline_minutes,
+        glyph_cache=config.glyph_cache,
+        price_source=config.price_source,
+        indicator_alerts=config.indicator_alerts,
+        show_indicators=config.indicators if config.show_indicators else (),
+        core=core,
+        config_watcher=watcher,
     )
+    profile.mark("widget")
     widget.show()
+    profile.mark("show")
+
+    milestones: set[str] = set()
+
+    def reached(phase: str) -> None:
+        profile.mark(phase)
+        milestones.add(phase)
+        if len(milestones) == 2:
+            profile.report()
+
+    def on_first_paint() -> None:
+        reached("first paint")
+        QtCore.QTimer.singleShot(0, create_config_file)
+
+    def create_config_file() -> None:
+        # Creating the config file is not needed to draw anything, so it waits.
+        ensure_config_file()
+        watcher.watch()
+
+    def on_first_price() -> None:
+        reached("first price")
+
+    widget.first_painted.connect(on_first_paint)
+    widget.first_price_shown.connect(on_first_price)
     if DEBUG:
         print("[Main] Widget exibido, iniciando loop de eventos.", flush=True)
-    sys.exit(app.exec())
+    return app.exec()
+
+
+def main() -> None:
+    args, qt_args = build_parser().parse_known_args()
+    profile = StartupProfile(_STARTED, enabled=args.profile_startup)
+    profile.mark("imports")
+    config = load_config(create=False)
+    settings = _stream_settings(config, args)
+    _enable_metrics(config)
+    profile.mark("config")
+    if args.relay_daemon:
+        from .relay import run_daemon
+
+        sys.exit(run_daemon(settings))
+    if args.headless:
+        ensure_config_file()
+        sys.exit(run_headless(settings, args.format, args.snapshot))
+    sys.exit(_run_gui(config, settings, [sys.argv[0], *qt_args], profile))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,254 @@
+"""Low-overhead counters, gauges and histograms with a Prometheus text endpoint.
+
+Metrics are off unless :func:`enable` is called. Hot paths hold the result of
+:func:`stream_metrics`, which is ``None`` while disabled, so the whole cost of
+instrumentation is then a single ``is None`` check per call site.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler
+
+DEBUG = False
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PARSE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3)
+
+
+class Counter:
+    """Monotonic count. Increments are not locked: concurrent writers may rarely lose one."""
+
+    __slots__ = ("name", "help", "value")
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("name", "help", "value")
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and three additions."""
+
+    __slots__ = ("name", "help", "bounds", "counts", "sum", "count")
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(buckets))
+        self.counts = array("q", bytes(8 * (len(self.bounds) + 1)))  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given quantile (the last bound if beyond)."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.bounds[-1]
+
+
+Metric = Counter | Gauge | Histogram
+
+
+class MetricsRegistry:
+    """Named metrics, created on first request and shared afterwards."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._stream_metrics: StreamMetrics | None = None
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get(name, lambda: Counter(name, help))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._get(name, lambda: Gauge(name, help))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(name, lambda: Histogram(name, help, buckets))  # type: ignore[return-value]
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for bound, count in zip(metric.bounds, metric.counts):
+                    cumulative += count
+                    lines.append(f'{metric.name}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric.name}_bucket{{le="+Inf"}} {metric.count}')
+                lines.append(f"{metric.name}_sum {metric.sum!r}")
+                lines.append(f"{metric.name}_count {metric.count}")
+            else:
+                lines.append(f"{metric.name} {metric.value!r}")
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name: str, factory: Callable[[], Metric]) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = factory()
+        return metric
+
+
+class StreamMetrics:
+    """The instruments the streaming hot paths update."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.messages_received = registry.counter(
+            "cfm_messages_received_total", "WebSocket frames received."
+        )
+        self.bytes_received = registry.counter(
+            "cfm_received_bytes_total", "Characters of WebSocket frames received, after decompression."
+        )
+        self.messages_parsed = registry.counter(
+            "cfm_messages_parsed_total", "Frames decoded into a trade."
+        )
+        self.parse_seconds = registry.histogram(
+            "cfm_parse_seconds", "Time spent decoding one frame.", PARSE_BUCKETS
+        )
+        self.event_latency = registry.histogram(
+            "cfm_event_to_emit_seconds", "Local clock minus the trade time (T) when an update is emitted."
+        )
+        self.queue_delay = registry.histogram(
+            "cfm_queue_delay_seconds", "Delay between the network thread queueing an update and the Qt thread picking it up."
+        )
+        self.slot_seconds = registry.histogram(
+            "cfm_gui_slot_seconds", "Time spent in the Qt slots connected to one update."
+        )
+        self.reconnects = registry.counter("cfm_reconnects_total", "Reconnect attempts.")
+        self.trades_missed = registry.counter(
+            "cfm_trades_missed_total", "Trades skipped by the trade-id sequence on every connection."
+        )
+        self.connection_start = registry.gauge(
+            "cfm_connection_start_time_seconds", "Unix time the current connection opened, 0 while disconnected."
+        )
+        self.start_time = registry.gauge("cfm_start_time_seconds", "Unix time metrics were enabled.")
+        if not self.start_time.value:
+            self.start_time.set(time.time())
+
+
+_registry: MetricsRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def enable() -> MetricsRegistry:
+    """Turn metrics on for streamers created from now on; returns the registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+
+def registry() -> MetricsRegistry | None:
+    return _registry
+
+
+def stream_metrics() -> StreamMetrics | None:
+    """Instruments for the streaming code, or ``None`` when metrics are disabled."""
+    current = _registry
+    if current is None:
+        return None
+    if current._stream_metrics is None:
+        current._stream_metrics = StreamMetrics(current)
+    return current._stream_metrics
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` in Prometheus text format from a daemon thread."""
+
+    def __init__(self, metrics: MetricsRegistry, host: str = "127.0.0.1", port: int = 9464) -> None:
+        from http.server import ThreadingHTTPServer  # only paid for when serving
+
+        self._metrics = metrics
+        handler = self._make_handler()
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        self._log(f"Servindo métricas em http://{self.address[0]}:{self.address[1]}/metrics")
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        from http.server import BaseHTTPRequestHandler
+
+        metrics = self._metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[MetricsServer] {message}", flush=True)
@@ -0,0 +1,347 @@
+"""Local order books kept in sync with Binance ``@depth@100ms`` diff streams.
+
+The book follows Binance's procedure for a local copy: diff events are
+buffered while a depth snapshot is fetched, events already contained in the
+snapshot (``u <= lastUpdateId``) are dropped, and from then on every event
+must continue where the previous one ended (``U <= last + 1 <= u``). When ids
+skip ahead the book is thrown away and resynced from a fresh snapshot.
+
+Snapshots come from a :data:`SnapshotSource`: the REST endpoint by default, or
+a JSON file in the same shape (see :func:`snapshot_source`), which lets tests
+and the local replay server stand in for the exchange.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+from .decoders import DepthUpdate
+from .metrics import registry
+
+DEBUG = False
+
+DEFAULT_REST_URL = "https://api.binance.com"
+SNAPSHOT_LIMIT = 1000  # levels per side requested from the REST endpoint
+SNAPSHOT_RETRY_DELAY = 1.0
+MAX_PENDING = 1000  # diff events buffered per symbol while a snapshot is fetched
+APPLY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 2.5e-3)
+
+
+class DepthSnapshot(NamedTuple):
+    last_update_id: int
+    bids: list[list[str]]
+    asks: list[list[str]]
+
+
+SnapshotSource = Callable[[str], DepthSnapshot]
+
+
+class BookTop(NamedTuple):
+    """Immutable top of one book, safe to hand to other threads."""
+
+    symbol: str
+    bid: float
+    bid_quantity: float
+    ask: float
+    ask_quantity: float
+    imbalance: float  # (bid qty - ask qty) / (bid qty + ask qty) over the top levels, in [-1, 1]
+    update_id: int
+    event_time: int
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+    @property
+    def spread(self) -> float:
+        return self.ask - self.bid
+
+
+def parse_snapshot(payload: Any) -> DepthSnapshot:
+    """``{"lastUpdateId": .., "bids": [[price, qty], ..], "asks": [..]}`` as returned by ``/api/v3/depth``."""
+    return DepthSnapshot(int(payload["lastUpdateId"]), list(payload["bids"]), list(payload["asks"]))
+
+
+def rest_snapshot_source(base_url: str = DEFAULT_REST_URL, limit: int = SNAPSHOT_LIMIT, timeout: float = 10.0) -> SnapshotSource:
+    base = base_url.rstrip("/")
+
+    def fetch(symbol: str) -> DepthSnapshot:
+        url = f"{base}/api/v3/depth?symbol={symbol.upper()}&limit={limit}"
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return parse_snapshot(json.loads(response.read()))
+
+    return fetch
+
+
+def file_snapshot_source(path: Path) -> SnapshotSource:
+    """Snapshots from ``path``: a single JSON file, or a directory of ``<SYMBOL>.json`` files."""
+
+    def load(symbol: str) -> DepthSnapshot:
+        target = path / f"{symbol.upper()}.json" if path.is_dir() else path
+        return parse_snapshot(json.loads(target.read_text(encoding="utf-8")))
+
+    return load
+
+
+def snapshot_source(spec: str = "") -> SnapshotSource:
+    """REST for ``""`` or an ``http(s)://`` base URL, otherwise a fixture path."""
+    if not spec:
+        return rest_snapshot_source()
+    if spec.startswith(("http://", "https://")):
+        return rest_snapshot_source(spec)
+    return file_snapshot_source(Path(spec).expanduser())
+
+
+class BookSide:
+    """Price levels of one side in parallel sorted arrays, best level last.
+
+    Bids are keyed by price and asks by negated price, so both arrays ascend
+    towards the best level. Lookups are a bisect; inserts and removals shift
+    only the levels on the best side of the change, which is where nearly all
+    updates land, and top-N reads slice the tail.
+    """
+
+    __slots__ = ("_sign", "_keys", "_quantities")
+
+    def __init__(self, ask: bool) -> None:
+        self._sign = -1.0 if ask else 1.0
+        self._keys = array("d")
+        self._quantities = array("d")
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, levels: Iterable[list[str]]) -> None:
+        sign = self._sign
+        book = {sign * float(price): float(quantity) for price, quantity in levels if float(quantity)}
+        keys = sorted(book)
+        self._keys = array("d", keys)
+        self._quantities = array("d", (book[key] for key in keys))
+
+    def update(self, levels: Iterable[list[str]]) -> None:
+        """Set absolute quantities from ``[price, quantity]`` pairs; a zero quantity removes the level."""
+        sign = self._sign
+        keys = self._keys
+        quantities = self._quantities
+        for price, quantity in levels:
+            key = sign * float(price)
+            amount = float(quantity)
+            index = bisect_left(keys, key)
+            if index < len(keys) and keys[index] == key:
+                if amount:
+                    quantities[index] = amount
+                else:
+                    del keys[index]
+                    del quantities[index]
+            elif amount:
+                keys.insert(index, key)
+                quantities.insert(index, amount)
+
+    def best(self) -> tuple[float, float] | None:
+        if not self._keys:
+            return None
+        return self._sign * self._keys[-1], self._quantities[-1]
+
+    def top(self, levels: int) -> list[tuple[float, float]]:
+        """Up to ``levels`` ``(price, quantity)`` pairs, best first."""
+        sign = self._sign
+        start = max(0, len(self._keys) - levels)
+        return [(sign * key, quantity) for key, quantity in zip(reversed(self._keys[start:]), reversed(self._quantities[start:]))]
+
+    def quantity(self, levels: int) -> float:
+        """Total quantity resting on the best ``levels`` levels."""
+        return sum(self._quantities[max(0, len(self._quantities) - levels) :])
+
+
+class OrderBook:
+    """Local copy of one symbol's book; a single writer, see :class:`DepthBooks`."""
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.bids = BookSide(ask=False)
+        self.asks = BookSide(ask=True)
+        self.last_update_id = 0
+        self.event_time = 0
+
+    def load_snapshot(self, snapshot: DepthSnapshot) -> None:
+        self.bids.load(snapshot.bids)
+        self.asks.load(snapshot.asks)
+        self.last_update_id = snapshot.last_update_id
+
+    def apply(self, update: DepthUpdate) -> bool:
+        """Apply one diff event; ``False`` when ids skipped ahead and the book needs a resync.
+
+        Events entirely at or before ``last_update_id`` are ignored.
+        """
+        if update.final_update_id <= self.last_update_id:
+            return True
+        if update.first_update_id > self.last_update_id + 1:
+            return False
+        self.bids.update(update.bids)
+        self.asks.update(update.asks)
+        self.last_update_id = update.final_update_id
+        self.event_time = update.event_time
+        return True
+
+    def top(self, levels: int = 1) -> BookTop | None:
+        """Best bid/ask and the quantity imbalance over the best ``levels`` levels; ``None`` if a side is empty."""
+        bid = self.bids.best()
+        ask = self.asks.best()
+        if bid is None or ask is None:
+            return None
+        if levels == 1:
+            bid_quantity, ask_quantity = bid[1], ask[1]
+        else:
+            bid_quantity, ask_quantity = self.bids.quantity(levels), self.asks.quantity(levels)
+        total = bid_quantity + ask_quantity
+        imbalance = (bid_quantity - ask_quantity) / total if total else 0.0
+        return BookTop(self.symbol, bid[0], bid[1], ask[0], ask[1], imbalance, self.last_update_id, self.event_time)
+
+
+class DepthBooks:
+    """One :class:`OrderBook` per symbol, synced from snapshots and diff events.
+
+    ``handle`` runs on the network thread. A symbol without a synced book
+    buffers its events while a short-lived thread fetches the snapshot, then
+    the buffer is replayed on top of it; a snapshot older than the buffered
+    events is fetched again. ``on_book(symbol, top)`` is called with a fresh
+    :class:`BookTop` after every applied event, and ``on_resync(symbol)``
+    whenever a sequence gap throws a synced book away.
+    """
+
+    def __init__(
+        self,
+        source: SnapshotSource,
+        *,
+        on_book: Callable[[str, BookTop], None] | None = None,
+        on_resync: Callable[[str], None] | None = None,
+        imbalance_levels: int = 1,
+        retry_delay: float = SNAPSHOT_RETRY_DELAY,
+    ) -> None:
+        self._source = source
+        self.on_book = on_book
+        self.on_resync = on_resync
+        self._imbalance_levels = imbalance_levels
+        self._retry_delay = retry_delay
+        self._lock = threading.Lock()
+        self._books: dict[str, OrderBook] = {}
+        self._pending: dict[str, list[DepthUpdate]] = {}
+        self._closed = threading.Event()
+        metrics = registry()
+        if metrics is not None:
+            self._apply_seconds = metrics.histogram("cfm_book_apply_seconds", "Time to apply one depth diff.", APPLY_BUCKETS)
+            self._resyncs = metrics.counter("cfm_book_resyncs_total", "Order books resynced after a sequence gap.")
+        else:
+            self._apply_seconds = None
+            self._resyncs = None
+
+    def book(self, symbol: str) -> OrderBook | None:
+        """The synced book of ``symbol``; only the network thread may read it while streaming."""
+        return self._books.get(symbol.upper())
+
+    def top(self, symbol: str) -> BookTop | None:
+        with self._lock:
+            book = self._books.get(symbol.upper())
+            return book.top(self._imbalance_levels) if book is not None else None
+
+    def handle(self, update: DepthUpdate) -> None:
+        symbol = update.symbol
+        with self._lock:
+            pending = self._pending.get(symbol)
+            if pending is not None:
+                pending.append(update)
+                if len(pending) > MAX_PENDING:
+                    # Only what follows the next snapshot matters; the oldest can go.
+                    del pending[: len(pending) - MAX_PENDING]
+                return
+            book = self._books.get(symbol)
+            if book is None:
+                self._resync(symbol, update)
+                return
+            started = time.perf_counter() if self._apply_seconds is not None else 0.0
+            if not book.apply(update):
+                self._log(f"Lacuna no livro de {symbol}: {book.last_update_id} -> {update.first_update_id}")
+                del self._books[symbol]
+                if self._resyncs is not None:
+                    self._resyncs.inc()
+                if self.on_resync is not None:
+                    self.on_resync(symbol)
+                self._resync(symbol, update)
+                return
+            if self._apply_seconds is not None:
+                self._apply_seconds.observe(time.perf_counter() - started)
+            self._publish(book)
+
+    def forget(self, symbol: str) -> None:
+        """Drop the book (or the pending sync) of a symbol no longer streamed."""
+        with self._lock:
+            self._books.pop(symbol, None)
+            self._pending.pop(symbol, None)
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._pending.clear()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _resync(self, symbol: str, update: DepthUpdate) -> None:
+        # Caller holds _lock.
+        self._pending[symbol] = [update]
+        threading.Thread(target=self._sync, args=(symbol,), name=f"DepthSnapshot-{symbol}", daemon=True).start()
+
+    def _sync(self, symbol: str) -> None:
+        while not self._closed.is_set():
+            try:
+                snapshot = self._source(symbol)
+            except Exception as exc:
+                self._log(f"Falha ao obter snapshot de {symbol}: {exc}")
+                if self._closed.wait(self._retry_delay):
+                    return
+                continue
+            with self._lock:
+                pending = self._pending.get(symbol)
+                if pending is None:
+                    return  # forgotten or closed meanwhile
+                book = OrderBook(symbol)
+                book.load_snapshot(snapshot)
+                events = [event for event in pending if event.final_update_id > snapshot.last_update_id]
+                applied = 0
+                for event in events:
+                    if not book.apply(event):
+                        break
+                    applied += 1
+                if applied == len(events):
+                    del self._pending[symbol]
+                    self._books[symbol] = book
+                    self._log(f"Livro de {symbol} sincronizado em {book.last_update_id} ({applied} eventos reaplicados)")
+                    self._publish(book)
+                    return
+                # The snapshot predates the buffered events (or they have a gap):
+                # keep what is still usable and ask for a newer snapshot.
+                pending[:] = events[applied:]
+            self._log(f"Snapshot de {symbol} em {snapshot.last_update_id} anterior aos eventos; buscando outro.")
+            if self._closed.wait(self._retry_delay):
+                return
+
+    def _publish(self, book: OrderBook) -> None:
+        # Caller holds _lock.
+        if self.on_book is None:
+            return
+        top = book.top(self._imbalance_levels)
+        if top is not None:
+            self.on_book(book.symbol, top)
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[DepthBooks] {message}", flush=True)
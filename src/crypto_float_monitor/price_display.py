@@ -0,0 +1,220 @@
+"""Price text widget with a cheap per-update path."""
+
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+NEUTRAL, UP, DOWN = 0, 1, 2
+COLORS = ("#f5f5f5", "#38b000", "#ff4d4f")  # placeholder, price up (or first), price down
+PADDING = 8  # matches the widget stylesheet's ``padding: 8px``
+
+# pt-BR groups with dots and uses a decimal comma; everything else keeps 1,234.56.
+_LOCALE_TABLES = {"R$": str.maketrans(",.", ".,")}
+
+
+class PriceFormatter:
+    """Formats prices for one currency, remembering recent results.
+
+    Consecutive trades mostly repeat a handful of prices, so most calls are a
+    single dict lookup. The cache is dropped wholesale once it reaches
+    ``max_entries`` to stay bounded without per-call bookkeeping.
+    """
+
+    def __init__(self, currency: str = "", max_entries: int = 4096) -> None:
+        self.currency = currency
+        self._prefix = f"{currency} " if currency else ""
+        self._table = _LOCALE_TABLES.get(currency)
+        self._max_entries = max_entries
+        self._cache: dict[float, str] = {}
+
+    def __call__(self, price: float) -> str:
+        text = self._cache.get(price)
+        if text is None:
+            if len(self._cache) >= self._max_entries:
+                self._cache.clear()
+            number = f"{price:,.2f}"
+            if self._table is not None:
+                number = number.translate(self._table)
+            text = self._cache[price] = self._prefix + number
+        return text
+
+
+class _GlyphCache:
+    """One pre-rendered pixmap per (character, color) for a fixed font."""
+
+    def __init__(self, font: QtGui.QFont, ratio: float) -> None:
+        self.font = font
+        self.ratio = ratio
+        self._metrics = QtGui.QFontMetricsF(font)
+        self._colors = tuple(QtGui.QColor(color) for color in COLORS)
+        self._glyphs: dict[tuple[str, int], tuple[QtGui.QPixmap, float]] = {}
+
+    @property
+    def height(self) -> float:
+        return self._metrics.height()
+
+    def glyph(self, char: str, color: int) -> tuple[QtGui.QPixmap, float]:
+        key = (char, color)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            advance = self._metrics.horizontalAdvance(char)
+            # One pixel of bleed on each side for glyphs that overhang their advance.
+            width, height = math.ceil(advance) + 2, math.ceil(self._metrics.height())
+            pixmap = QtGui.QPixmap(int(width * self.ratio), int(height * self.ratio))
+            pixmap.setDevicePixelRatio(self.ratio)
+            pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+            painter = QtGui.QPainter(pixmap)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.TextAntialiasing)
+            painter.setFont(self.font)
+            painter.setPen(self._colors[color])
+            painter.drawText(QtCore.QPointF(1.0, self._metrics.ascent()), char)
+            painter.end()
+            glyph = self._glyphs[key] = (pixmap, advance)
+        return glyph
+
+    def width(self, text: str, color: int) -> float:
+        return sum(self.glyph(char, color)[1] for char in text)
+
+
+class PriceDisplay(QtWidgets.QWidget):
+    """Centered price text that only repaints when what it shows changes.
+
+    ``set_price`` formats through a :class:`PriceFormatter` and compares the
+    result (and the up/down color) with what is on screen; an unchanged frame
+    costs a dict lookup and two comparisons. Colors are ``QColor`` objects built
+    once, so changing direction never goes through a stylesheet re-polish.
+
+    A change only invalidates the box around the old and new text, and the
+    stylesheet background is rendered into a pixmap once per size, so a
+    repaint is a blit plus the text. With ``glyph_cache`` the text itself is
+    blitted from per-character pixmaps rendered once instead of being shaped
+    on every paint.
+    """
+
+    def __init__(
+        self,
+        currency: str = "",
+        parent: Optional[QtWidgets.QWidget] = None,
+        *,
+        font: QtGui.QFont | None = None,
+        glyph_cache: bool = False,
+    ) -> None:
+        super().__init__(parent)
+        self._formatter = PriceFormatter(currency)
+        self._colors = tuple(QtGui.QColor(color) for color in COLORS)
+        self._text = ""
+        self._color = NEUTRAL
+        self._last_price: float | None = None
+        self._use_glyph_cache = glyph_cache
+        self._glyphs: _GlyphCache | None = None
+        self._background: QtGui.QPixmap | None = None
+        self._text_rect = QtCore.QRect()
+        self.setFont(font or QtGui.QFont("Sans Serif", 26, QtGui.QFont.Weight.Bold))
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_StyledBackground)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Fixed)
+
+    def text(self) -> str:
+        return self._text
+
+    def set_currency(self, currency: str) -> None:
+        if currency != self._formatter.currency:
+            self._formatter = PriceFormatter(currency)
+
+    def set_placeholder(self, text: str) -> None:
+        """Show ``text`` in the neutral color; the next price starts a fresh up/down sequence."""
+        self._last_price = None
+        self._show(text, NEUTRAL)
+
+    def set_price(self, price: float) -> bool:
+        """Show ``price``; returns whether a repaint was scheduled."""
+        last = self._last_price
+        self._last_price = price
+        # Same rule as before the rewrite: red only on a drop, green otherwise.
+        color = DOWN if last is not None and price < last else UP
+        return self._show(self._formatter(price), color)
+
+    def sizeHint(self) -> QtCore.QSize:  # noqa: N802 - Qt API
+        metrics = QtGui.QFontMetrics(self.font())
+        return QtCore.QSize(metrics.horizontalAdvance(self._text) + 2 * PADDING, metrics.height() + 2 * PADDING)
+
+    def minimumSizeHint(self) -> QtCore.QSize:  # noqa: N802 - Qt API
+        return QtCore.QSize(0, self.sizeHint().height())
+
+    def paintEvent(self, a0: QtGui.QPaintEvent | None) -> None:  # noqa: N802 - Qt API
+        painter = QtGui.QPainter(self)
+        if a0 is not None:
+            painter.setClipRegion(a0.region())
+        painter.drawPixmap(0, 0, self._styled_background())
+        if self._use_glyph_cache:
+            self._paint_glyphs(painter)
+        else:
+            painter.setPen(self._colors[self._color])
+            painter.drawText(self.rect(), QtCore.Qt.AlignmentFlag.AlignCenter, self._text)
+        painter.end()
+
+    def resizeEvent(self, a0: QtGui.QResizeEvent | None) -> None:  # noqa: N802 - Qt API
+        self._background = None
+        self._text_rect = self._rect_for(self._text)
+        super().resizeEvent(a0)
+
+    def changeEvent(self, a0: QtCore.QEvent | None) -> None:  # noqa: N802 - Qt API
+        if a0 is not None:
+            kind = a0.type()
+            if kind == QtCore.QEvent.Type.FontChange:
+                self._glyphs = None
+                self._text_rect = self._rect_for(self._text)
+            elif kind == QtCore.QEvent.Type.StyleChange:
+                self._background = None
+        super().changeEvent(a0)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _show(self, text: str, color: int) -> bool:
+        if text == self._text and color == self._color:
+            return False
+        rect = self._rect_for(text)
+        self.update(rect.united(self._text_rect))
+        self._text = text
+        self._color = color
+        self._text_rect = rect
+        return True
+
+    def _rect_for(self, text: str) -> QtCore.QRect:
+        """Box ``text`` occupies when centered (plus a pixel for antialiasing)."""
+        metrics = self.fontMetrics()
+        width = metrics.horizontalAdvance(text) + 4
+        height = metrics.height() + 2
+        return QtCore.QRect((self.width() - width) // 2, (self.height() - height) // 2, width, height)
+
+    def _styled_background(self) -> QtGui.QPixmap:
+        # The stylesheet's rounded box (what the QLabel used to paint), drawn once per size.
+        background = self._background
+        ratio = self.devicePixelRatioF()
+        if background is None or background.devicePixelRatio() != ratio:
+            background = QtGui.QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            background.setDevicePixelRatio(ratio)
+            background.fill(QtCore.Qt.GlobalColor.transparent)
+            painter = QtGui.QPainter(background)
+            option = QtWidgets.QStyleOption()
+            option.initFrom(self)
+            self.style().drawPrimitive(QtWidgets.QStyle.PrimitiveElement.PE_Widget, option, painter, self)
+            painter.end()
+            self._background = background
+        return background
+
+    def _paint_glyphs(self, painter: QtGui.QPainter) -> None:
+        ratio = self.devicePixelRatioF()
+        glyphs = self._glyphs
+        if glyphs is None or glyphs.ratio != ratio:
+            glyphs = self._glyphs = _GlyphCache(self.font(), ratio)
+        color = self._color
+        x = (self.width() - glyphs.width(self._text, color)) / 2 - 1.0
+        y = (self.height() - glyphs.height) / 2
+        for char in self._text:
+            pixmap, advance = glyphs.glyph(char, color)
+            painter.drawPixmap(QtCore.QPointF(x, y), pixmap)
+            x += advance
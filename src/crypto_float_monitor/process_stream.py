@@ -0,0 +1,346 @@
+"""Run the network and decode work in a child process, handing ticks over shared memory.
+
+With ``stream_process`` set, :class:`ProcessStream` spawns a child that runs
+the configured engine (including ``relay``) and writes every decoded trade
+into a :class:`TickRing` in ``multiprocessing.shared_memory``. The parent only
+reads fixed-size records out of that buffer, so JSON decoding and socket
+handling never compete with the Qt thread for the GIL.
+
+The ring has one writer (the child) and one reader (the parent's reader
+thread). Every slot carries a sequence number that is odd while the slot is
+being written and ``2 * n + 2`` once record ``n`` is complete; the reader
+checks it before and after unpacking, so it never returns a torn or
+overwritten record. The writer never waits: a reader that falls a whole ring
+behind skips to the oldest record still there, and the trade-id gap shows up
+through ``on_gap`` as for a dropped connection. A sleeping reader is woken
+through a pipe, and the writer only touches the pipe when the reader has
+flagged itself as waiting.
+
+The parent watches the child's process sentinel and respawns it with
+jittered backoff when it dies; the ring, the core's stores and every callback
+stay in place, so the widget only sees a status change and, at worst, a gap.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import multiprocessing
+import os
+import signal
+import struct
+import threading
+from multiprocessing import connection
+from typing import Any
+
+from .decoders import TradeTick
+from .stream_core import StreamCore, StreamSettings, backoff_delay, create_stream
+
+try:  # Missing on interpreters built without _posixshmem.
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - depends on the environment
+    shared_memory = None  # type: ignore[assignment]
+
+DEBUG = False
+
+RING_SLOTS = 1 << 16  # records kept in the ring, about 4.5 MiB
+WAIT_TIMEOUT = 0.05  # seconds the reader sleeps at most, even if a wake-up byte is missed
+RESTART_DELAY = 0.5  # base of the backoff between child restarts
+STOP_TIMEOUT = 5.0  # seconds a child gets to close its connections before it is killed
+
+# written count, slot count, reader waiting (1 byte)
+_HEADER = struct.Struct("<QQB7x")
+_WRITTEN = struct.Struct("<Q")
+_WAITING_OFFSET = 16
+# sequence, symbol, trade id, trade time (ms), price, quantity, buyer is maker
+_SLOT = struct.Struct("<Q24sqqddB7x")
+_SEQUENCE = struct.Struct("<Q")
+_RECORD = struct.Struct("<24sqqddB")
+
+
+def process_stream_available() -> bool:
+    return shared_memory is not None and hasattr(os, "set_blocking")
+
+
+class TickRing:
+    """Fixed-size trade records in shared memory, guarded slot by slot by a sequence lock."""
+
+    def __init__(self, memory: shared_memory.SharedMemory) -> None:
+        self._memory = memory
+        self._buffer = memory.buf
+        self._written, self.slots, _ = _HEADER.unpack_from(self._buffer, 0)
+        self._names: dict[bytes, str] = {}
+
+    @classmethod
+    def create(cls, slots: int = RING_SLOTS) -> TickRing:
+        memory = shared_memory.SharedMemory(create=True, size=_HEADER.size + slots * _SLOT.size)
+        _HEADER.pack_into(memory.buf, 0, 0, slots, 0)
+        return cls(memory)
+
+    @classmethod
+    def attach(cls, name: str) -> TickRing:
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def written(self) -> int:
+        """Records published so far."""
+        return _WRITTEN.unpack_from(self._buffer, 0)[0]
+
+    @property
+    def reader_waiting(self) -> bool:
+        return bool(self._buffer[_WAITING_OFFSET])
+
+    @reader_waiting.setter
+    def reader_waiting(self, waiting: bool) -> None:
+        self._buffer[_WAITING_OFFSET] = 1 if waiting else 0
+
+    def write(self, symbol: str, tick: TradeTick) -> None:
+        """Append one record (writer side only)."""
+        written = self._written
+        offset = _HEADER.size + written % self.slots * _SLOT.size
+        sequence = 2 * written + 1
+        _SEQUENCE.pack_into(self._buffer, offset, sequence)
+        _RECORD.pack_into(
+            self._buffer,
+            offset + _SEQUENCE.size,
+            symbol.encode(),
+            tick.trade_id,
+            tick.trade_time,
+            tick.price,
+            tick.quantity,
+            tick.buyer_is_maker,
+        )
+        _SEQUENCE.pack_into(self._buffer, offset, sequence + 1)
+        self._written = written + 1
+        _WRITTEN.pack_into(self._buffer, 0, written + 1)
+
+    def read(self, position: int) -> tuple[list[TradeTick], int]:
+        """Records from ``position`` on (reader side only), and the position to continue from."""
+        ticks: list[TradeTick] = []
+        buffer, slots, names = self._buffer, self.slots, self._names
+        written = self.written
+        position = max(position, written - slots)
+        while position < written:
+            offset = _HEADER.size + position % slots * _SLOT.size
+            sequence, raw_symbol, trade_id, trade_time, price, quantity, maker = _SLOT.unpack_from(buffer, offset)
+            if sequence != 2 * position + 2 or _SEQUENCE.unpack_from(buffer, offset)[0] != sequence:
+                # The writer lapped us while we read: move past what it has overwritten.
+                position = max(position + 1, self.written - slots + 1)
+                continue
+            symbol = names.get(raw_symbol)
+            if symbol is None:
+                symbol = names[raw_symbol] = raw_symbol.rstrip(b"\0").decode()
+            ticks.append(TradeTick(symbol, price, quantity, trade_time, trade_id, bool(maker)))
+            position += 1
+        return ticks, position
+
+    def close(self) -> None:
+        self._memory.close()
+
+    def unlink(self) -> None:
+        self._memory.unlink()
+
+
+class ProcessStream(StreamCore):
+    """Runs ``settings.engine`` in a supervised child process and reads its trades from a :class:`TickRing`.
+
+    The parent keeps everything that consumers read: history, candles,
+    indicators, trade-id tracking and the coalescer are fed by a reader thread
+    through ``_handle_tick``, exactly as the in-process engines do. Pair changes
+    are forwarded to the child, which applies them on its live connection.
+    Depth books are not carried over the ring, so ``depth`` bypasses this mode.
+    """
+
+    def __init__(self, settings: StreamSettings | None = None, **callbacks: Any) -> None:
+        super().__init__(settings, **callbacks)
+        self._context = multiprocessing.get_context("spawn")
+        self._ring: TickRing | None = None
+        self._process: multiprocessing.process.BaseProcess | None = None
+        self._control: connection.Connection | None = None
+        self._control_lock = threading.Lock()
+        self._wake_read: connection.Connection | None = None
+        self._wake_write: connection.Connection | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._restarts = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._ring = TickRing.create()
+        self._wake_read, self._wake_write = self._context.Pipe(duplex=False)
+        os.set_blocking(self._wake_read.fileno(), False)
+        self._spawn()
+        self._thread = threading.Thread(target=self._run, name="StreamProcessReader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._log("Solicitando parada do processo de stream...")
+        if self._thread is not None:
+            self._thread.join(timeout=STOP_TIMEOUT)
+        self._stop_child()
+        for pipe in (self._wake_read, self._wake_write):
+            if pipe is not None:
+                pipe.close()
+        self._wake_read = self._wake_write = None
+        ring, self._ring = self._ring, None
+        if ring is not None:
+            ring.close()
+            ring.unlink()
+        self._close_resources()
+        self._log("Streamer parado.")
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _send_text(self, text: str) -> bool:
+        return False  # the child owns the exchange connection; see _send_control
+
+    def _send_control(self, method: str, symbols: list[str]) -> None:
+        # Whatever changed, the child is told the full set and sends the difference upstream.
+        self._post(("symbols", self.streamed_symbols()))
+
+    def _post(self, message: tuple[str, Any]) -> None:
+        with self._control_lock:
+            if self._control is None:
+                return  # the next child starts with the current symbols
+            try:
+                self._control.send(message)
+            except (OSError, ValueError) as exc:
+                self._log(f"Falha ao falar com o processo de stream: {exc}")
+
+    def _spawn(self) -> None:
+        symbols = self.streamed_symbols()
+        child_settings = dataclasses.replace(
+            self._settings,
+            symbol=symbols[0],
+            watchlist=symbols[1:],
+            stream_process=False,
+            depth=False,
+            record_ticks=False,
+            history_capacity=1,
+            candle_intervals=(),
+            indicators=(),
+        )
+        parent_end, child_end = self._context.Pipe()
+        assert self._ring is not None and self._wake_write is not None
+        process = self._context.Process(
+            target=_child_main,
+            args=(child_settings, self._ring.name, self._wake_write, child_end),
+            name="CryptoFloatMonitorStream",
+            daemon=True,
+        )
+        process.start()
+        child_end.close()
+        with self._control_lock:
+            self._process, self._control = process, parent_end
+        self._log(f"Processo de stream iniciado (pid {process.pid})")
+
+    def _stop_child(self) -> None:
+        with self._control_lock:
+            process, control = self._process, self._control
+            self._process = self._control = None
+        if control is not None:
+            control.close()  # the child stops its engine when the pipe closes
+        if process is None:
+            return
+        process.join(timeout=STOP_TIMEOUT)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def _run(self) -> None:
+        ring, wake = self._ring, self._wake_read
+        assert ring is not None and wake is not None
+        position = ring.written
+        while not self._stop_event.is_set():
+            process, control = self._process, self._control
+            if process is None or control is None:
+                return
+            ring.reader_waiting = True
+            if ring.written == position:
+                connection.wait([wake, control, process.sentinel], WAIT_TIMEOUT)
+            ring.reader_waiting = False
+            try:
+                while os.read(wake.fileno(), 4096):
+                    pass
+            except BlockingIOError:
+                pass
+            ticks, position = ring.read(position)
+            if ticks:
+                self._restarts = 0
+                metrics = self._metrics
+                if metrics is not None:
+                    metrics.messages_received.inc(len(ticks))
+                    metrics.messages_parsed.inc(len(ticks))
+                for tick in ticks:
+                    self._handle_tick(tick)
+            self._read_control(control)
+            if not process.is_alive() and not self._stop_event.is_set():
+                self._restart(process)
+                position = max(position, ring.written - ring.slots)
+
+    def _read_control(self, control: connection.Connection) -> None:
+        try:
+            while control.poll():
+                kind, payload = control.recv()
+                if kind == "status":
+                    self._report_status(payload)
+        except (EOFError, OSError):
+            pass  # the child is gone; its sentinel says so too
+
+    def _restart(self, process: multiprocessing.process.BaseProcess) -> None:
+        self._log(f"Processo de stream terminou (código {process.exitcode}); reiniciando.")
+        self._stop_child()
+        self._report_status("Reiniciando processo de stream…")
+        delay = backoff_delay(self._restarts, RESTART_DELAY, self._settings.reconnect_max_delay)
+        self._restarts += 1
+        if self._metrics is not None:
+            self._metrics.reconnects.inc()
+        if self._stop_event.wait(delay):
+            return
+        self._spawn()
+
+
+def _child_main(
+    settings: StreamSettings, ring_name: str, wake: connection.Connection, control: connection.Connection
+) -> None:
+    """Child process: stream with ``settings.engine`` into the ring until the control pipe closes."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches the whole group; the parent decides
+    ring = TickRing.attach(ring_name)
+    wake_fd = wake.fileno()
+    os.set_blocking(wake_fd, False)
+    send_lock = threading.Lock()
+
+    def on_tick(symbol: str, tick: TradeTick) -> None:
+        ring.write(symbol, tick)
+        if ring.reader_waiting:
+            try:
+                os.write(wake_fd, b"\0")
+            except BlockingIOError:
+                pass  # the pipe is full of wake-ups already
+
+    def on_status(status: str) -> None:
+        with send_lock:
+            try:
+                control.send(("status", status))
+            except OSError:
+                pass
+
+    core = create_stream(settings, on_tick=on_tick, on_status=on_status)
+    core.start()
+    try:
+        while True:
+            kind, payload = control.recv()
+            if kind == "symbols" and payload:
+                core.set_symbols(payload[0], payload[1:])
+    except (EOFError, OSError):
+        pass
+    finally:
+        core.stop()
+        ring.close()
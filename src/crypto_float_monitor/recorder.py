@@ -0,0 +1,315 @@
+"""Append-only binary tick recording and memory-mapped replay."""
+
+from __future__ import annotations
+
+import mmap
+import queue
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Sequence
+
+from .config import data_dir
+from .decoders import TradeTick
+from .vector import load_numpy
+
+DEBUG = False
+
+# trade id, trade time (ms), price, quantity, side, padding to 40 bytes
+RECORD = struct.Struct("<qqddB7x")
+RECORD_DTYPE = [
+    ("trade_id", "<i8"),
+    ("trade_time", "<i8"),
+    ("price", "<f8"),
+    ("quantity", "<f8"),
+    ("side", "u1"),
+    ("_pad", "V7"),
+]  # numpy.frombuffer(view, dtype=RECORD_DTYPE) for vectorised reads
+_TIME = struct.Struct("<q")
+_TIME_OFFSET = 8
+INDEX_ENTRY = struct.Struct("<qq")  # trade time, record number
+INDEX_STRIDE = 1024  # one index entry every N records
+
+SIDE_BUY = 0  # aggressor bought (buyer was the taker)
+SIDE_SELL = 1  # aggressor sold (buyer was the maker)
+
+SEGMENT_SUFFIX = ".ticks"
+INDEX_SUFFIX = ".idx"
+
+
+class TickColumns(NamedTuple):
+    """A time range of one symbol column by column: numpy arrays, or typed arrays without numpy."""
+
+    prices: Sequence[float]
+    quantities: Sequence[float]
+    times: Sequence[int]
+    trade_ids: Sequence[int]
+
+
+def default_root() -> Path:
+    return data_dir() / "ticks"
+
+
+@dataclass(frozen=True)
+class RecorderSettings:
+    root: Path | None = None
+    max_segment_bytes: int = 64 * 1024 * 1024
+    max_segment_seconds: float = 3600.0
+    batch_size: int = 4096
+    flush_interval: float = 0.5
+
+
+class _Segment:
+    """Open segment being appended to, with its sparse time index."""
+
+    def __init__(self, directory: Path, first_time: int) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{first_time:013d}{SEGMENT_SUFFIX}"
+        self.data = open(self.path, "ab")
+        self.index = open(self.path.with_suffix(INDEX_SUFFIX), "ab")
+        self.records = self.data.tell() // RECORD.size
+        self.opened = time.monotonic()
+
+    def write(self, batch: list[TradeTick]) -> None:
+        payload = bytearray(RECORD.size * len(batch))
+        index = bytearray()
+        offset = 0
+        for tick in batch:
+            if self.records % INDEX_STRIDE == 0:
+                index += INDEX_ENTRY.pack(tick.trade_time, self.records)
+            side = SIDE_SELL if tick.buyer_is_maker else SIDE_BUY
+            RECORD.pack_into(payload, offset, tick.trade_id, tick.trade_time, tick.price, tick.quantity, side)
+            offset += RECORD.size
+            self.records += 1
+        self.data.write(payload)
+        if index:
+            self.index.write(index)
+
+    @property
+    def size(self) -> int:
+        return self.records * RECORD.size
+
+    def flush(self) -> None:
+        self.data.flush()
+        self.index.flush()
+
+    def close(self) -> None:
+        self.data.close()
+        self.index.close()
+
+
+class TickRecorder:
+    """Writes ticks to per-symbol append-only segment files on a background thread.
+
+    ``record`` only enqueues, so the stream thread never touches the disk. The
+    writer drains the queue in batches, packs fixed-width records and rotates
+    to a new segment once the current one exceeds the size or age limit. Each
+    segment has a sidecar ``.idx`` with the trade time of every
+    ``INDEX_STRIDE``-th record so readers can jump close to a timestamp.
+    """
+
+    def __init__(self, settings: RecorderSettings | None = None) -> None:
+        self._settings = settings or RecorderSettings()
+        self._root = self._settings.root or default_root()
+        self._queue: queue.SimpleQueue[tuple[str, TradeTick] | None] = queue.SimpleQueue()
+        self._segments: dict[str, _Segment] = {}
+        self._thread = threading.Thread(target=self._run, name="TickRecorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def record(self, symbol: str, tick: TradeTick) -> None:
+        self._queue.put((symbol, tick))
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        settings = self._settings
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            batches: dict[str, list[TradeTick]] = {}
+            try:
+                item = self._queue.get(timeout=settings.flush_interval)
+                count = 0
+                while item is not None:
+                    symbol, tick = item
+                    batches.setdefault(symbol, []).append(tick)
+                    count += 1
+                    if count >= settings.batch_size:
+                        break
+                    item = self._queue.get_nowait()
+                else:
+                    running = False
+            except queue.Empty:
+                pass
+
+            for symbol, batch in batches.items():
+                try:
+                    self._segment_for(symbol, batch[0].trade_time).write(batch)
+                except OSError as exc:
+                    self._log(f"Falha ao gravar ticks de {symbol}: {exc}")
+            now = time.monotonic()
+            if now - last_flush >= settings.flush_interval or not running:
+                for segment in self._segments.values():
+                    segment.flush()
+                last_flush = now
+
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+
+    def _segment_for(self, symbol: str, first_time: int) -> _Segment:
+        segment = self._segments.get(symbol)
+        if segment is not None and (
+            segment.size >= self._settings.max_segment_bytes
+            or time.monotonic() - segment.opened >= self._settings.max_segment_seconds
+        ):
+            segment.close()
+            segment = None
+        if segment is None:
+            segment = self._segments[symbol] = _Segment(self._root / symbol.upper(), first_time)
+            self._log(f"Novo segmento: {segment.path}")
+        return segment
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[TickRecorder] {message}", flush=True)
+
+
+class SegmentReader:
+    """Memory-mapped, read-only view of one segment file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        size = path.stat().st_size
+        self.count = size // RECORD.size
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), self.count * RECORD.size, access=mmap.ACCESS_READ) if self.count else None
+        self._view = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+        self._index_times: list[int] = []
+        self._index_records: list[int] = []
+        index_path = path.with_suffix(INDEX_SUFFIX)
+        if index_path.exists():
+            raw = index_path.read_bytes()
+            raw = raw[: len(raw) - len(raw) % INDEX_ENTRY.size]
+            for trade_time, record in INDEX_ENTRY.iter_unpack(raw):
+                if record < self.count:
+                    self._index_times.append(trade_time)
+                    self._index_records.append(record)
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a caller still holds a slice; the map is freed along with it
+        self._file.close()
+
+    def __enter__(self) -> "SegmentReader":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def time_at(self, record: int) -> int:
+        return _TIME.unpack_from(self._view, record * RECORD.size + _TIME_OFFSET)[0]
+
+    def between(self, start_time: int, end_time: int) -> memoryview:
+        """Zero-copy slice of the records with ``start_time <= trade_time <= end_time``."""
+        first = self._search(start_time, bisect_left)
+        stop = max(first, self._search(end_time, bisect_right))
+        return self._view[first * RECORD.size : stop * RECORD.size]
+
+    def _search(self, value: int, search: Callable[[list[int], int], int]) -> int:
+        """Position ``search`` (bisect_left/right) would return over all record times."""
+        # The sparse index narrows the range to one stride, records finish the job.
+        entry = search(self._index_times, value)
+        lo = self._index_records[entry - 1] if entry > 0 else 0
+        hi = self._index_records[entry] if entry < len(self._index_records) else self.count
+        right = search is bisect_right
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_time = self.time_at(mid)
+            if mid_time < value or (right and mid_time == value):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+
+class TickArchive:
+    """All recorded segments under ``root``, queried by symbol and time range."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root or default_root()
+
+    def symbols(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(entry.name for entry in self.root.iterdir() if entry.is_dir())
+
+    def segments(self, symbol: str) -> list[Path]:
+        directory = self.root / symbol.upper()
+        if not directory.exists():
+            return []
+        return sorted(directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def query(self, symbol: str, start_time: int = 0, end_time: int = 2**63 - 1) -> Iterator[memoryview]:
+        """Yield zero-copy record slices, oldest first, for the given time range.
+
+        Each slice is only valid until the iteration advances to the next segment.
+        """
+        paths = self.segments(symbol)
+        starts = [int(path.stem) for path in paths]
+        for position, path in enumerate(paths):
+            next_start = starts[position + 1] if position + 1 < len(paths) else None
+            if next_start is not None and next_start < start_time:
+                continue  # the whole segment ends before the range
+            if starts[position] > end_time:
+                break
+            with SegmentReader(path) as reader:
+                view = reader.between(start_time, end_time)
+                try:
+                    if len(view):
+                        yield view
+                finally:
+                    view.release()
+
+    def ticks(self, symbol: str, start_time: int = 0, end_time: int = 2**63 - 1) -> Iterator[TradeTick]:
+        upper = symbol.upper()
+        for view in self.query(symbol, start_time, end_time):
+            for trade_id, trade_time, price, quantity, side in RECORD.iter_unpack(view):
+                yield TradeTick(upper, price, quantity, trade_time, trade_id, side == SIDE_SELL)
+
+    def columns(self, symbol: str, start_time: int = 0, end_time: int = 2**63 - 1) -> TickColumns:
+        """Copy the range out of the segments column-wise, for vectorised consumers."""
+        np = load_numpy()
+        if np is not None:
+            # ``query`` slices die with their segment, so each one is copied before moving on.
+            views = self.query(symbol, start_time, end_time)
+            records = [np.frombuffer(view, dtype=RECORD_DTYPE).copy() for view in views]
+            merged = np.concatenate(records) if records else np.zeros(0, dtype=RECORD_DTYPE)
+            return TickColumns(merged["price"], merged["quantity"], merged["trade_time"], merged["trade_id"])
+        columns = TickColumns(array("d"), array("d"), array("q"), array("q"))
+        for view in self.query(symbol, start_time, end_time):
+            for trade_id, trade_time, price, quantity, _side in RECORD.iter_unpack(view):
+                columns.prices.append(price)  # type: ignore[attr-defined]
+                columns.quantities.append(quantity)  # type: ignore[attr-defined]
+                columns.times.append(trade_time)  # type: ignore[attr-defined]
+                columns.trade_ids.append(trade_id)  # type: ignore[attr-defined]
+        return columns
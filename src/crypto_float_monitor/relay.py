@@ -0,0 +1,692 @@
+"""Local fan-out relay: one exchange connection shared by every local consumer.
+
+With ``relay`` enabled, the first process to take the relay lock becomes the
+hub. It runs the configured engine against the exchange and republishes every
+trade over a Unix domain socket. Every consumer, including the hub's own
+process, reads from that socket through :class:`RelayStream`, so windows,
+headless runs and scripts (``iter_ticks(StreamSettings(relay=True))``) share a
+single upstream connection. When the hub's process exits, the kernel drops its
+lock, one of the remaining consumers takes it over, and the others reconnect.
+
+Frames are a kind (u8) and a payload length (u16) followed by the payload.
+Trades are fixed 35-byte records keyed by a symbol id that is announced once
+per subscriber. Subscribers send Binance-style ``SUBSCRIBE``/``UNSUBSCRIBE``
+JSON in ``CONTROL`` frames, and the hub streams the union of what they asked for.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+from .coalescing import PriceBar
+from .config import CONFIG_DIR_NAME
+from .decoders import TradeTick
+from .metrics import registry
+from .stream_core import StreamCore, StreamSettings, create_stream
+
+try:  # POSIX only, like the Unix socket itself.
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None  # type: ignore[assignment]
+
+DEBUG = False
+
+RELAY_VERSION = 1
+HELLO, SYMBOL, TICK, BAR, STATUS, CONTROL = 1, 2, 3, 4, 5, 6
+
+HEADER = struct.Struct("<BH")  # frame kind, payload length
+_HELLO = struct.Struct("<H")  # protocol version
+_SYMBOL = struct.Struct("<H")  # symbol id, followed by the UTF-8 name
+# symbol id, trade id, trade time (ms), price, quantity, buyer is maker
+_TICK = struct.Struct("<HqqddB")
+# symbol id, last trade id, trade time, open, high, low, last, volume, trade count, high reached last
+_BAR = struct.Struct("<HqqdddddIB")
+
+HIGH_WATER = 256 * 1024  # bytes queued for one subscriber before its trades are conflated
+LOW_WATER = 16 * 1024  # ...and the level it must drain to before trades flow again
+RETRY_DELAY = 0.05  # seconds between attempts while another process brings the hub up
+
+
+def relay_available() -> bool:
+    return fcntl is not None and hasattr(socket, "AF_UNIX")
+
+
+def relay_paths(settings: StreamSettings) -> tuple[Path, Path]:
+    """``(socket, lock)`` for ``settings.base_url``: one hub per user, upstream and stream kind."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        directory = Path(runtime) / CONFIG_DIR_NAME
+    else:
+        directory = Path(tempfile.gettempdir()) / f"{CONFIG_DIR_NAME}-{os.getuid()}"
+    # A replay server and the real exchange must not end up behind the same hub,
+    # nor a miniTicker consumer behind a hub streaming trades.
+    key = hashlib.sha1(f"{settings.base_url} {settings.stream_kind}".encode()).hexdigest()[:10]
+    return directory / f"relay-{key}.sock", directory / f"relay-{key}.lock"
+
+
+def frame(kind: int, payload: bytes) -> bytes:
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+def tick_frame(symbol_id: int, tick: TradeTick) -> bytes:
+    payload = _TICK.pack(symbol_id, tick.trade_id, tick.trade_time, tick.price, tick.quantity, tick.buyer_is_maker)
+    return frame(TICK, payload)
+
+
+def parse_control(payload: bytes | str) -> tuple[str, list[str]]:
+    """``(method, symbols)`` of a Binance-style (un)subscribe request."""
+    request = json.loads(payload)
+    symbols = [str(stream).split("@", 1)[0].upper() for stream in request["params"]]
+    return str(request["method"]), symbols
+
+
+class FrameReader:
+    """Splits a byte stream into ``(kind, payload)`` frames."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, bytes]]:
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+        size = len(buffer)
+        while size - offset >= HEADER.size:
+            kind, length = HEADER.unpack_from(buffer, offset)
+            end = offset + HEADER.size + length
+            if end > size:
+                break
+            frames.append((kind, bytes(buffer[offset + HEADER.size : end])))
+            offset = end
+        del buffer[:offset]
+        return frames
+
+
+class _Subscriber:
+    """One connected consumer: its socket, pairs and outgoing queue.
+
+    ``out`` is filled by the upstream thread and emptied by the hub thread,
+    both under ``lock``. Once more than ``HIGH_WATER`` bytes are waiting the
+    subscriber is too slow for every trade: further trades are folded into one
+    bar per symbol (``bars``), sent as ``BAR`` frames once the queue has drained
+    below ``LOW_WATER``. Memory per subscriber stays bounded and nobody else
+    waits for it.
+    """
+
+    __slots__ = ("sock", "lock", "out", "reader", "symbols", "known", "conflating", "bars")
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.out = bytearray(frame(HELLO, _HELLO.pack(RELAY_VERSION)))
+        self.reader = FrameReader()
+        self.symbols: frozenset[str] = frozenset()  # replaced, never mutated: read without the lock
+        self.known: set[int] = set()  # symbol ids already announced
+        self.conflating = False
+        self.bars: dict[int, tuple[PriceBar, int]] = {}  # symbol id -> (bar, last trade id)
+
+    def queue_tick(self, symbol_id: int, announce: bytes, encoded: bytes) -> None:
+        # Caller holds ``lock``.
+        if symbol_id not in self.known:
+            self.known.add(symbol_id)
+            self.out += announce
+        self.out += encoded
+
+    def conflate(self, symbol_id: int, symbol: str, tick: TradeTick) -> None:
+        # Caller holds ``lock``.
+        self.conflating = True
+        pending = self.bars.get(symbol_id)
+        if pending is None:
+            price, trade_time = tick.price, tick.trade_time
+            bar = PriceBar(
+                symbol, price, price, price, price, 1, tick.quantity, trade_time,
+                open_time=trade_time, high_time=trade_time, low_time=trade_time,
+            )
+        else:
+            bar = pending[0]
+            bar.add(tick.price, tick.quantity, tick.trade_time)
+        self.bars[symbol_id] = (bar, tick.trade_id)
+
+    def release_bars(self, announce: dict[int, bytes]) -> None:
+        # Caller holds ``lock``.
+        for symbol_id, (bar, last_id) in self.bars.items():
+            if symbol_id not in self.known:
+                self.known.add(symbol_id)
+                self.out += announce[symbol_id]
+            payload = _BAR.pack(
+                symbol_id, last_id, bar.trade_time, bar.open, bar.high, bar.low, bar.last,
+                bar.volume, bar.count, bar.high_is_latest,
+            )
+            self.out += frame(BAR, payload)
+        self.bars.clear()
+        self.conflating = False
+
+
+class RelayHub:
+    """Owns the upstream connection and serves it on the relay socket.
+
+    Built by :meth:`acquire`, which only succeeds for the process holding the
+    relay lock. The upstream engine is ``settings.engine`` with the hub's own
+    settings (base URL, redundancy, recording); consumers keep their own
+    history, candles and indicators, so the upstream core only keeps the latest trade.
+    A dedicated thread accepts subscribers and writes their queues without
+    blocking, so a stalled reader never holds up the upstream thread. The
+    consumer in the hub's own process is ``attach``-ed instead and receives
+    trades on the upstream thread, exactly like a direct connection.
+    """
+
+    def __init__(self, settings: StreamSettings, lock_fd: int, path: Path) -> None:
+        self._lock_fd = lock_fd
+        self._path = path
+        self._subscribers: tuple[_Subscriber, ...] = ()
+        self._symbol_ids: dict[str, int] = {}
+        self._announce: dict[int, bytes] = {}
+        self._latest: dict[str, TradeTick] = {}
+        self._local: RelayStream | None = None
+        self._local_symbols: frozenset[str] = frozenset()
+        self._status = ""
+        self._stopping = False
+        self._wake_pending = False
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self._selector = selectors.DefaultSelector()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._thread: threading.Thread | None = None
+        self._subscriber_gauge = None
+        self._conflated = None
+        metrics = registry()
+        if metrics is not None:
+            self._subscriber_gauge = metrics.gauge("cfm_relay_subscribers", "Consumers attached to the relay hub.")
+            self._conflated = metrics.counter(
+                "cfm_relay_conflated_total", "Trades folded into bars for slow relay subscribers."
+            )
+        upstream_settings = dataclasses.replace(
+            settings, relay=False, depth=False, watchlist=(), history_capacity=1, candle_intervals=(), indicators=()
+        )
+        self._upstream = create_stream(upstream_settings, on_tick=self.publish, on_status=self.publish_status)
+
+    @classmethod
+    def acquire(cls, settings: StreamSettings) -> RelayHub | None:
+        """Start the hub if no other process owns it; ``None`` when one does."""
+        path, lock_path = relay_paths(settings)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        hub = cls(settings, fd, path)
+        try:
+            hub.start()
+        except OSError:
+            hub.stop()
+            raise
+        return hub
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def start(self) -> None:
+        # Whatever is at the path belongs to a previous owner that is gone: we hold the lock.
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        self._listener.bind(str(self._path))
+        self._listener.listen(64)
+        self._listener.setblocking(False)
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, self._wake_read)
+        self._thread = threading.Thread(target=self._serve, name="RelayHub", daemon=True)
+        self._thread.start()
+        self._upstream.start()
+        self._log(f"Hub ativo em {self._path}")
+
+    def stop(self) -> None:
+        # Hand over before closing the upstream connection, whose close
+        # handshake can take seconds: subscribers see EOF and one of them
+        # takes the lock right away.
+        self._local = None
+        self._stopping = True
+        os.write(self._wake_write, b"\0")
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        for subscriber in self._subscribers:
+            subscriber.sock.close()
+        self._subscribers = ()
+        self._listener.close()
+        os.close(self._lock_fd)
+        self._upstream.stop()
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+        self._log("Hub parado.")
+
+    def attach(self, consumer: RelayStream) -> None:
+        """Feed ``consumer`` (in this process) straight from the upstream thread."""
+        self._local = consumer
+        self.control(consumer, "SUBSCRIBE", consumer.streamed_symbols())
+
+    def control(self, owner: object, method: str, symbols: Iterable[str]) -> set[str]:
+        """Apply a (un)subscription of ``owner``; returns the pairs it newly asked for."""
+        wanted = {symbol.upper() for symbol in symbols}
+        if owner is self._local:
+            current = self._local_symbols
+        elif isinstance(owner, _Subscriber):
+            current = owner.symbols
+        else:
+            return set()
+        if method == "SUBSCRIBE":
+            added = wanted - current
+            updated = current | added
+        elif method == "UNSUBSCRIBE":
+            added = set()
+            updated = current - wanted
+        else:
+            return set()
+        if owner is self._local:
+            self._local_symbols = updated
+        else:
+            owner.symbols = updated  # type: ignore[union-attr]
+        self._upstream.retain(owner, sorted(updated))
+        self._forget_unstreamed()
+        return added
+
+    def publish(self, symbol: str, tick: TradeTick) -> None:
+        """Upstream thread: hand ``tick`` to the local consumer and queue it for every subscriber of ``symbol``."""
+        self._latest[symbol] = tick
+        local = self._local
+        if local is not None and symbol in self._local_symbols:
+            local._deliver(symbol, tick)
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._register(symbol)
+        announce = self._announce[symbol_id]
+        encoded = tick_frame(symbol_id, tick)
+        queued = False
+        for subscriber in self._subscribers:
+            if symbol not in subscriber.symbols:
+                continue
+            queued = True
+            with subscriber.lock:
+                if subscriber.conflating or len(subscriber.out) > HIGH_WATER:
+                    subscriber.conflate(symbol_id, symbol, tick)
+                    if self._conflated is not None:
+                        self._conflated.inc()
+                else:
+                    subscriber.queue_tick(symbol_id, announce, encoded)
+        if queued:
+            self._wake()
+
+    def publish_status(self, status: str) -> None:
+        self._status = status
+        local = self._local
+        if local is not None:
+            local._report_status(status)
+        payload = frame(STATUS, status.encode())
+        subscribers = self._subscribers
+        for subscriber in subscribers:
+            with subscriber.lock:
+                subscriber.out += payload
+        if subscribers:
+            self._wake()
+
+    # ------------------------------------------------------------------
+    # Hub thread
+    # ------------------------------------------------------------------
+    def _serve(self) -> None:
+        while not self._stopping:
+            for key, events in self._selector.select():
+                if key.fileobj is self._listener:
+                    self._accept()
+                elif key.data == self._wake_read:
+                    self._drain_wakeups()
+                else:
+                    subscriber: _Subscriber = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(subscriber)
+                    if events & selectors.EVENT_WRITE and subscriber in self._subscribers:
+                        self._flush(subscriber)
+
+    def _accept(self) -> None:
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        subscriber = _Subscriber(sock)
+        if self._status:
+            subscriber.out += frame(STATUS, self._status.encode())
+        self._subscribers = (*self._subscribers, subscriber)
+        self._selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, subscriber)
+        self._count_subscribers()
+        self._log(f"Assinante conectado ({len(self._subscribers)} no total)")
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        # Cleared after emptying the pipe (a byte written in between would be
+        # swallowed) and before flushing, so anything published from here on
+        # either goes out below or wakes us again.
+        self._wake_pending = False
+        for subscriber in self._subscribers:
+            self._flush(subscriber)
+
+    def _read(self, subscriber: _Subscriber) -> None:
+        try:
+            data = subscriber.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(subscriber)
+            return
+        for kind, payload in subscriber.reader.feed(data):
+            if kind == CONTROL:
+                self._control(subscriber, payload)
+
+    def _control(self, subscriber: _Subscriber, payload: bytes) -> None:
+        try:
+            method, symbols = parse_control(payload)
+        except (ValueError, KeyError, TypeError):
+            return
+        # Not under ``subscriber.lock``: an unsubscribe takes the upstream core's
+        # tick lock, which the upstream thread holds while it publishes (and
+        # waits for this lock).
+        added = self.control(subscriber, method, symbols)
+        with subscriber.lock:
+            # Late joiners get the last known trade right away instead of waiting for the next one.
+            for symbol in added:
+                tick = self._latest.get(symbol)
+                if tick is not None:
+                    symbol_id = self._symbol_ids[symbol]
+                    subscriber.queue_tick(symbol_id, self._announce[symbol_id], tick_frame(symbol_id, tick))
+        self._flush(subscriber)
+
+    def _flush(self, subscriber: _Subscriber) -> None:
+        with subscriber.lock:
+            if subscriber.conflating and len(subscriber.out) < LOW_WATER:
+                subscriber.release_bars(self._announce)
+            out = subscriber.out
+            sent = 0
+            if out:
+                try:
+                    sent = subscriber.sock.send(out)
+                except BlockingIOError:
+                    pass
+                except OSError:
+                    sent = -1
+                else:
+                    del out[:sent]
+            waiting = bool(out) or subscriber.conflating
+        if sent < 0:
+            self._drop(subscriber)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if waiting else 0)
+        if self._selector.get_key(subscriber.sock).events != events:
+            self._selector.modify(subscriber.sock, events, subscriber)
+
+    def _drop(self, subscriber: _Subscriber) -> None:
+        if subscriber not in self._subscribers:
+            return
+        self._subscribers = tuple(item for item in self._subscribers if item is not subscriber)
+        self._selector.unregister(subscriber.sock)
+        subscriber.sock.close()
+        self._upstream.release(subscriber)
+        self._forget_unstreamed()
+        self._count_subscribers()
+        self._log(f"Assinante desconectado ({len(self._subscribers)} restantes)")
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _forget_unstreamed(self) -> None:
+        # A trade of a pair nobody streams any more is stale, not "the latest".
+        streamed = set(self._upstream.streamed_symbols())
+        for symbol in [symbol for symbol in self._latest if symbol not in streamed]:
+            self._latest.pop(symbol, None)
+
+    def _register(self, symbol: str) -> int:
+        symbol_id = len(self._symbol_ids)
+        self._announce[symbol_id] = frame(SYMBOL, _SYMBOL.pack(symbol_id) + symbol.encode())
+        self._symbol_ids[symbol] = symbol_id
+        return symbol_id
+
+    def _wake(self) -> None:
+        if self._wake_pending or self._stopping:
+            return
+        self._wake_pending = True
+        try:
+            os.write(self._wake_write, b"\0")
+        except OSError:
+            pass
+
+    def _count_subscribers(self) -> None:
+        if self._subscriber_gauge is not None:
+            self._subscriber_gauge.set(len(self._subscribers))
+
+    @staticmethod
+    def _log(message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[RelayHub] {message}", flush=True)
+
+
+class RelayStream(StreamCore):
+    """Reads trades from the local relay hub, becoming the hub when there is none.
+
+    History, candles, indicators, coalescing and gap detection run in this process exactly
+    as for a direct connection; only the transport differs. Recording and
+    redundant connections are the hub's business, so they are off here.
+    Trades a slow consumer missed arrive folded into bars: the coalescer,
+    candles and indicators still see both extremes, while history keeps the bar's last trade.
+    """
+
+    def __init__(self, settings: StreamSettings | None = None, **callbacks: Any) -> None:
+        self._hub_settings = settings or StreamSettings()
+        super().__init__(dataclasses.replace(self._hub_settings, record_ticks=False, redundant=False), **callbacks)
+        self._socket_path, _ = relay_paths(self._hub_settings)
+        self._hub: RelayHub | None = None
+        self._sock: socket.socket | None = None
+        self._send_lock = threading.Lock()
+        self._names: dict[int, str] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_hub(self) -> bool:
+        """Whether this process currently owns the upstream connection."""
+        return self._hub is not None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="RelayStream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        hub, self._hub = self._hub, None
+        if hub is not None:
+            hub.stop()
+        self._log("Streamer parado.")
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _deliver(self, symbol: str, tick: TradeTick) -> None:
+        # Upstream thread of the hub in this process.
+        self._handle_tick(tick if tick.symbol else tick._replace(symbol=symbol))
+
+    def _send_text(self, text: str) -> bool:
+        hub = self._hub
+        if hub is not None:
+            method, symbols = parse_control(text)
+            hub.control(self, method, symbols)
+            return True
+        sock = self._sock
+        if sock is None:
+            return False
+        with self._send_lock:
+            sock.sendall(frame(CONTROL, text.encode()))
+        return True
+
+    def _connect(self) -> socket.socket | None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self._socket_path))
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+    def _run(self) -> None:
+        lane = self._lanes[0]
+        self._report_status("Connecting…")
+        while not self._stop_event.is_set():
+            sock = self._connect()
+            if sock is None:
+                # No hub listening: its owner is gone (or was never there). Take
+                # over unless another consumer got the lock first.
+                try:
+                    hub = RelayHub.acquire(self._hub_settings)
+                except OSError as exc:
+                    self._report_status(f"Erro: {exc}")
+                    self._stop_event.wait(self._lane_backoff(lane))
+                    continue
+                if hub is None:
+                    self._stop_event.wait(RETRY_DELAY)
+                    continue
+                self._log(f"Assumindo o hub em {self._socket_path}")
+                self._hub = hub
+                self._lane_opened(lane)
+                hub.attach(self)
+                # Trades now arrive through ``_deliver``; ``stop`` shuts the hub down.
+                self._stop_event.wait()
+                break
+            self._sock = sock
+            self._names.clear()
+            self._lane_opened(lane)
+            try:
+                self._send_control("SUBSCRIBE", list(self.streamed_symbols()))
+                self._receive(sock)
+            except OSError as exc:
+                self._log(f"Conexão com o hub perdida: {exc}")
+            finally:
+                self._sock = None
+                sock.close()
+                self._lane_closed(lane)
+            if not self._stop_event.is_set():
+                self._report_status("Reconectando…")
+
+    def _receive(self, sock: socket.socket) -> None:
+        reader = FrameReader()
+        names = self._names
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return
+            for kind, payload in reader.feed(data):
+                if kind == TICK:
+                    symbol_id, trade_id, trade_time, price, quantity, maker = _TICK.unpack(payload)
+                    symbol = names[symbol_id]
+                    self._handle_tick(TradeTick(symbol, price, quantity, trade_time, trade_id, bool(maker)))
+                elif kind == BAR:
+                    self._handle_bar(*_BAR.unpack(payload))
+                elif kind == SYMBOL:
+                    names[_SYMBOL.unpack_from(payload)[0]] = payload[_SYMBOL.size :].decode()
+                elif kind == STATUS:
+                    self._report_status(payload.decode())
+                elif kind == HELLO and _HELLO.unpack(payload)[0] != RELAY_VERSION:
+                    self._report_status("Relay com versão incompatível")
+                    self._stop_event.wait(self._settings.reconnect_max_delay)
+                    return
+
+    def _handle_bar(
+        self,
+        symbol_id: int,
+        last_id: int,
+        trade_time: int,
+        open_: float,
+        high: float,
+        low: float,
+        last: float,
+        volume: float,
+        count: int,
+        high_is_latest: int,
+    ) -> None:
+        symbol = self._names[symbol_id]
+        # BAR frames carry only the last trade's time; the extremes are dated with it.
+        path = PriceBar(symbol, open_, high, low, last, count, volume, trade_time, bool(high_is_latest)).path()
+        with self._tick_lock:
+            # The trades between the previous id and ``last_id`` were folded on purpose, not lost.
+            if last_id <= self._last_trade_ids.get(symbol, -1):
+                return
+            self._last_trade_ids[symbol] = last_id
+            self.history.get(symbol).append(last, volume, trade_time, last_id)
+            for position, price in enumerate(path):
+                quantity = volume if position == len(path) - 1 else 0.0
+                for interval, candle in self.candles.update(symbol, price, quantity, trade_time):
+                    if self.on_candle is not None:
+                        self.on_candle(symbol, interval, candle)
+                if self.indicators is not None:
+                    self._update_indicators(symbol, price, quantity, trade_time, last_id)
+            if self.on_tick is not None:
+                self.on_tick(symbol, TradeTick(symbol, last, volume, trade_time, last_id, False))
+        wake = False
+        for position, price in enumerate(path):
+            wake |= self._coalescer.push(symbol, price, volume if position == len(path) - 1 else 0.0, trade_time)
+        if wake and self.on_update is not None:
+            self.on_update()
+
+
+def run_daemon(settings: StreamSettings) -> int:
+    """Run only the hub, waiting for the current owner to exit if there is one."""
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    hub = None
+    while hub is None and not stop.is_set():
+        hub = RelayHub.acquire(settings)
+        if hub is None:
+            stop.wait(1.0)
+    if hub is None:
+        return 0
+    print(f"[relay] Servindo {settings.base_url} em {hub.path}", file=sys.stderr, flush=True)
+    try:
+        stop.wait()
+    finally:
+        hub.stop()
+    return 0
@@ -0,0 +1,528 @@
+"""Local stand-in for the Binance WebSocket API that replays ``@trade`` frames.
+
+Point ``StreamSettings.base_url`` at ``ws://127.0.0.1:<port>/ws`` to stream from
+it. Both raw (``/ws/<symbol>@trade``) and combined (``/stream?streams=...``)
+endpoints are served, SUBSCRIBE/UNSUBSCRIBE frames are acknowledged, trade ids
+are consecutive per symbol and shared by every connection, and each
+sent frame carries the current wall clock in ``E``/``T`` so consumers can
+measure end-to-end latency.
+
+The same tape is also served as ``@aggTrade`` (consecutive fills of one taker
+order at one price merged into one event), ``@bookTicker`` (a best bid and
+ask around every trade) and ``@miniTicker`` (one 24h summary per second).
+``--compression`` lets clients negotiate permessage-deflate.
+
+``<symbol>@depth@100ms`` streams carry diffs of a synthetic book that follows
+the traded price, and ``GET /api/v3/depth?symbol=...&limit=...`` on the same
+port returns a matching snapshot, so ``depth_snapshot`` can point at
+``http://127.0.0.1:<port>``. ``--depth-gap-every N`` withholds every Nth diff
+to exercise resyncs.
+
+Usage: ``python -m crypto_float_monitor.replay_server --rate 1000``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+try:  # Optional dependency (pip install crypto-float-monitor[async]).
+    from websockets.asyncio.server import ServerConnection, serve
+    from websockets.exceptions import ConnectionClosed
+    from websockets.http11 import Request, Response
+except ImportError:  # pragma: no cover - depends on the environment
+    ServerConnection = None  # type: ignore[assignment,misc]
+    serve = None  # type: ignore[assignment]
+    ConnectionClosed = Exception  # type: ignore[assignment,misc]
+    Request = Response = None  # type: ignore[assignment,misc]
+
+SEND_TICK = 0.002  # seconds between send batches
+DEPTH_INTERVAL = 0.1  # seconds between depth diffs, as in ``@depth@100ms``
+TICKER_INTERVAL = 1.0  # seconds between ``@miniTicker`` events
+TAKER_CONTINUATION = 0.5  # chance that a synthetic trade is another fill of the previous taker order
+AGGREGATE_WINDOW = 0.05  # seconds an ``@aggTrade`` event keeps collecting fills of its taker order
+STREAM_KINDS = ("trade", "aggTrade", "bookTicker", "miniTicker", "depth")
+
+
+@dataclass(frozen=True)
+class ReplayPattern:
+    """Target send rate, optionally raised to ``burst_rate`` for periodic bursts."""
+
+    rate: float = 100.0
+    burst_rate: float = 0.0
+    burst_every: float = 0.0
+    burst_length: float = 0.0
+    duration: float = 0.0
+
+    def rate_at(self, elapsed: float) -> float:
+        if self.burst_rate > 0 and self.burst_every > 0:
+            if elapsed % self.burst_every < self.burst_length:
+                return self.burst_rate
+        return self.rate
+
+
+class TradeSource:
+    """Cycles through recorded payloads, or synthesises a random walk."""
+
+    def __init__(self, frames: Path | None = None, start_price: float = 67000.0) -> None:
+        self._payloads: list[dict[str, object]] = []
+        if frames is not None:
+            for line in frames.read_text(encoding="utf-8").splitlines():
+                if not line:
+                    continue
+                payload = json.loads(line)
+                self._payloads.append(payload.get("data", payload))
+        self._index = 0
+        self._price = start_price
+        self._orders: dict[str, tuple[float, bool]] = {}  # each symbol's current taker order: price, side
+        self._random = random.Random(7)
+
+    @property
+    def price(self) -> float:
+        """Latest synthetic price (the starting price when replaying recorded frames)."""
+        return self._price
+
+    def next_payload(self, symbol: str, trade_id: int) -> dict[str, object]:
+        now = int(time.time() * 1000)
+        if self._payloads:
+            payload = dict(self._payloads[self._index])
+            self._index = (self._index + 1) % len(self._payloads)
+        else:
+            # A taker order often fills several resting orders at the same price.
+            order = self._orders.get(symbol)
+            if order is None or self._random.random() >= TAKER_CONTINUATION:
+                self._price = max(0.01, self._price + self._random.gauss(0, 4.5))
+                order = self._orders[symbol] = (self._price, self._random.random() < 0.5)
+            payload = {
+                "e": "trade",
+                "p": f"{order[0]:.2f}000000",
+                "q": f"{self._random.expovariate(40):.8f}",
+                "m": order[1],
+                "M": True,
+            }
+        # Keys are re-inserted in Binance's order so the fast decoder path applies.
+        return {
+            "e": "trade",
+            "E": now,
+            "s": symbol,
+            "t": trade_id,
+            "p": payload["p"],
+            "q": payload["q"],
+            "T": now,
+            "m": payload.get("m", False),
+            "M": payload.get("M", True),
+        }
+
+
+class SyntheticBook:
+    """Order book around the traded price, kept in ticks so diffs and snapshots agree.
+
+    Bids sit below ``center`` and asks at or above it. Each ``step`` moves the
+    center to the latest trade, clears crossed levels, refills the touch and
+    changes a few quantities near it; every changed level consumes one update
+    id, as on the exchange.
+    """
+
+    def __init__(self, price: float, tick: float = 0.01, touch_levels: int = 20, max_levels: int = 2000) -> None:
+        self._tick = tick
+        self._touch_levels = touch_levels
+        self._max_levels = max_levels
+        self._random = random.Random(13)
+        self._center = round(price / tick)
+        self._bids: dict[int, float] = {}
+        self._asks: dict[int, float] = {}
+        self.update_id = 1_000_000
+        for offset in range(1, max_levels // 2 + 1):
+            self._bids[self._center - offset] = self._quantity()
+            self._asks[self._center + offset - 1] = self._quantity()
+
+    def step(self, price: float) -> tuple[int, list[list[str]], list[list[str]]] | None:
+        """Move to ``price``; returns ``(first update id, bid changes, ask changes)`` or ``None``."""
+        center = self._center = round(price / self._tick)
+        bids: dict[int, float] = {}
+        asks: dict[int, float] = {}
+        for level in [level for level in self._bids if level >= center]:
+            del self._bids[level]
+            bids[level] = 0.0
+        for level in [level for level in self._asks if level < center]:
+            del self._asks[level]
+            asks[level] = 0.0
+        for offset in range(1, self._touch_levels + 1):
+            if center - offset not in self._bids:
+                self._bids[center - offset] = bids[center - offset] = self._quantity()
+            if center + offset - 1 not in self._asks:
+                self._asks[center + offset - 1] = asks[center + offset - 1] = self._quantity()
+        for _ in range(self._random.randint(2, 12)):
+            side, changes = (self._bids, bids) if self._random.random() < 0.5 else (self._asks, asks)
+            offset = int(self._random.expovariate(0.1))
+            level = center - 1 - offset if side is self._bids else center + offset
+            quantity = 0.0 if self._random.random() < 0.2 else self._quantity()
+            if quantity:
+                side[level] = quantity
+            else:
+                side.pop(level, None)
+            changes[level] = quantity
+        for side, changes, far in ((self._bids, bids, min), (self._asks, asks, max)):
+            while len(side) > self._max_levels:
+                level = far(side)
+                del side[level]
+                changes[level] = 0.0
+        if not bids and not asks:
+            return None
+        first = self.update_id + 1
+        self.update_id += len(bids) + len(asks)
+        return first, self._levels(bids, reverse=True), self._levels(asks, reverse=False)
+
+    def snapshot(self, limit: int) -> dict[str, object]:
+        return {
+            "lastUpdateId": self.update_id,
+            "bids": self._levels(self._bids, reverse=True)[:limit],
+            "asks": self._levels(self._asks, reverse=False)[:limit],
+        }
+
+    def _quantity(self) -> float:
+        return round(self._random.expovariate(2.0) + 0.001, 5)
+
+    def _levels(self, levels: dict[int, float], reverse: bool) -> list[list[str]]:
+        return [
+            [f"{level * self._tick:.8f}", f"{levels[level]:.8f}"]
+            for level in sorted(levels, reverse=reverse)
+        ]
+
+
+class _Client:
+    __slots__ = ("streams", "combined")
+
+    def __init__(self, combined: bool) -> None:
+        self.streams: dict[str, list[str]] = {kind: [] for kind in STREAM_KINDS}
+        self.combined = combined
+
+
+def _parse_stream(stream: str) -> tuple[str, str]:
+    """``btcusdt@depth@100ms`` -> ``("BTCUSDT", "depth")``; unknown kinds are served as trades."""
+    symbol, _, kind = stream.partition("@")
+    if kind.startswith("depth"):
+        return symbol.upper(), "depth"
+    return symbol.upper(), kind if kind in STREAM_KINDS else "trade"
+
+
+def _stream_name(symbol: str, kind: str) -> str:
+    return f"{symbol.lower()}@{'depth@100ms' if kind == 'depth' else kind}"
+
+
+class ReplayServer:
+    """One trade tape per symbol, fanned out to every connection subscribed to it.
+
+    Like the exchange, each symbol has a single sequence of trade ids shared by
+    all clients, so two connections to the same stream see the same trades.
+    The pump starts with the first client and follows ``pattern``; symbols keep
+    trading once requested, so a client that reconnects sees a gap in the ids.
+    """
+
+    def __init__(self, source: TradeSource, pattern: ReplayPattern, depth_gap_every: int = 0) -> None:
+        self._source = source
+        self._pattern = pattern
+        self._depth_gap_every = depth_gap_every
+        self._clients: dict[ServerConnection, _Client] = {}
+        self._trade_ids: dict[str, int] = {}  # every symbol ever requested keeps trading
+        self._last_prices: dict[str, float] = {}
+        self._books: dict[str, SyntheticBook] = {}
+        # aggTrade still collecting fills, per symbol, with the loop time it started
+        self._aggregates: dict[str, tuple[float, dict[str, object]]] = {}
+        self._aggregate_ids: dict[str, int] = {}
+        self._book_ticker_ids: dict[str, int] = {}
+        self._tickers: dict[str, list[float]] = {}  # open, high, low, close, volume, quote volume
+        self._pump_task: asyncio.Task[None] | None = None
+        self._depth_task: asyncio.Task[None] | None = None
+        self._ticker_task: asyncio.Task[None] | None = None
+        self._random = random.Random(17)
+        self.sent = 0
+        self.finished = asyncio.Event()
+
+    async def handle(self, connection: ServerConnection) -> None:
+        request = connection.request
+        path = request.path if request is not None else "/"
+        url = urlsplit(path)
+        combined = url.path.rstrip("/").endswith("/stream")
+        if combined:
+            streams = parse_qs(url.query).get("streams", [""])[0].split("/")
+        else:
+            streams = [url.path.rsplit("/", 1)[-1]]
+        client = self._clients[connection] = _Client(combined)
+        self._subscribe(client, streams)
+        if self._pump_task is None:
+            self._pump_task = asyncio.ensure_future(self._pump())
+        try:
+            await self._read_control(connection, client)
+        except ConnectionClosed:
+            pass
+        finally:
+            self._clients.pop(connection, None)
+
+    def process_request(self, connection: ServerConnection, request: Request) -> Response | None:
+        """Answer ``/api/v3/depth`` snapshot requests; everything else is a WebSocket upgrade."""
+        url = urlsplit(request.path)
+        if url.path != "/api/v3/depth":
+            return None
+        query = parse_qs(url.query)
+        symbol = query.get("symbol", [""])[0].upper()
+        if not symbol:
+            return connection.respond(HTTPStatus.BAD_REQUEST, "symbol is required\n")
+        limit = int(query.get("limit", ["100"])[0])
+        return connection.respond(HTTPStatus.OK, json.dumps(self._book(symbol).snapshot(limit)))
+
+    def _subscribe(self, client: _Client, streams: list[str]) -> None:
+        for stream in streams:
+            if not stream:
+                continue
+            symbol, kind = _parse_stream(stream)
+            symbols = client.streams[kind]
+            if symbol not in symbols:
+                symbols.append(symbol)
+            self._trade_ids.setdefault(symbol, 0)
+            if kind == "depth":
+                self._book(symbol)
+                if self._depth_task is None:
+                    self._depth_task = asyncio.ensure_future(self._pump_depth())
+            elif kind == "miniTicker" and self._ticker_task is None:
+                self._ticker_task = asyncio.ensure_future(self._pump_tickers())
+
+    async def _read_control(self, connection: ServerConnection, client: _Client) -> None:
+        async for message in connection:
+            try:
+                request = json.loads(message)
+                method = request["method"]
+                params = [str(param) for param in request["params"]]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if method == "SUBSCRIBE":
+                self._subscribe(client, params)
+            elif method == "UNSUBSCRIBE":
+                for symbol, kind in map(_parse_stream, params):
+                    symbols = client.streams[kind]
+                    if symbol in symbols:
+                        symbols.remove(symbol)
+            await connection.send(json.dumps({"result": None, "id": request.get("id")}))
+
+    def _book(self, symbol: str) -> SyntheticBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = SyntheticBook(self._last_prices.get(symbol, self._source.price))
+        return book
+
+    async def _pump(self) -> None:
+        loop = asyncio.get_running_loop()
+        started = last = loop.time()
+        budget = 0.0
+        sequence = 0
+        while True:
+            await asyncio.sleep(SEND_TICK)
+            now = loop.time()
+            elapsed = now - started
+            if self._pattern.duration and elapsed >= self._pattern.duration:
+                self.finished.set()
+                return
+            budget += self._pattern.rate_at(elapsed) * (now - last)
+            last = now
+            # Like the exchange, the tape keeps moving while nobody listens.
+            while budget >= 1 and self._trade_ids:
+                budget -= 1
+                sequence += 1
+                symbols = list(self._trade_ids)
+                symbol = symbols[sequence % len(symbols)]
+                trade_id = self._trade_ids[symbol] = self._trade_ids[symbol] + 1
+                payload = self._source.next_payload(symbol, trade_id)
+                self._last_prices[symbol] = float(payload["p"])  # type: ignore[arg-type]
+                await self._broadcast(symbol, payload)
+                await self._derive(symbol, payload)
+                self.sent += 1
+            for symbol, (opened, aggregate) in list(self._aggregates.items()):
+                if now - opened >= AGGREGATE_WINDOW:
+                    del self._aggregates[symbol]
+                    await self._broadcast(symbol, aggregate, "aggTrade")
+
+    async def _derive(self, symbol: str, trade: dict[str, object]) -> None:
+        """Feed one trade to the ``aggTrade``, ``bookTicker`` and ``miniTicker`` views of the tape."""
+        price = float(trade["p"])  # type: ignore[arg-type]
+        quantity = float(trade["q"])  # type: ignore[arg-type]
+        if self._subscribed(symbol, "aggTrade"):
+            opened, pending = self._aggregates.get(symbol, (0.0, None))
+            if pending is not None and pending["p"] == trade["p"] and pending["m"] == trade["m"]:
+                pending["q"] = f"{float(pending['q']) + quantity:.8f}"  # type: ignore[arg-type]
+                pending["l"] = trade["t"]
+                pending["T"] = trade["T"]
+            else:
+                if pending is not None:
+                    await self._broadcast(symbol, pending, "aggTrade")
+                aggregate_id = self._aggregate_ids[symbol] = self._aggregate_ids.get(symbol, 0) + 1
+                aggregate: dict[str, object] = {
+                    "e": "aggTrade",
+                    "E": trade["E"],
+                    "s": symbol,
+                    "a": aggregate_id,
+                    "p": trade["p"],
+                    "q": trade["q"],
+                    "f": trade["t"],
+                    "l": trade["t"],
+                    "T": trade["T"],
+                    "m": trade["m"],
+                    "M": True,
+                }
+                self._aggregates[symbol] = (asyncio.get_running_loop().time(), aggregate)
+        if self._subscribed(symbol, "bookTicker"):
+            # The trade took the touch on its side: a seller hit the bid, a buyer lifted the ask.
+            bid, ask = (price, price + 0.01) if trade["m"] else (price - 0.01, price)
+            update_id = self._book_ticker_ids[symbol] = self._book_ticker_ids.get(symbol, 0) + 1
+            payload = {
+                "u": update_id,
+                "s": symbol,
+                "b": f"{bid:.8f}",
+                "B": f"{self._random.expovariate(2.0) + 0.001:.8f}",
+                "a": f"{ask:.8f}",
+                "A": f"{self._random.expovariate(2.0) + 0.001:.8f}",
+            }
+            await self._broadcast(symbol, payload, "bookTicker")
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            self._tickers[symbol] = [price, price, price, price, quantity, price * quantity]
+        else:
+            ticker[1] = max(ticker[1], price)
+            ticker[2] = min(ticker[2], price)
+            ticker[3] = price
+            ticker[4] += quantity
+            ticker[5] += price * quantity
+
+    def _subscribed(self, symbol: str, kind: str) -> bool:
+        return any(symbol in client.streams[kind] for client in self._clients.values())
+
+    async def _pump_depth(self) -> None:
+        sequence = 0
+        while True:
+            await asyncio.sleep(DEPTH_INTERVAL)
+            for symbol, book in list(self._books.items()):
+                price = self._last_prices.get(symbol)
+                diff = book.step(price) if price is not None else None
+                if diff is None:
+                    continue
+                sequence += 1
+                if self._depth_gap_every and sequence % self._depth_gap_every == 0:
+                    continue  # withheld: subscribers see the ids skip and resync
+                first, bids, asks = diff
+                payload = {
+                    "e": "depthUpdate",
+                    "E": int(time.time() * 1000),
+                    "s": symbol,
+                    "U": first,
+                    "u": book.update_id,
+                    "b": bids,
+                    "a": asks,
+                }
+                await self._broadcast(symbol, payload, "depth")
+
+    async def _pump_tickers(self) -> None:
+        while True:
+            await asyncio.sleep(TICKER_INTERVAL)
+            now = int(time.time() * 1000)
+            for symbol, (open_, high, low, close, volume, quote) in list(self._tickers.items()):
+                payload = {
+                    "e": "24hrMiniTicker",
+                    "E": now,
+                    "s": symbol,
+                    "c": f"{close:.8f}",
+                    "o": f"{open_:.8f}",
+                    "h": f"{high:.8f}",
+                    "l": f"{low:.8f}",
+                    "v": f"{volume:.8f}",
+                    "q": f"{quote:.8f}",
+                }
+                await self._broadcast(symbol, payload, "miniTicker")
+
+    async def _broadcast(self, symbol: str, payload: dict[str, object], kind: str = "trade") -> None:
+        raw = combined_frame = None
+        stream = _stream_name(symbol, kind)
+        for connection, client in list(self._clients.items()):
+            if symbol not in client.streams[kind]:
+                continue
+            if client.combined:
+                if combined_frame is None:
+                    combined_frame = json.dumps({"stream": stream, "data": payload}, separators=(",", ":"))
+                frame = combined_frame
+            else:
+                if raw is None:
+                    raw = json.dumps(payload, separators=(",", ":"))
+                frame = raw
+            try:
+                await connection.send(frame)
+            except ConnectionClosed:
+                self._clients.pop(connection, None)
+
+
+async def run_server(
+    host: str,
+    port: int,
+    source: TradeSource,
+    pattern: ReplayPattern,
+    depth_gap_every: int = 0,
+    compression: bool = False,
+) -> int:
+    """Serve until interrupted (or a client has been fed for ``pattern.duration``).
+
+    Returns the number of trade frames sent.
+    """
+    if serve is None:
+        raise RuntimeError("The replay server requires the 'websockets' package.")
+    server = ReplayServer(source, pattern, depth_gap_every)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, server.finished.set)
+    async with serve(
+        server.handle,
+        host,
+        port,
+        compression="deflate" if compression else None,
+        process_request=server.process_request,
+    ):
+        print(f"ready ws://{host}:{port}/ws", flush=True)
+        await server.finished.wait()
+    print(f"sent={server.sent}", flush=True)
+    return server.sent
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay Binance @trade frames locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--frames", type=Path, help="NDJSON file with recorded trade frames")
+    parser.add_argument("--rate", type=float, default=100.0, help="messages per second")
+    parser.add_argument("--burst-rate", type=float, default=0.0, help="messages per second during bursts")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="seconds between burst starts")
+    parser.add_argument("--burst-length", type=float, default=0.0, help="seconds each burst lasts")
+    parser.add_argument("--duration", type=float, default=0.0, help="stop sending after N seconds")
+    parser.add_argument("--depth-gap-every", type=int, default=0, help="withhold every Nth depth diff")
+    parser.add_argument("--compression", action="store_true", help="accept permessage-deflate")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    pattern = ReplayPattern(
+        rate=args.rate,
+        burst_rate=args.burst_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        duration=args.duration,
+    )
+    source = TradeSource(args.frames)
+    asyncio.run(run_server(args.host, args.port, source, pattern, args.depth_gap_every, args.compression))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Always-on price sparkline painted incrementally into a cached pixmap."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Optional
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from .tick_history import TickHistory
+
+_NAN = float("nan")
+_RESCALE_SHRINK = 0.6  # full redraw once the data uses less than this share of the scale
+
+
+class SparklineWidget(QtWidgets.QWidget):
+    """Min/max strip of the last ``span_seconds`` of trades.
+
+    Each pixel column is a time bucket of ``span / width``; only ticks that
+    arrived since the previous ``refresh`` are folded into the buckets. When
+    time moves into new buckets the cached pixmap is scrolled left and only the
+    newest columns are drawn, so a frame costs O(new ticks + new columns)
+    instead of a full repaint of the series. The whole strip is redrawn only
+    when it is resized or the price leaves (or shrinks well inside) the scale.
+    """
+
+    def __init__(
+        self,
+        history: TickHistory,
+        span_seconds: float = 300.0,
+        parent: Optional[QtWidgets.QWidget] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._history = history
+        self._span_ms = max(1.0, span_seconds * 1000)
+        self._seen = 0
+        self._columns = 0
+        self._column_ms = 1.0
+        self._head = -1  # absolute bucket index of the newest column
+        self._mins = array("d")
+        self._maxs = array("d")
+        self._low = math.inf
+        self._high = -math.inf
+        self._pixmap: QtGui.QPixmap | None = None
+        self._pen = QtGui.QPen(QtGui.QColor("#4ea8de"))
+        self._pen.setWidth(1)
+        self.setFixedHeight(36)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_OpaquePaintEvent, False)
+
+    def set_history(self, history: TickHistory) -> None:
+        """Follow another history, e.g. after the symbol changed."""
+        self._history = history
+        if self._pixmap is not None and self._columns:
+            self._rebuild()
+            self.update()
+
+    def refresh(self) -> None:
+        """Fold new ticks into the buckets and paint the affected columns."""
+        if self._pixmap is None or self._columns == 0:
+            return
+        total = self._history.total
+        fresh = total - self._seen
+        if fresh <= 0:
+            return
+        window = self._history.last(fresh)
+        self._seen = total
+        old_head = self._head
+        dirty_from = old_head + 1
+        out_of_scale = False
+        for prices, times in zip(window.prices, window.times):
+            for price, trade_time in zip(prices, times):
+                bucket = int(trade_time // self._column_ms)
+                if bucket > self._head:
+                    self._advance(bucket)
+                elif bucket <= self._head - self._columns:
+                    continue  # older than the visible span
+                slot = bucket % self._columns
+                if not price >= self._mins[slot]:  # also true when the slot is NaN
+                    self._mins[slot] = price
+                if not price <= self._maxs[slot]:
+                    self._maxs[slot] = price
+                if bucket < dirty_from:
+                    dirty_from = bucket
+                out_of_scale = out_of_scale or not self._low <= price <= self._high
+
+        if old_head < 0 or out_of_scale or (self._head > old_head and self._scale_too_wide()):
+            self._redraw()
+        else:
+            shifted = min(self._head - old_head, self._columns)
+            first = max(min(dirty_from, old_head + 1), self._head - self._columns + 1)
+            self._paint_columns(shifted, first)
+        self.update()
+
+    # ------------------------------------------------------------------
+    # Qt events
+    # ------------------------------------------------------------------
+    def paintEvent(self, a0: QtGui.QPaintEvent | None) -> None:  # noqa: N802 - Qt API
+        if self._pixmap is None:
+            return
+        painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
+
+    def resizeEvent(self, a0: QtGui.QResizeEvent | None) -> None:  # noqa: N802 - Qt API
+        super().resizeEvent(a0)
+        self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _rebuild(self) -> None:
+        """Re-decimate the visible span from the history at the current width."""
+        width = max(1, self.width())
+        ratio = self.devicePixelRatioF()
+        self._pixmap = QtGui.QPixmap(int(width * ratio), int(self.height() * ratio))
+        self._pixmap.setDevicePixelRatio(ratio)
+        self._columns = width
+        self._column_ms = self._span_ms / width
+        self._mins = array("d", [_NAN]) * width
+        self._maxs = array("d", [_NAN]) * width
+        self._head = -1
+        latest = self._history.latest()
+        self._seen = self._history.total
+        if latest is not None:
+            end_time = latest[2]
+            window = self._history.since(int(end_time - self._span_ms))
+            self._head = int(end_time // self._column_ms)
+            for prices, times in zip(window.prices, window.times):
+                for price, trade_time in zip(prices, times):
+                    bucket = int(trade_time // self._column_ms)
+                    if bucket <= self._head - width:
+                        continue
+                    slot = bucket % width
+                    if not price >= self._mins[slot]:
+                        self._mins[slot] = price
+                    if not price <= self._maxs[slot]:
+                        self._maxs[slot] = price
+        self._redraw()
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head to ``bucket``, clearing the columns it uncovers."""
+        for absolute in range(max(self._head + 1, bucket - self._columns + 1), bucket + 1):
+            slot = absolute % self._columns
+            self._mins[slot] = _NAN
+            self._maxs[slot] = _NAN
+        self._head = bucket
+
+    def _visible_range(self) -> tuple[float, float]:
+        low = min((value for value in self._mins if value == value), default=math.inf)
+        high = max((value for value in self._maxs if value == value), default=-math.inf)
+        return low, high
+
+    def _scale_too_wide(self) -> bool:
+        """True once old extremes scrolled out and the data only fills part of the scale."""
+        low, high = self._visible_range()
+        if low == math.inf:
+            return False
+        return (high - low) < _RESCALE_SHRINK * (self._high - self._low)
+
+    def _redraw(self) -> None:
+        if self._pixmap is None:
+            return
+        low, high = self._visible_range()
+        pad = max((high - low) * 0.1, abs(high) * 1e-6, 1e-9) if low != math.inf else 0.0
+        self._low, self._high = low - pad, high + pad
+        self._pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+        self._paint_columns(0, self._head - self._columns + 1)
+
+    def _paint_columns(self, shifted: int, first_bucket: int) -> None:
+        """Scroll the cache by ``shifted`` columns and draw buckets from ``first_bucket``."""
+        pixmap = self._pixmap
+        if pixmap is None or self._head < 0:
+            return
+        ratio = pixmap.devicePixelRatio()
+        if shifted:
+            pixmap.scroll(-int(shifted * ratio), 0, pixmap.rect())
+        height = self.height()
+        scale = (height - 2) / (self._high - self._low) if self._high > self._low else 0.0
+        painter = QtGui.QPainter(pixmap)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_Source)
+        clear = QtGui.QColor(0, 0, 0, 0)
+        first_x = self._columns - 1 - (self._head - first_bucket)
+        painter.fillRect(QtCore.QRectF(first_x, 0, self._columns - first_x, height), clear)
+        painter.setPen(self._pen)
+        for bucket in range(first_bucket, self._head + 1):
+            slot = bucket % self._columns
+            low = self._mins[slot]
+            if low != low:
+                continue
+            x = self._columns - 1 - (self._head - bucket)
+            y_low = height - 1 - (low - self._low) * scale
+            y_high = height - 1 - (self._maxs[slot] - self._low) * scale
+            painter.drawLine(QtCore.QPointF(x + 0.5, y_high), QtCore.QPointF(x + 0.5, y_low))
+        painter.end()
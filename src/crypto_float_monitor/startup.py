@@ -0,0 +1,58 @@
+"""Phase-by-phase start-up timing for ``--profile-startup``."""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import TextIO
+
+from . import metrics
+
+
+class StartupProfile:
+    """Marks named phases against a common origin and prints the breakdown.
+
+    Each ``mark`` closes the phase that started at the previous mark, so the
+    report shows both the duration of every phase and the time since the
+    origin. ``first_paint`` and ``first_price`` are also published as gauges
+    when metrics are enabled, so time-to-first-paint and time-to-first-price
+    can be tracked across releases.
+    """
+
+    def __init__(self, origin: float | None = None, enabled: bool = True) -> None:
+        self.origin = time.perf_counter() if origin is None else origin
+        self.enabled = enabled
+        self._phases: list[tuple[str, float]] = []
+        self._last = self.origin
+        self._reported = False
+
+    def mark(self, phase: str) -> float:
+        """End ``phase`` now; returns seconds since the origin."""
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last))
+        self._last = now
+        elapsed = now - self.origin
+        registry = metrics.registry()
+        if registry is not None and phase in ("first paint", "first price"):
+            gauge = registry.gauge(
+                f"cfm_startup_{phase.replace(' ', '_')}_seconds",
+                f"Seconds from process start-up to the {phase}.",
+            )
+            gauge.set(elapsed)
+        return elapsed
+
+    def phases(self) -> list[tuple[str, float]]:
+        return list(self._phases)
+
+    def report(self, stream: TextIO | None = None) -> None:
+        """Print the breakdown once (later calls are ignored)."""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        out = stream or sys.stderr
+        total = 0.0
+        print("[startup] phase                      ms   total ms", file=out)
+        for phase, seconds in self._phases:
+            total += seconds
+            print(f"[startup] {phase:<22} {seconds * 1000:8.1f} {total * 1000:10.1f}", file=out)
+        out.flush()
@@ -0,0 +1,699 @@
+"""Qt-free streaming core: connections, decoding and per-trade bookkeeping.
+
+Nothing here imports Qt. Consumers register plain callbacks (``on_tick``,
+``on_status``, ``on_gap``, ``on_candle``, ``on_update``) or iterate
+:func:`iter_ticks`; :mod:`crypto_float_monitor.binance_client` adapts the same
+engines to Qt signals for the widget.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import json
+import queue
+import random
+import ssl
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+import websocket
+
+from .coalescing import PriceBar, PriceCoalescer
+from .decoders import SEQUENTIAL_KINDS, TradeTick, decode_depth_update, get_decoder
+from .indicators import IndicatorStore
+from .klines import DEFAULT_INTERVALS, Candle, CandleAggregator
+from .metrics import stream_metrics
+from .order_book import BookTop, DepthBooks, snapshot_source
+from .recorder import TickArchive, TickColumns, TickRecorder
+from .tick_history import TickHistoryStore
+
+DEBUG = False
+
+TickCallback = Callable[[str, TradeTick], None]
+StatusCallback = Callable[[str], None]
+GapCallback = Callable[[str, int, int], None]
+CandleCallback = Callable[[str, str, Candle], None]
+BookCallback = Callable[[str, BookTop], None]
+
+DEPTH_PROBE = 128  # characters of a frame searched for the depthUpdate event type
+
+
+@dataclass(frozen=True)
+class StreamSettings:
+    symbol: str = "BTCUSDT"
+    base_url: str = "wss://stream.binance.com:9443/ws"
+    reconnect_delay: float = 3.0
+    reconnect_max_delay: float = 60.0
+    watchlist: tuple[str, ...] = ()
+    refresh_hz: float = 30.0
+    decoder: str = "fast"
+    engine: str = "thread"
+    history_capacity: int = 100_000
+    record_ticks: bool = False
+    replay_speed: float = 1.0
+    candle_intervals: tuple[str, ...] = DEFAULT_INTERVALS
+    redundant: bool = False
+    stall_timeout: float = 5.0
+    ping_interval: float = 20.0
+    ping_timeout: float = 10.0
+    relay: bool = False
+    depth: bool = False
+    depth_snapshot: str = ""
+    indicators: tuple[str, ...] = ()
+    stream_kind: str = "trade"
+    compression: bool = True
+    stream_process: bool = False
+
+    @property
+    def frame_interval(self) -> float:
+        """Minimum seconds between two UI updates; ``0`` disables the frame cap."""
+        if not self.refresh_hz > 0:  # NaN included
+            return 0.0
+        return 1.0 / self.refresh_hz
+
+    @property
+    def connection_count(self) -> int:
+        return 2 if self.redundant else 1
+
+    @property
+    def stream_url(self) -> str:
+        return f"{self.base_url}/{stream_name(self.symbol, self.stream_kind)}"
+
+    @property
+    def symbols(self) -> tuple[str, ...]:
+        """Primary symbol followed by the watchlist, upper-cased and deduplicated."""
+        ordered = (self.symbol, *self.watchlist)
+        return tuple(dict.fromkeys(symbol.upper() for symbol in ordered if symbol))
+
+    @property
+    def multiplexed(self) -> bool:
+        return len(self.symbols) > 1 or self.depth
+
+    @property
+    def combined_base_url(self) -> str:
+        base = self.base_url.rstrip("/")
+        if base.endswith("/ws"):
+            base = base[: -len("/ws")]
+        return f"{base}/stream"
+
+    def combined_stream_url(self, symbols: Iterable[str]) -> str:
+        streams = "/".join(name for symbol in symbols for name in self.streams(symbol))
+        return f"{self.combined_base_url}?streams={streams}"
+
+    def streams(self, symbol: str) -> tuple[str, ...]:
+        """Stream names subscribed for one pair."""
+        if self.depth:
+            return stream_name(symbol, self.stream_kind), depth_stream_name(symbol)
+        return (stream_name(symbol, self.stream_kind),)
+
+
+def stream_name(symbol: str, kind: str = "trade") -> str:
+    return f"{symbol.lower()}@{kind}"
+
+
+def depth_stream_name(symbol: str) -> str:
+    return f"{symbol.lower()}@depth@100ms"
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    ceiling = min(cap, base * 2 ** min(attempt, 30))
+    return ceiling / 2 + random.random() * ceiling / 2
+
+
+class Lane:
+    """Bookkeeping for one of the (possibly redundant) connections of a streamer."""
+
+    __slots__ = ("index", "attempt", "connected", "last_message", "connection")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.attempt = 0  # reconnects since the last message, drives the backoff
+        self.connected = False
+        self.last_message = 0.0  # monotonic time of the last frame (or of the open)
+        self.connection: object | None = None  # engine-specific socket handle
+
+
+class StreamCore:
+    """State and per-trade work shared by every streaming engine.
+
+    When the settings carry a watchlist, every pair is multiplexed over a single
+    combined-stream connection.
+
+    Every decoded trade is appended to ``history``, a per-symbol
+    :class:`TickHistoryStore` that other threads query without copying, folded
+    into OHLCV ``candles`` for every interval in ``candle_intervals`` and into a
+    :class:`PriceCoalescer` that consumers empty with ``drain``. With
+    ``record_ticks`` set it is also handed to a :class:`TickRecorder`, which
+    persists it from its own writer thread.
+
+    ``symbols`` are the pairs this consumer asked for. Other consumers of the
+    same connection (the relay hub's subscribers) add theirs with ``retain``;
+    the connection carries the union, and only the difference is ever sent
+    upstream.
+
+    With ``indicators`` set (names such as ``"ema_1m"``, ``"vwap"`` or
+    ``"std_5m"``), trades also update an :class:`IndicatorStore`. The first
+    trade of a pair warms its indicators up from the tick archive on a
+    background thread; trades arriving meanwhile are buffered, not lost.
+
+    ``stream_kind`` picks the stream subscribed per pair: ``trade`` (the
+    default), ``aggTrade``, ``bookTicker`` or the once-a-second ``miniTicker``.
+    Each decodes to a :class:`TradeTick`, so everything downstream is the
+    same; gaps are only reported for kinds whose ids count every event.
+
+    With ``depth`` set, every pair's ``@depth@100ms`` diff stream is carried
+    on the same connection and kept as a local order book in ``books`` (a
+    :class:`DepthBooks`), seeded from ``depth_snapshot``.
+
+    With ``redundant`` set, engines keep a second warm connection to the same
+    streams. Both feed ``_handle_tick``, which drops trades whose id was already
+    seen, so whichever connection delivers first wins and losing one costs
+    nothing. A connection silent for ``stall_timeout`` while its peer is still
+    receiving is considered stalled and recycled.
+
+    Callbacks run on the engine's network thread:
+
+    * ``on_tick(symbol, tick)`` for every new trade;
+    * ``on_update()`` when the coalescer goes from empty to pending;
+    * ``on_candle(symbol, interval, candle)`` once per finished candle;
+    * ``on_gap(symbol, first_missing, last_missing)`` whenever the trade ids of
+      a symbol skip ahead, i.e. trades never arrived on any connection;
+    * ``on_book(symbol, top)`` with a :class:`BookTop` after every depth diff
+      applied to a synced book (also from the snapshot thread once it syncs);
+    * ``on_status(text)`` on connection state changes.
+
+    Subclasses own the connections: they implement ``start``/``stop`` and
+    ``_send_text`` and feed raw frames to ``_handle_message``.
+    """
+
+    def __init__(
+        self,
+        settings: StreamSettings | None = None,
+        *,
+        on_tick: TickCallback | None = None,
+        on_update: Callable[[], None] | None = None,
+        on_candle: CandleCallback | None = None,
+        on_gap: GapCallback | None = None,
+        on_status: StatusCallback | None = None,
+        on_book: BookCallback | None = None,
+    ) -> None:
+        self._settings = settings or StreamSettings()
+        self.on_tick = on_tick
+        self.on_update = on_update
+        self.on_candle = on_candle
+        self.on_gap = on_gap
+        self.on_status = on_status
+        self.on_book = on_book
+        self._symbols_lock = threading.Lock()
+        self._symbols: list[str] = list(self._settings.symbols)
+        self._retained: dict[object, tuple[str, ...]] = {}
+        self._primary = self._settings.symbol.upper()
+        self._request_ids = itertools.count(1)
+        self._coalescer = PriceCoalescer()
+        self._decode = get_decoder(self._settings.decoder, self._settings.stream_kind)
+        self._sequential_ids = self._settings.stream_kind in SEQUENTIAL_KINDS
+        self.history = TickHistoryStore(self._settings.history_capacity)
+        self._recorder = TickRecorder() if self._settings.record_ticks else None
+        self.candles = CandleAggregator(self._settings.candle_intervals)
+        self.indicators: IndicatorStore | None = None
+        self._warm_archive: TickArchive | None = None
+        if self._settings.indicators:
+            self.indicators = IndicatorStore(self._settings.indicators)
+            self._warm_archive = TickArchive()
+        self.books: DepthBooks | None = None
+        if self._settings.depth:
+            self.books = DepthBooks(snapshot_source(self._settings.depth_snapshot), on_book=self._book_updated)
+        self._lanes = [Lane(index) for index in range(self._settings.connection_count)]
+        self._tick_lock = threading.Lock()
+        self._last_trade_ids: dict[str, int] = {}
+        self._metrics = stream_metrics()
+        self._log(f"Inicializando stream para {', '.join(self._symbols)}")
+
+    @property
+    def settings(self) -> StreamSettings:
+        return self._settings
+
+    @property
+    def primary(self) -> str:
+        return self._primary
+
+    @property
+    def symbols(self) -> tuple[str, ...]:
+        with self._symbols_lock:
+            return tuple(self._symbols)
+
+    def streamed_symbols(self) -> tuple[str, ...]:
+        """``symbols`` followed by the pairs retained for other consumers: what the connection carries."""
+        with self._symbols_lock:
+            return self._streamed()
+
+    def drain(self) -> dict[str, PriceBar]:
+        """Take every pending bar (one per symbol) accumulated since the last drain."""
+        return self._coalescer.drain()
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, *symbols: str) -> None:
+        """Add pairs to the live connection without reconnecting."""
+        added = [symbol.upper() for symbol in symbols]
+
+        def change() -> None:
+            self._symbols.extend(symbol for symbol in dict.fromkeys(added) if symbol not in self._symbols)
+
+        self._change_symbols(change)
+
+    def unsubscribe(self, *symbols: str) -> None:
+        """Drop pairs from the live connection; the primary symbol is always kept."""
+        removed = {symbol.upper() for symbol in symbols}
+
+        def change() -> None:
+            self._symbols = [item for item in self._symbols if item == self._primary or item not in removed]
+
+        self._change_symbols(change)
+
+    def set_symbols(self, symbol: str, watchlist: Iterable[str] = ()) -> None:
+        """Switch to a new primary symbol and watchlist on the live connection.
+
+        Only the difference is sent: pairs kept in both sets stay subscribed and
+        keep their trade-id tracking.
+        """
+        primary = symbol.upper()
+        wanted = list(dict.fromkeys((primary, *(item.upper() for item in watchlist if item))))
+
+        def change() -> None:
+            self._primary = primary
+            self._symbols = wanted
+
+        self._change_symbols(change)
+
+    def retain(self, owner: object, symbols: Iterable[str]) -> None:
+        """Keep ``symbols`` streamed on behalf of ``owner``, replacing what it retained before."""
+        wanted = tuple(dict.fromkeys(symbol.upper() for symbol in symbols if symbol))
+        self._change_symbols(lambda: self._retained.__setitem__(owner, wanted))
+
+    def release(self, owner: object) -> None:
+        """Forget ``owner``'s pairs; those nobody else wants are unsubscribed."""
+        self._change_symbols(lambda: self._retained.pop(owner, None))
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _streamed(self) -> tuple[str, ...]:
+        # Caller holds _symbols_lock.
+        return tuple(dict.fromkeys(itertools.chain(self._symbols, *self._retained.values())))
+
+    def _change_symbols(self, change: Callable[[], None]) -> None:
+        """Apply ``change`` under the lock and send only the resulting difference upstream."""
+        with self._symbols_lock:
+            before = self._streamed()
+            change()
+            after = self._streamed()
+        added = [symbol for symbol in after if symbol not in before]
+        removed = [symbol for symbol in before if symbol not in after]
+        if removed:
+            with self._tick_lock:
+                for symbol in removed:
+                    self._last_trade_ids.pop(symbol, None)
+            if self.books is not None:
+                for symbol in removed:
+                    self.books.forget(symbol)
+            self._send_control("UNSUBSCRIBE", removed)
+        if added:
+            self._send_control("SUBSCRIBE", added)
+
+    def _next_url(self) -> tuple[str, tuple[str, ...]]:
+        """Snapshot the live symbols and build the URL for the next connection."""
+        symbols = self.streamed_symbols()
+        if len(symbols) > 1 or self._settings.multiplexed:
+            return self._settings.combined_stream_url(symbols), symbols
+        return f"{self._settings.base_url}/{stream_name(symbols[0], self._settings.stream_kind)}", symbols
+
+    def _send_text(self, text: str) -> bool:
+        """Send a frame on every live connection; ``False`` when none is connected."""
+        raise NotImplementedError
+
+    def _send_control(self, method: str, symbols: list[str]) -> None:
+        frame = {
+            "method": method,
+            "params": [name for symbol in symbols for name in self._settings.streams(symbol)],
+            "id": next(self._request_ids),
+        }
+        try:
+            sent = self._send_text(json.dumps(frame))
+        except Exception as exc:
+            self._log(f"Falha ao enviar {method}: {exc}")
+            return
+        if sent:
+            self._log(f"{method} enviado para {', '.join(symbols)}")
+        # Otherwise not connected yet: the next (re)connect URL already includes the change.
+
+    def _sync_subscriptions(self, url_symbols: tuple[str, ...]) -> None:
+        """Catch up with (un)subscriptions requested while the URL was being dialed."""
+        current = self.streamed_symbols()
+        added = [symbol for symbol in current if symbol not in url_symbols]
+        removed = [symbol for symbol in url_symbols if symbol not in current]
+        if added:
+            self._send_control("SUBSCRIBE", added)
+        if removed:
+            self._send_control("UNSUBSCRIBE", removed)
+
+    def _handle_message(self, message: str) -> None:
+        if self.books is not None and message.find('"depthUpdate"', 0, DEPTH_PROBE) != -1:
+            self._handle_depth(message)
+            return
+        metrics = self._metrics
+        if metrics is None:
+            tick = self._decode(message)
+        else:
+            metrics.messages_received.inc()
+            metrics.bytes_received.inc(len(message))
+            started = time.perf_counter()
+            tick = self._decode(message)
+            metrics.parse_seconds.observe(time.perf_counter() - started)
+        if tick is None:
+            return
+        if metrics is not None:
+            metrics.messages_parsed.inc()
+        self._handle_tick(tick)
+
+    def _handle_depth(self, message: str) -> None:
+        if self._metrics is not None:
+            self._metrics.messages_received.inc()
+            self._metrics.bytes_received.inc(len(message))
+        update = decode_depth_update(message)
+        if update is not None and self.books is not None:
+            self.books.handle(update)
+
+    def _book_updated(self, symbol: str, top: BookTop) -> None:
+        if self.on_book is not None:
+            self.on_book(symbol, top)
+
+    def _handle_tick(self, tick: TradeTick) -> None:
+        symbol = tick.symbol or self._primary
+        # Redundant connections call in from two threads; the lock also keeps a
+        # single writer on the history and candles.
+        with self._tick_lock:
+            last_id = self._last_trade_ids.get(symbol)
+            if last_id is not None:
+                if tick.trade_id <= last_id:
+                    return  # already delivered by the other connection
+                if tick.trade_id > last_id + 1 and self._sequential_ids:
+                    if self.on_gap is not None:
+                        self.on_gap(symbol, last_id + 1, tick.trade_id - 1)
+                    if self._metrics is not None:
+                        self._metrics.trades_missed.inc(tick.trade_id - last_id - 1)
+                    self._log(f"Lacuna em {symbol}: trades {last_id + 1}..{tick.trade_id - 1}")
+            self._last_trade_ids[symbol] = tick.trade_id
+            self.history.get(symbol).append(tick.price, tick.quantity, tick.trade_time, tick.trade_id)
+            recorder = self._recorder
+            if recorder is not None:
+                recorder.record(symbol, tick)
+            for interval, candle in self.candles.update(symbol, tick.price, tick.quantity, tick.trade_time):
+                if self.on_candle is not None:
+                    self.on_candle(symbol, interval, candle)
+            if self.indicators is not None:
+                self._update_indicators(symbol, tick.price, tick.quantity, tick.trade_time, tick.trade_id)
+            if self.on_tick is not None:
+                self.on_tick(symbol, tick)
+        if self._coalescer.push(symbol, tick.price, tick.quantity, tick.trade_time) and self.on_update is not None:
+            self.on_update()
+        self._log(f"Preço recebido: {symbol} {tick.price}")
+
+    def _update_indicators(self, symbol: str, price: float, quantity: float, trade_time: int, trade_id: int) -> None:
+        # Caller holds _tick_lock.
+        indicators, archive = self.indicators, self._warm_archive
+        if indicators is None:
+            return
+        if archive is not None and symbol not in indicators:
+            indicators.hold(symbol)
+            threading.Thread(
+                target=self._warm_up_indicators,
+                args=(indicators, archive, symbol, trade_time),
+                name=f"IndicatorWarmUp-{symbol}",
+                daemon=True,
+            ).start()
+        indicators.update(symbol, price, quantity, trade_time, trade_id)
+
+    def _warm_up_indicators(self, indicators: IndicatorStore, archive: TickArchive, symbol: str, end_time: int) -> None:
+        started = time.perf_counter()
+        try:
+            columns = archive.columns(symbol, indicators.lookback_start(end_time), end_time)
+        except (OSError, ValueError) as exc:
+            self._log(f"Falha ao ler o histórico de {symbol}: {exc}")
+            columns = TickColumns((), (), (), ())
+        last_id = int(columns.trade_ids[-1]) if len(columns.trade_ids) else -1
+        indicators.release(symbol, columns.prices, columns.quantities, columns.times, last_id)
+        elapsed = time.perf_counter() - started
+        self._log(f"Indicadores de {symbol} aquecidos com {len(columns.times)} ticks em {elapsed:.3f}s")
+
+    def _lane_opened(self, lane: Lane) -> None:
+        if self._metrics is not None and not any(other.connected for other in self._lanes):
+            self._metrics.connection_start.set(time.time())
+        lane.connected = True
+        lane.last_message = time.monotonic()
+        self._report_status(self._connection_status())
+
+    def _lane_closed(self, lane: Lane) -> None:
+        lane.connected = False
+        lane.connection = None
+        if self._metrics is not None and not any(other.connected for other in self._lanes):
+            self._metrics.connection_start.set(0.0)
+        self._report_status(self._connection_status())
+
+    def _lane_message(self, lane: Lane, message: str) -> None:
+        lane.last_message = time.monotonic()
+        lane.attempt = 0
+        self._handle_message(message)
+
+    def _lane_backoff(self, lane: Lane) -> float:
+        delay = backoff_delay(lane.attempt, self._settings.reconnect_delay, self._settings.reconnect_max_delay)
+        lane.attempt += 1
+        if self._metrics is not None:
+            self._metrics.reconnects.inc()
+        return delay
+
+    def _connection_status(self) -> str:
+        connected = sum(lane.connected for lane in self._lanes)
+        if not connected:
+            return "Desconectado"
+        if connected < len(self._lanes):
+            return f"Conectado ({connected}/{len(self._lanes)})"
+        return "Conectado"
+
+    def _stalled_lanes(self) -> list[Lane]:
+        """Connected lanes silent for ``stall_timeout`` while another lane kept receiving."""
+        timeout = self._settings.stall_timeout
+        if timeout <= 0 or len(self._lanes) < 2:
+            return []
+        now = time.monotonic()
+        if now - max(lane.last_message for lane in self._lanes) > timeout:
+            return []  # the whole stream is quiet, not one connection
+        return [lane for lane in self._lanes if lane.connected and now - lane.last_message > timeout]
+
+    def _report_status(self, status: str) -> None:
+        if self.on_status is not None:
+            self.on_status(status)
+
+    def _close_resources(self) -> None:
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+        if self.books is not None:
+            self.books.close()
+
+    def _log(self, message: str) -> None:
+        if not DEBUG:
+            return
+        print(f"[{type(self).__name__}] {message}", flush=True)
+
+
+class ThreadedStream(StreamCore):
+    """Connects to Binance with ``websocket-client`` on dedicated threads.
+
+    Each connection (two when ``redundant``) runs ``WebSocketApp.run_forever``
+    on its own thread and reconnects with jittered exponential backoff; in
+    redundant mode a watchdog thread aborts connections that stall.
+    ``websocket-client`` has no permessage-deflate support, so ``compression``
+    only applies to the asyncio engine.
+    """
+
+    def __init__(self, settings: StreamSettings | None = None, **callbacks: Any) -> None:
+        super().__init__(settings, **callbacks)
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop_event.clear()
+        self._log("Iniciando thread de stream...")
+        self._threads = [
+            threading.Thread(target=self._run, args=(lane,), name=f"BinanceStream-{lane.index}", daemon=True)
+            for lane in self._lanes
+        ]
+        if len(self._lanes) > 1:
+            self._threads.append(threading.Thread(target=self._watch, name="BinanceStreamWatchdog", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._log("Solicitando parada do streamer...")
+        for lane in self._lanes:
+            ws_app = lane.connection
+            if isinstance(ws_app, websocket.WebSocketApp):
+                try:
+                    ws_app.close()
+                except Exception:
+                    pass
+        deadline = time.monotonic() + 5
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._close_resources()
+        self._log("Streamer parado.")
+
+    # ---------------------------------------------------------------------
+    # Internal helpers
+    # ---------------------------------------------------------------------
+    def _send_text(self, text: str) -> bool:
+        sent = False
+        for lane in self._lanes:
+            ws_app = lane.connection
+            if not isinstance(ws_app, websocket.WebSocketApp) or ws_app.sock is None or not ws_app.sock.connected:
+                continue
+            ws_app.send(text)
+            sent = True
+        return sent
+
+    def _run(self, lane: Lane) -> None:
+        while not self._stop_event.is_set():
+            if not any(other.connected for other in self._lanes):
+                self._report_status("Connecting…")
+            url, url_symbols = self._next_url()
+            self._log(f"Conectando em {url} (conexão {lane.index})")
+            ws_app = websocket.WebSocketApp(
+                url,
+                on_open=functools.partial(self._on_open, lane, url_symbols),
+                on_message=functools.partial(self._on_message, lane),
+                on_error=self._on_error,
+                on_close=functools.partial(self._on_close, lane),
+            )
+            lane.connection = ws_app
+            try:
+                ws_app.run_forever(
+                    sslopt={"cert_reqs": ssl.CERT_REQUIRED},
+                    ping_interval=self._settings.ping_interval,
+                    ping_timeout=self._settings.ping_timeout,
+                )
+            except Exception as exc:  # pragma: no cover - defensive
+                self._report_status(f"Erro: {exc}")
+                self._log(f"Erro no stream: {exc}")
+            finally:
+                if lane.connected:
+                    self._lane_closed(lane)
+                lane.connection = None
+
+            if self._stop_event.is_set():
+                break
+
+            delay = self._lane_backoff(lane)
+            if not any(other.connected for other in self._lanes):
+                self._report_status("Reconectando…")
+            self._log(f"Aguardando {delay:.1f}s para reconectar (conexão {lane.index})...")
+            if self._stop_event.wait(delay):
+                break
+
+    def _watch(self) -> None:
+        interval = min(1.0, max(0.1, self._settings.stall_timeout / 4))
+        while not self._stop_event.wait(interval):
+            for lane in self._stalled_lanes():
+                ws_app = lane.connection
+                if not isinstance(ws_app, websocket.WebSocketApp) or ws_app.sock is None:
+                    continue
+                self._log(f"Conexão {lane.index} parada há {self._settings.stall_timeout}s; reciclando.")
+                lane.connected = False  # not reported as stalled again while it winds down
+                # abort() shuts the socket down without waiting for a close
+                # handshake the stalled peer would never answer.
+                ws_app.sock.abort()
+
+    def _on_open(self, lane: Lane, url_symbols: tuple[str, ...], *_: object) -> None:
+        self._lane_opened(lane)
+        self._log(f"WebSocket aberto (conexão {lane.index}).")
+        self._sync_subscriptions(url_symbols)
+
+    def _on_close(self, lane: Lane, *_: object) -> None:
+        self._lane_closed(lane)
+        self._log(f"WebSocket fechado (conexão {lane.index}).")
+
+    def _on_error(self, _ws: websocket.WebSocketApp, error: Exception) -> None:
+        self._report_status(f"Erro: {error}")
+        self._log(f"Erro recebido: {error}")
+
+    def _on_message(self, lane: Lane, _ws: websocket.WebSocketApp, message: str) -> None:
+        self._lane_message(lane, message)
+
+
+def create_stream(settings: StreamSettings | None = None, **callbacks: Any) -> StreamCore:
+    """Build the Qt-free stream for ``settings.engine`` (``"thread"``, ``"asyncio"`` or ``"replay"``).
+
+    With ``settings.stream_process`` live engines run in a child process that
+    hands decoded trades over shared memory (see
+    :mod:`crypto_float_monitor.process_stream`). With ``settings.relay`` they
+    are reached through the local relay hub (see
+    :mod:`crypto_float_monitor.relay`), which runs that engine once for every
+    consumer.
+    """
+    settings = settings or StreamSettings()
+    if settings.engine == "replay":
+        from .archive_replay import ArchiveReplayStream
+
+        return ArchiveReplayStream(settings, **callbacks)
+    if settings.stream_process and not settings.depth:
+        # Depth books stay in-process: the ring only carries trades.
+        from . import process_stream
+
+        if process_stream.process_stream_available():
+            return process_stream.ProcessStream(settings, **callbacks)
+        if DEBUG:
+            print("[create_stream] Memória compartilhada indisponível; streaming no próprio processo.", flush=True)
+    if settings.relay and not settings.depth:
+        # Depth diffs are not relayed: a consumer that keeps a book connects directly.
+        from . import relay
+
+        if relay.relay_available():
+            return relay.RelayStream(settings, **callbacks)
+        if DEBUG:
+            print("[create_stream] Relay indisponível nesta plataforma; conectando direto.", flush=True)
+    if settings.engine == "asyncio":
+        from . import async_client
+
+        if async_client.websockets_available():
+            return async_client.AsyncStream(settings, **callbacks)
+        if DEBUG:
+            print("[create_stream] websockets ausente; usando engine de threads.", flush=True)
+    return ThreadedStream(settings, **callbacks)
+
+
+def iter_ticks(settings: StreamSettings | None = None) -> Iterator[TradeTick]:
+    """Block on the live feed and yield every trade; closing the generator stops the stream."""
+    ticks: queue.SimpleQueue[TradeTick] = queue.SimpleQueue()
+
+    def on_tick(symbol: str, tick: TradeTick) -> None:
+        ticks.put(tick if tick.symbol else tick._replace(symbol=symbol))
+
+    stream = create_stream(settings, on_tick=on_tick)
+    stream.start()
+    try:
+        while True:
+            yield ticks.get()
+    finally:
+        stream.stop()
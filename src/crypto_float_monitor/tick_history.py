@@ -0,0 +1,151 @@
+"""Fixed-capacity, array-backed trade history."""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Callable, Iterator
+
+# price (d) + quantity (d) + trade time (q) + trade id (q)
+BYTES_PER_TICK = 32
+
+
+class TickWindow:
+    """Zero-copy view of a slice of a :class:`TickHistory`.
+
+    Because the history is a ring, a window spans at most two contiguous runs of
+    the underlying arrays. Each column is exposed as a tuple of ``memoryview``
+    chunks in chronological order (wrap them with ``numpy.frombuffer`` for
+    vector maths). Views alias live storage: consume them before the writer
+    laps the ring, i.e. within ``capacity`` further ticks.
+    """
+
+    __slots__ = ("prices", "quantities", "times", "trade_ids", "_length")
+
+    def __init__(self, history: "TickHistory", runs: list[tuple[int, int]]) -> None:
+        self.prices = tuple(memoryview(history._prices)[start:stop] for start, stop in runs)
+        self.quantities = tuple(memoryview(history._quantities)[start:stop] for start, stop in runs)
+        self.times = tuple(memoryview(history._times)[start:stop] for start, stop in runs)
+        self.trade_ids = tuple(memoryview(history._trade_ids)[start:stop] for start, stop in runs)
+        self._length = sum(stop - start for start, stop in runs)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def iter_prices(self) -> Iterator[float]:
+        return chain.from_iterable(self.prices)
+
+    def iter_times(self) -> Iterator[int]:
+        return chain.from_iterable(self.times)
+
+
+class TickHistory:
+    """Ring buffer of trades stored column-wise in typed contiguous arrays.
+
+    Appending is O(1) and never allocates; memory is fixed at
+    ``capacity * BYTES_PER_TICK`` (1M ticks ~= 32 MB). There is a single writer
+    (the stream thread); readers on other threads take windows without copying.
+    Trade times are expected to be non-decreasing, which Binance guarantees per
+    symbol, so time-range lookups are binary searches.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._prices = array("d", bytes(8 * capacity))
+        self._quantities = array("d", bytes(8 * capacity))
+        self._times = array("q", bytes(8 * capacity))
+        self._trade_ids = array("q", bytes(8 * capacity))
+        self._total = 0
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Number of ticks ever appended, including those overwritten."""
+        return self._total
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * BYTES_PER_TICK
+
+    def append(self, price: float, quantity: float, trade_time: int, trade_id: int = 0) -> None:
+        index = self._total % self.capacity
+        self._prices[index] = price
+        self._quantities[index] = quantity
+        self._times[index] = trade_time
+        self._trade_ids[index] = trade_id
+        # Publish only after the row is complete so readers never see half a tick.
+        self._total += 1
+
+    def latest(self) -> tuple[float, float, int, int] | None:
+        total = self._total
+        if not total:
+            return None
+        index = (total - 1) % self.capacity
+        return self._prices[index], self._quantities[index], self._times[index], self._trade_ids[index]
+
+    def last(self, count: int) -> TickWindow:
+        """Window over the newest ``count`` ticks."""
+        total = self._total
+        count = max(0, min(count, total, self.capacity))
+        return TickWindow(self, self._runs(total - count, total))
+
+    def between(self, start_time: int, end_time: int) -> TickWindow:
+        """Window over ticks with ``start_time <= trade_time <= end_time`` (ms)."""
+        total = self._total
+        first = max(0, total - self.capacity)
+        lo = self._bisect(start_time, first, total, bisect_left)
+        hi = self._bisect(end_time, lo, total, bisect_right)
+        return TickWindow(self, self._runs(lo, hi))
+
+    def since(self, start_time: int) -> TickWindow:
+        return self.between(start_time, 2**63 - 1)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _runs(self, first: int, stop: int) -> list[tuple[int, int]]:
+        """Map the logical range ``[first, stop)`` to at most two physical runs."""
+        if stop <= first:
+            return []
+        start = first % self.capacity
+        end = start + (stop - first)
+        if end <= self.capacity:
+            return [(start, end)]
+        return [(start, self.capacity), (0, end - self.capacity)]
+
+    def _bisect(self, value: int, first: int, stop: int, search: Callable[..., int]) -> int:
+        """Binary search over logical positions ``[first, stop)``; returns a logical position."""
+        for run_start, run_stop in self._runs(first, stop):
+            position = search(self._times, value, run_start, run_stop)
+            if position < run_stop:
+                return first + (position - run_start)
+            first += run_stop - run_start
+        return stop
+
+
+class TickHistoryStore:
+    """Per-symbol :class:`TickHistory` instances sharing one capacity."""
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.capacity = capacity
+        self._histories: dict[str, TickHistory] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> TickHistory:
+        history = self._histories.get(symbol)
+        if history is None:
+            key = symbol.upper()
+            with self._lock:
+                history = self._histories.get(key)
+                if history is None:
+                    history = self._histories[key] = TickHistory(self.capacity)
+        return history
+
+    def symbols(self) -> tuple[str, ...]:
+        return tuple(self._histories)
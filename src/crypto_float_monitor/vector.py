@@ -0,0 +1,14 @@
+"""Optional numpy support (``pip install crypto-float-monitor[vector]``)."""
+
+from __future__ import annotations
+
+from types import ModuleType
+
+
+def load_numpy() -> ModuleType | None:
+    """The numpy module, or ``None`` when it is not installed; imported on first bulk use."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+    return numpy
@@ -3,60 +3,139 @@
 
 from __future__ import annotations
 
+import math
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
 
-from .binance_client import BinancePriceStreamer, StreamSettings
-from .config import save_alerts
+from .alert_audio import AlertAudio
+from .alerts import (
+    ABOVE,
+    BELOW,
+    PRICE,
+    AlertEngine,
+    AlertHit,
+    IndicatorRule,
+    MoveAlertEngine,
+    MoveHit,
+    MoveRule,
+    RuleEngine,
+    RuleHit,
+    parse_move_rule,
+)
+from .binance_client import StreamSettings, create_streamer
+from .coalescing import PriceBar
+from .config import AppConfig, changed_fields, save_alerts
+from .config_watcher import ConfigWatcher
+from .metrics import Histogram, MetricsRegistry, registry
+from .order_book import BookTop
+from .price_display import PriceDisplay
+from .sparkline import SparklineWidget
+from .stream_core import StreamCore
 
 DEBUG = False
 
 DEBUG = False
 
+AUDIO_PRELOAD_DELAY_MS = 2000  # idle time after the first price before loading QtMultimedia
+ALERT_BADGE_MS = 3000
+INDICATOR_REFRESH_MS = 1000
+
 
 class FloatingPriceWidget(QtWidgets.QWidget):
-    """A frameless, draggable widget that stays on top of the desktop."""
+    """A frameless, draggable widget that stays on top of the desktop.
+
+    ``core`` lets the caller start the connection before Qt is even imported;
+    the widget then attaches to it instead of creating its own engine. With a
+    ``config_watcher``, edits to the config file are applied live and alert
+    changes made in the dialog are saved through its debounced writer.
+    When the settings carry ``depth``, a line under the price shows the
+    book's spread and top-of-book imbalance; ``price_source="mid"`` then makes
+    the book's mid price drive the display and the alerts instead of trades.
+    ``first_painted`` and ``first_price_shown`` fire once each, for start-up
+    profiling.
+    """
+
+    first_painted = QtCore.pyqtSignal()
+    first_price_shown = QtCore.pyqtSignal()
 
     def __init__(
         self,
         settings: StreamSettings | None = None,
         parent: Optional[QtWidgets.QWidget] = None,
         *,
-        alert_above: float | None = None,
-        alert_below: float | None = None,
+        alert_above: Iterable[float] = (),
+        alert_below: Iterable[float] = (),
+        move_alerts: Iterable[MoveRule] = (),
+        sparkline_minutes: float = 0.0,
+        core: StreamCore | None = None,
+        config_watcher: ConfigWatcher | None = None,
+        glyph_cache: bool = False,
+        price_source: str = "trade",
+        indicator_alerts: Iterable[IndicatorRule] = (),
+        show_indicators: Iterable[str] = (),
     ) -> None:
         super().__init__(parent)
-        self._settings = settings or StreamSettings()
+        self._settings = core.settings if core is not None else settings or StreamSettings()
+        self._price_source = price_source if self._settings.depth else "trade"
         self._drag_position: Optional[QtCore.QPoint] = None
-        self._last_price: Optional[float] = None
+        self._symbol = self._settings.symbol.upper()
         self._currency_prefix = self._currency_for_symbol(self._settings.symbol)
-        self._alert_cooldown = 60.0  # seconds
-        self._alert_above: float | None = None
-        self._alert_below: float | None = None
-        self._last_alert_ts: dict[str, float] = {"above": 0.0, "below": 0.0}
-        self._alert_ready: dict[str, bool] = {"above": False, "below": False}
-        self._audio_manager = _AlertAudioManager(self)
+        self._alert_engine = AlertEngine(cooldown=60.0)
+        self._move_engine = MoveAlertEngine(move_alerts, cooldown=60.0)
+        self._rule_engine = RuleEngine(indicator_alerts, cooldown=60.0)
+        self._painted = False
+        self._price_shown = False
+        self._config_watcher = config_watcher
+        self._audio = AlertAudio(self)
+        self._audio.played.connect(self._show_alert_badge)
         self._alert_sounds = {
-            "above": self._resolve_sound_path("alert_above.mp3"),
-            "below": self._resolve_sound_path("alert_below.mp3"),
+            ABOVE: self._resolve_sound_path("alert_above.mp3"),
+            BELOW: self._resolve_sound_path("alert_below.mp3"),
         }
         self._set_alert_thresholds(alert_above, alert_below)
 
-        self._price_label = QtWidgets.QLabel("Carregando…")
-        self._price_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-        self._price_label.setFont(QtGui.QFont("Sans Serif", 26, QtGui.QFont.Weight.Bold))
-        self._price_label.setStyleSheet("color: #f5f5f5;")
+        self._price_label = PriceDisplay(self._currency_prefix, glyph_cache=glyph_cache)
+        self._price_label.set_placeholder("Carregando…")
 
         container = QtWidgets.QVBoxLayout()
         container.setContentsMargins(16, 16, 16, 16)
         container.setSpacing(6)
         container.addWidget(self._price_label)
+        self._book_label: QtWidgets.QLabel | None = None
+        if self._settings.depth:
+            self._book_label = QtWidgets.QLabel()
+            self._book_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self._book_label.setFont(QtGui.QFont("Sans Serif", 9))
+            self._book_label.setStyleSheet("color: #bdbdbd; background: transparent; padding: 0px;")
+            container.addWidget(self._book_label)
+        self._shown_indicators = tuple(name for name in show_indicators if name in self._settings.indicators)
+        self._indicator_label: QtWidgets.QLabel | None = None
+        if self._shown_indicators:
+            self._indicator_label = QtWidgets.QLabel()
+            self._indicator_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self._indicator_label.setWordWrap(True)
+            self._indicator_label.setFont(QtGui.QFont("Sans Serif", 9))
+            self._indicator_label.setStyleSheet("color: #bdbdbd; background: transparent; padding: 0px;")
+            container.addWidget(self._indicator_label)
+            self._indicator_timer = QtCore.QTimer(self)
+            self._indicator_timer.setInterval(INDICATOR_REFRESH_MS)
+            self._indicator_timer.timeout.connect(self._refresh_indicators)
+            self._indicator_timer.start()
         self.setLayout(container)
 
+        # "▲ ×3" in the corner while a burst of alerts plays as one sound.
+        self._alert_badge = QtWidgets.QLabel(self)
+        self._alert_badge.setStyleSheet("color: #ffd166; background: transparent; padding: 0px;")
+        self._alert_badge.setFont(QtGui.QFont("Sans Serif", 9, QtGui.QFont.Weight.Bold))
+        self._alert_badge.hide()
+        self._alert_badge_timer = QtCore.QTimer(self)
+        self._alert_badge_timer.setSingleShot(True)
+        self._alert_badge_timer.setInterval(ALERT_BADGE_MS)
+        self._alert_badge_timer.timeout.connect(self._alert_badge.hide)
+
         self.setFixedWidth(300)
         self.setWindowTitle("Crypto Float Monitor")
         self.setWindowFlags(
@@ -76,10 +155,26 @@ class FloatingPriceWidget(QtWidgets.QWidget):
         self._quit_shortcut.setContext(QtCore.Qt.ShortcutContext.ApplicationShortcut)
         self._quit_shortcut.activated.connect(self._handle_quit_shortcut)
 
-        self._streamer = BinancePriceStreamer(settings=self._settings)
-        self._streamer.price_updated.connect(self._handle_price_update)
+        self._metrics_overlay: _MetricsOverlay | None = None
+        metrics = registry()
+        if metrics is not None:
+            # Hidden until toggled with "m"; it only samples while shown.
+            self._metrics_overlay = _MetricsOverlay(metrics, self)
+            self._metrics_shortcut = QtGui.QShortcut(QtGui.QKeySequence("M"), self)
+            self._metrics_shortcut.activated.connect(self._toggle_metrics_overlay)
+
+        self._streamer = create_streamer(self._settings, self, core=core)
+        self._streamer.bar_updated.connect(self._handle_price_bar)
         self._streamer.status_changed.connect(self._handle_status_update)
+        self._streamer.book_updated.connect(self._handle_book)
         self._streamer.start()
+        self._sparkline: SparklineWidget | None = None
+        if sparkline_minutes > 0:
+            history = self._streamer.history.get(self._symbol)
+            self._sparkline = SparklineWidget(history, sparkline_minutes * 60, self)
+            container.addWidget(self._sparkline)
+        if config_watcher is not None:
+            config_watcher.config_changed.connect(self._apply_config)
         self._log("Widget inicializado e stream iniciado.")
         self.adjustSize()
         QtCore.QTimer.singleShot(0, self._place_initially)
@@ -118,32 +213,135 @@ class FloatingPriceWidget(QtWidgets.QWidget):
             event.accept()
         super().mouseDoubleClickEvent(event)
 
+    def paintEvent(self, a0: QtGui.QPaintEvent | None) -> None:  # noqa: N802 - Qt API
+        super().paintEvent(a0)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
     def closeEvent(self, a0: QtGui.QCloseEvent | None) -> None:  # noqa: N802 - Qt API
         self._log("Fechando widget, encerrando streamer...")
+        if self._config_watcher is not None:
+            self._config_watcher.flush()
         self._streamer.stop()
         super().closeEvent(a0)
 
     # ------------------------------------------------------------------
     # Stream callbacks
     # ------------------------------------------------------------------
-    @QtCore.pyqtSlot(float)
+    @QtCore.pyqtSlot(object)
+    def _handle_price_bar(self, bar: PriceBar) -> None:
+        if bar.symbol != self._symbol:
+            return
+        from_trades = self._price_source == "trade"
+        if from_trades:
+            self._handle_price_update(bar.last)
+        if self._sparkline is not None:
+            self._sparkline.refresh()
+        if not from_trades:
+            return  # the mid price arrives through _handle_book
+        # The label only shows the last trade, but thresholds must see the
+        # interval's extremes or a spike inside one frame would go unnoticed;
+        # move windows need the time each extreme traded at, not the frame's.
+        for price, trade_time in bar.timed_path():
+            self._maybe_trigger_alert(price, trade_time)
+
+    @QtCore.pyqtSlot(str, object)
+    def _handle_book(self, symbol: str, top: BookTop) -> None:
+        if symbol != self._symbol:
+            return
+        if self._book_label is not None:
+            text = f"spread {top.spread:,.2f} · imbalance {top.imbalance:+.0%}"
+            if text != self._book_label.text():
+                self._book_label.setText(text)
+        if self._price_source == "mid":
+            self._handle_price_update(top.mid)
+            self._maybe_trigger_alert(top.mid, top.event_time)
+
     def _handle_price_update(self, price: float) -> None:
-        color = "#38b000"  # default to green for first update
-        if self._last_price is not None:
-            if price > self._last_price:
-                color = "#38b000"
-            elif price < self._last_price:
-                color = "#ff4d4f"
-        self._price_label.setStyleSheet(f"color: {color};")
-        self._price_label.setText(self._format_price(price))
-        self._last_price = price
+        self._price_label.set_price(price)
+        if not self._price_shown:
+            self._price_shown = True
+            # QtMultimedia is only needed for alerts; load it once the UI is idle.
+            QtCore.QTimer.singleShot(AUDIO_PRELOAD_DELAY_MS, self._preload_alert_audio)
+            self.first_price_shown.emit()
         self._log(f"Atualização de preço recebida: {price}")
-        self._maybe_trigger_alert(price)
+
+    @QtCore.pyqtSlot(object, object)
+    def _apply_config(self, previous: AppConfig, current: AppConfig) -> None:
+        """Bring the live state in line with the parts of the config that were edited.
+
+        Keys the edit left alone are not touched, so command-line overrides
+        survive a reload that only changed, say, the alert levels.
+        """
+        changed = set(changed_fields(previous, current))
+        for direction, levels in ((ABOVE, current.alert_above), (BELOW, current.alert_below)):
+            if f"alert_{direction}" not in changed:
+                continue
+            live = set(self._alert_engine.levels(direction))
+            # Unchanged levels keep their armed/cooldown state.
+            for level in live.difference(levels):
+                self._alert_engine.remove_level(direction, level)
+            for level in set(levels).difference(live):
+                self._alert_engine.add_level(direction, level)
+        if "move_alerts" in changed:
+            # Windows and rules that stay keep their prices and cooldown state.
+            self._move_engine.set_rules(current.move_alerts)
+        if "indicator_alerts" in changed:
+            self._rule_engine.set_rules(current.indicator_alerts)
+        if not changed & {"symbol", "watchlist"}:
+            return
+        symbol = current.symbol if "symbol" in changed else self._symbol
+        watchlist = current.watchlist
+        if "watchlist" not in changed:
+            watchlist = tuple(item for item in self._streamer.symbols if item != self._symbol)
+        wanted = tuple(dict.fromkeys((symbol, *watchlist)))
+        if wanted != self._streamer.symbols:
+            self._streamer.set_symbols(symbol, watchlist)
+            self._log(f"Pares atualizados sem reconectar: {', '.join(wanted)}")
+        if symbol != self._symbol:
+            self._switch_symbol(symbol)
+
+    def _switch_symbol(self, symbol: str) -> None:
+        self._symbol = symbol.upper()
+        self._currency_prefix = self._currency_for_symbol(symbol)
+        self._price_label.set_currency(self._currency_prefix)
+        # Levels are prices of the new pair now: evaluate them from scratch.
+        self._set_alert_thresholds(self._alert_engine.levels(ABOVE), self._alert_engine.levels(BELOW))
+        self._move_engine.reset()
+        self._rule_engine.set_rules(self._rule_engine.rules)
+        history = self._streamer.history.get(self._symbol)
+        if self._sparkline is not None:
+            self._sparkline.set_history(history)
+        self._price_label.set_placeholder("Carregando…")
+        if self._book_label is not None:
+            self._book_label.clear()
+        if self._indicator_label is not None:
+            self._refresh_indicators()
+        latest = history.latest()
+        if latest is not None and self._price_source == "trade":
+            self._handle_price_update(latest[0])
 
     @QtCore.pyqtSlot(str)
     def _handle_status_update(self, status: str) -> None:
         self._log(f"Status de conexão atualizado: {status}")
 
+    def _toggle_metrics_overlay(self) -> None:
+        overlay = self._metrics_overlay
+        if overlay is None:
+            return
+        if overlay.isVisible():
+            overlay.hide()
+            self.setMinimumHeight(0)
+        else:
+            overlay.show()
+            # Grow the widget so the whole dump fits over the price.
+            self.setMinimumHeight(overlay.sizeHint().height())
+            self.adjustSize()
+            overlay.setGeometry(self.rect())
+            overlay.raise_()
+        self.adjustSize()
+
     def _handle_quit_shortcut(self) -> None:
         self._log("Atalho 'q' detectado. Encerrando aplicação.")
         app = QtWidgets.QApplication.instance()
@@ -155,65 +353,82 @@ class FloatingPriceWidget(QtWidgets.QWidget):
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _maybe_trigger_alert(self, price: float) -> None:
-        now = time.monotonic()
-        if self._alert_above is not None:
-            if price >= self._alert_above:
-                if (
-                    self._alert_ready["above"]
-                    and now - self._last_alert_ts["above"] >= self._alert_cooldown
-                ):
-                    self._play_alert("above")
-                    self._last_alert_ts["above"] = now
-                    self._alert_ready["above"] = False
-            elif price < self._alert_above:
-                self._alert_ready["above"] = True
-
-        if self._alert_below is not None:
-            if price <= self._alert_below:
-                if (
-                    self._alert_ready["below"]
-                    and now - self._last_alert_ts["below"] >= self._alert_cooldown
-                ):
-                    self._play_alert("below")
-                    self._last_alert_ts["below"] = now
-                    self._alert_ready["below"] = False
-            elif price > self._alert_below:
-                self._alert_ready["below"] = True
+    def _maybe_trigger_alert(self, price: float, trade_time: int) -> None:
+        hits: list[AlertHit | MoveHit | RuleHit] = [*self._alert_engine.update(price)]
+        hits += self._move_engine.update(price, trade_time)
+        indicators = self._streamer.indicators
+        if self._rule_engine.rules and indicators is not None:
+            values = indicators.values(self._symbol)
+            values[PRICE] = price
+            hits += self._rule_engine.update(values)
+        if not hits:
+            return
+        fired_at = time.perf_counter()
+        # One sound per direction even when a move crosses several levels at once.
+        counts: dict[str, int] = {}
+        for hit in hits:
+            counts[hit.direction] = counts.get(hit.direction, 0) + 1
+        for direction, count in counts.items():
+            self._play_alert(direction, count, fired_at)
+
+    def _refresh_indicators(self) -> None:
+        indicators = self._streamer.indicators
+        if self._indicator_label is None or indicators is None:
+            return
+        values = indicators.values(self._symbol)
+        # Non-breaking spaces keep each caption on the line of its value when the text wraps.
+        parts = [
+            f"{self._indicator_caption(name)}\u00a0{values[name]:,.2f}" for name in self._shown_indicators if name in values
+        ]
+        text = " · ".join(parts)
+        if text != self._indicator_label.text():
+            self._indicator_label.setText(text)
+
+    @staticmethod
+    def _indicator_caption(name: str) -> str:
+        kind, _, span = name.partition("_")
+        caption = "σ" if kind == "std" else kind.upper()
+        return f"{caption}\u00a0{span}" if span else caption
 
     def _open_alert_dialog(self) -> None:
-        dialog = AlertThresholdDialog(self._alert_above, self._alert_below, self)
+        dialog = AlertThresholdDialog(
+            self._alert_engine.levels(ABOVE),
+            self._alert_engine.levels(BELOW),
+            self._move_engine.rules,
+            self,
+        )
         if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
-            above, below = dialog.values
+            above, below, moves = dialog.values
             self._set_alert_thresholds(above, below)
-            save_alerts(above, below)
+            self._move_engine.set_rules(moves)
+            if self._config_watcher is not None:
+                self._config_watcher.save_alerts(above, below, moves)
+            else:
+                save_alerts(above, below, moves)
             self._log(
-                f"Alertas atualizados: acima={above if above is not None else 'desativado'}, "
-                f"abaixo={below if below is not None else 'desativado'}"
+                f"Alertas atualizados: acima={list(above) or 'desativado'}, "
+                f"abaixo={list(below) or 'desativado'}, "
+                f"movimento={[str(rule) for rule in moves] or 'desativado'}"
             )
 
-    def _set_alert_thresholds(self, alert_above: float | None, alert_below: float | None) -> None:
-        self._alert_above = alert_above
-        self._alert_below = alert_below
-        self._last_alert_ts = {"above": 0.0, "below": 0.0}
-        self._alert_ready = {
-            "above": alert_above is not None,
-            "below": alert_below is not None,
-        }
+    def _set_alert_thresholds(self, alert_above: Iterable[float], alert_below: Iterable[float]) -> None:
+        self._alert_engine.set_levels(alert_above, alert_below)
 
-    def _play_alert(self, key: str) -> None:
-        path = self._alert_sounds.get(key)
-        if not path:
-            self._log(f"Arquivo de áudio para alerta '{key}' não encontrado.")
-            return
-        self._audio_manager.play(key, path)
+    def _preload_alert_audio(self) -> None:
+        self._audio.preload({key: path for key, path in self._alert_sounds.items() if path})
+
+    def _play_alert(self, key: str, count: int = 1, fired_at: float | None = None) -> None:
+        self._audio.play(key, self._alert_sounds.get(key), count, fired_at)
 
-    def _format_price(self, price: float) -> str:
-        formatted = f"{price:,.2f}"
-        if self._currency_prefix == "R$":
-            formatted = formatted.replace(",", "v").replace(".", ",").replace("v", ".")
-        prefix = f"{self._currency_prefix} " if self._currency_prefix else ""
-        return f"{prefix}{formatted}".strip()
+    @QtCore.pyqtSlot(str, int)
+    def _show_alert_badge(self, key: str, count: int) -> None:
+        arrow = "▲" if key == ABOVE else "▼"
+        self._alert_badge.setText(f"{arrow} ×{count}" if count > 1 else arrow)
+        self._alert_badge.adjustSize()
+        self._alert_badge.move(self.width() - self._alert_badge.width() - 22, 20)
+        self._alert_badge.raise_()
+        self._alert_badge.show()
+        self._alert_badge_timer.start()
 
     def _place_initially(self) -> None:
         screen = QtGui.QGuiApplication.primaryScreen()
@@ -254,31 +469,74 @@ class FloatingPriceWidget(QtWidgets.QWidget):
         return ""
 
 
-class _AlertAudioManager(QtCore.QObject):
-    """Simple helper around QMediaPlayer to play short alert sounds."""
+class _MetricsOverlay(QtWidgets.QLabel):
+    """Plain-text dump of the metrics registry drawn over the price."""
 
-    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+    def __init__(self, metrics: MetricsRegistry, parent: QtWidgets.QWidget) -> None:
         super().__init__(parent)
-        self._players: dict[str, QMediaPlayer] = {}
-        self._audio_outputs: dict[str, QAudioOutput] = {}
-
-    def play(self, key: str, path: Path) -> None:
-        player = self._players.get(key)
-        audio_output = self._audio_outputs.get(key)
-
-        if player is None or audio_output is None:
-            audio_output = QAudioOutput()
-            player = QMediaPlayer()
-            player.setAudioOutput(audio_output)
-            self._players[key] = player
-            self._audio_outputs[key] = audio_output
-
-        if player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-            player.stop()
-
-        audio_output.setVolume(1.0)
-        player.setSource(QtCore.QUrl.fromLocalFile(str(path)))
-        player.play()
+        self._metrics = metrics
+        self._last_sample: tuple[float, float, float, float, float] | None = None
+        self.setFont(QtGui.QFont("Monospace", 8))
+        self.setStyleSheet("color: #e0e0e0; background-color: rgba(0, 0, 0, 225); padding: 6px;")
+        self.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self._refresh)
+        self.hide()
+
+    def showEvent(self, a0: QtGui.QShowEvent | None) -> None:  # noqa: N802 - Qt API
+        super().showEvent(a0)
+        self._last_sample = None
+        self._refresh()
+        self._timer.start()
+
+    def hideEvent(self, a0: QtGui.QHideEvent | None) -> None:  # noqa: N802 - Qt API
+        self._timer.stop()
+        super().hideEvent(a0)
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        received = self._value("cfm_messages_received_total")
+        parsed = self._value("cfm_messages_parsed_total")
+        received_bytes = self._value("cfm_received_bytes_total")
+        cpu = time.process_time()
+        rates = "msg/s    -"
+        usage = "net      -"
+        if self._last_sample is not None:
+            then, last_received, last_parsed, last_bytes, last_cpu = self._last_sample
+            elapsed = max(now - then, 1e-9)
+            rates = f"msg/s    {(received - last_received) / elapsed:,.0f} ({(parsed - last_parsed) / elapsed:,.0f} parsed)"
+            usage = f"net      {(received_bytes - last_bytes) / elapsed / 1024:,.1f} KB/s   cpu {(cpu - last_cpu) / elapsed:.1%}"
+        self._last_sample = (now, received, parsed, received_bytes, cpu)
+        connected_at = self._value("cfm_connection_start_time_seconds")
+        uptime = f"{time.time() - connected_at:,.0f}s" if connected_at else "offline"
+        lines = [
+            rates,
+            usage,
+            self._quantiles("parse", "cfm_parse_seconds", 1e6, "µs"),
+            self._quantiles("latency", "cfm_event_to_emit_seconds", 1e3, "ms"),
+            self._quantiles("queue", "cfm_queue_delay_seconds", 1e3, "ms"),
+            self._quantiles("slots", "cfm_gui_slot_seconds", 1e3, "ms"),
+            self._quantiles("alert", "cfm_alert_audio_seconds", 1e3, "ms"),
+            f"reconn   {self._value('cfm_reconnects_total'):.0f}   missed {self._value('cfm_trades_missed_total'):.0f}",
+            f"uptime   {uptime}",
+        ]
+        self.setText("\n".join(lines))
+
+    def _value(self, name: str) -> float:
+        metric = self._metrics.get(name)
+        if metric is None or isinstance(metric, Histogram):
+            return 0.0
+        return metric.value
+
+    def _quantiles(self, label: str, name: str, scale: float, unit: str) -> str:
+        metric = self._metrics.get(name)
+        if not isinstance(metric, Histogram) or not metric.count:
+            return f"{label:<8} -"
+        p50 = metric.quantile(0.5) * scale
+        p99 = metric.quantile(0.99) * scale
+        return f"{label:<8} p50≤{p50:g} p99≤{p99:g} {unit}"
 
 
 class AlertThresholdDialog(QtWidgets.QDialog):
@@ -286,25 +544,34 @@ class AlertThresholdDialog(QtWidgets.QDialog):
 
     def __init__(
         self,
-        alert_above: float | None,
-        alert_below: float | None,
+        alert_above: Iterable[float],
+        alert_below: Iterable[float],
+        move_alerts: Iterable[MoveRule] = (),
         parent: Optional[QtWidgets.QWidget] = None,
     ) -> None:
         super().__init__(parent)
         self.setWindowTitle("Alert thresholds")
         self.setModal(True)
-        self._result: tuple[float | None, float | None] = (alert_above, alert_below)
+        self._result: tuple[tuple[float, ...], tuple[float, ...], tuple[MoveRule, ...]] = (
+            tuple(alert_above),
+            tuple(alert_below),
+            tuple(move_alerts),
+        )
 
         layout = QtWidgets.QFormLayout()
 
-        self._above_input = QtWidgets.QLineEdit(self._format_value(alert_above))
-        self._above_input.setPlaceholderText("Ex.: 102500")
+        self._above_input = QtWidgets.QLineEdit(self._format_value(self._result[0]))
+        self._above_input.setPlaceholderText("Ex.: 102500; 105000.50")
         layout.addRow("Alert above", self._above_input)
 
-        self._below_input = QtWidgets.QLineEdit(self._format_value(alert_below))
-        self._below_input.setPlaceholderText("Ex.: 98000")
+        self._below_input = QtWidgets.QLineEdit(self._format_value(self._result[1]))
+        self._below_input.setPlaceholderText("Ex.: 98000; 95000")
         layout.addRow("Alert below", self._below_input)
 
+        self._move_input = QtWidgets.QLineEdit(", ".join(str(rule) for rule in self._result[2]))
+        self._move_input.setPlaceholderText("Ex.: 1.5%/60s, 3%/5m")
+        layout.addRow("Move alerts", self._move_input)
+
         buttons = QtWidgets.QDialogButtonBox(
             QtWidgets.QDialogButtonBox.StandardButton.Save
             | QtWidgets.QDialogButtonBox.StandardButton.Cancel
@@ -318,32 +585,46 @@ class AlertThresholdDialog(QtWidgets.QDialog):
         self._apply_scaling()
 
     @property
-    def values(self) -> tuple[float | None, float | None]:
+    def values(self) -> tuple[tuple[float, ...], tuple[float, ...], tuple[MoveRule, ...]]:
         return self._result
 
     def accept(self) -> None:  # type: ignore[override]
         try:
             above = self._parse(self._above_input.text())
             below = self._parse(self._below_input.text())
+            moves = self._parse_moves(self._move_input.text())
         except ValueError as exc:
             QtWidgets.QMessageBox.warning(self, "Invalid value", str(exc))
             return
-        self._result = (above, below)
+        self._result = (above, below, moves)
         super().accept()
 
     @staticmethod
-    def _parse(text: str) -> float | None:
-        stripped = text.strip()
-        if not stripped:
-            return None
+    def _parse(text: str) -> tuple[float, ...]:
+        # Commas are not separators: the prices on screen use them to group
+        # thousands ("102,500.00"), or as the decimal mark (R$).
+        parts = text.replace(";", " ").split()
+        if any("," in part for part in parts):
+            raise ValueError(
+                "Separe os níveis com espaço ou ponto e vírgula e escreva os preços sem vírgula (ex.: 102500.50)."
+            )
         try:
-            return float(stripped)
+            levels = {float(part) for part in parts}
         except ValueError as exc:  # pragma: no cover
             raise ValueError("Use números válidos ou deixe em branco para desativar.") from exc
+        if not all(math.isfinite(level) for level in levels):
+            raise ValueError("Use números válidos ou deixe em branco para desativar.")
+        return tuple(sorted(levels))
+
+    @staticmethod
+    def _parse_moves(text: str) -> tuple[MoveRule, ...]:
+        parts = text.replace(";", ",").split(",")
+        rules = {parse_move_rule(part) for part in parts if part.strip()}
+        return tuple(sorted(rules, key=lambda rule: (rule.window_ms, rule.percent)))
 
     @staticmethod
-    def _format_value(value: float | None) -> str:
-        return "" if value is None else f"{value:.2f}"
+    def _format_value(levels: Iterable[float]) -> str:
+        return "; ".join(f"{level:.2f}" for level in levels)
 
     def _apply_scaling(self) -> None:
         font = self.font()
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from crypto_float_monitor.widget import AlertThresholdDialog  # noqa: E402
+
+
+@pytest.mark.parametrize("text", ["nan", "100 inf", "-inf", "abc"])
+def test_rejects_invalid_levels(text):
+    with pytest.raises(ValueError):
+        AlertThresholdDialog._parse(text)
+
+
+def test_parses_levels():
+    assert AlertThresholdDialog._parse("") == ()
+    assert AlertThresholdDialog._parse("105000 102500.5  98000") == (98000.0, 102500.5, 105000.0)
+
+
+def test_levels_are_separated_by_spaces_or_semicolons():
+    assert AlertThresholdDialog._parse("102500; 105000.50;98000") == (98000.0, 102500.0, 105000.5)
+    levels = (98000.0, 102500.5)
+    assert AlertThresholdDialog._parse(AlertThresholdDialog._format_value(levels)) == levels
+
+
+@pytest.mark.parametrize("text", ["102,500", "102,500.00", "98000, 95000", "102500,50"])
+def test_rejects_commas_instead_of_splitting_on_them(text):
+    with pytest.raises(ValueError):
+        AlertThresholdDialog._parse(text)
@@ -0,0 +1,177 @@
+import random
+
+import pytest
+
+from crypto_float_monitor.alerts import ABOVE, BELOW, DIRECTIONS, AlertEngine, MoveAlertEngine, MoveRule, _MoveWindow
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ReferenceAlerts:
+    """The widget's original ``_maybe_trigger_alert``, one independent threshold per level."""
+
+    def __init__(self, above, below, cooldown, clock):
+        self.cooldown = cooldown
+        self.clock = clock
+        self.levels = {ABOVE: sorted(set(above)), BELOW: sorted(set(below))}
+        self.last_alert_ts = {(direction, level): 0.0 for direction in self.levels for level in self.levels[direction]}
+        self.alert_ready = dict.fromkeys(self.last_alert_ts, True)
+
+    def add(self, direction, level):
+        if level not in self.levels[direction]:
+            self.levels[direction] = sorted([*self.levels[direction], level])
+            self.last_alert_ts[(direction, level)] = 0.0
+            self.alert_ready[(direction, level)] = True
+
+    def remove(self, direction, level):
+        if level in self.levels[direction]:
+            self.levels[direction].remove(level)
+            del self.last_alert_ts[(direction, level)], self.alert_ready[(direction, level)]
+
+    def update(self, price):
+        now = self.clock()
+        hits = []
+        for level in self.levels[ABOVE]:
+            key = (ABOVE, level)
+            if price >= level:
+                if self.alert_ready[key] and now - self.last_alert_ts[key] >= self.cooldown:
+                    hits.append(key)
+                    self.last_alert_ts[key] = now
+                    self.alert_ready[key] = False
+            elif price < level:
+                self.alert_ready[key] = True
+        for level in self.levels[BELOW]:
+            key = (BELOW, level)
+            if price <= level:
+                if self.alert_ready[key] and now - self.last_alert_ts[key] >= self.cooldown:
+                    hits.append(key)
+                    self.last_alert_ts[key] = now
+                    self.alert_ready[key] = False
+            elif price > level:
+                self.alert_ready[key] = True
+        return sorted(hits)
+
+
+def _hits(engine, price):
+    return sorted((hit.direction, hit.level) for hit in engine.update(price))
+
+
+def test_single_level_crossing_cooldown_and_rearm():
+    clock = FakeClock()
+    engine = AlertEngine(cooldown=60.0, clock=clock)
+    engine.set_levels(above=[100.0])
+    assert _hits(engine, 99.0) == []
+    assert _hits(engine, 100.0) == [(ABOVE, 100.0)]  # at the level counts
+    assert _hits(engine, 101.0) == []  # fired already, not re-armed
+    clock.now += 10
+    assert _hits(engine, 99.0) == []  # re-arms
+    assert _hits(engine, 100.5) == []  # crossed again, but cooling down
+    clock.now += 50
+    assert _hits(engine, 100.5) == [(ABOVE, 100.0)]  # cooldown over, still beyond
+    clock.now += 100
+    assert _hits(engine, 99.9) == []
+    clock.now += 1
+    assert _hits(engine, 100.1) == [(ABOVE, 100.0)]
+
+
+def test_level_crossed_during_cooldown_is_dropped_once_the_price_returns():
+    clock = FakeClock()
+    engine = AlertEngine(cooldown=60.0, clock=clock)
+    engine.set_levels(below=[50.0])
+    assert _hits(engine, 49.0) == [(BELOW, 50.0)]
+    assert _hits(engine, 51.0) == []
+    assert _hits(engine, 49.5) == []  # cooling down
+    assert _hits(engine, 50.5) == []  # back over: re-armed, nothing pending
+    clock.now += 61
+    assert _hits(engine, 50.5) == []
+    assert _hits(engine, 50.0) == [(BELOW, 50.0)]
+
+
+def test_adding_a_level_keeps_existing_levels_rearming():
+    clock = FakeClock()
+    engine = AlertEngine(cooldown=60.0, clock=clock)
+    engine.set_levels(above=[100.0], below=[90.0])
+    assert _hits(engine, 101.0) == [(ABOVE, 100.0)]
+    engine.add_level(ABOVE, 200.0)
+    clock.now += 100
+    assert _hits(engine, 99.0) == []  # back under 100: re-armed
+    assert _hits(engine, 101.0) == [(ABOVE, 100.0)]
+    engine.add_level(BELOW, 95.0)
+    engine.add_level(ABOVE, 101.0)
+    assert _hits(engine, 101.0) == [(ABOVE, 101.0)]  # only the new level already beyond the price
+
+
+def test_non_finite_levels_are_ignored():
+    engine = AlertEngine(cooldown=60.0, clock=FakeClock())
+    nan = float("nan")
+    engine.set_levels(above=[nan, 100.0, 105.0, 99.0, float("inf")], below=[float("-inf"), nan])
+    engine.add_level(ABOVE, nan)
+    engine.add_level(BELOW, float("-inf"))
+    assert engine.levels(ABOVE) == (99.0, 100.0, 105.0)
+    assert engine.levels(BELOW) == ()
+    assert _hits(engine, 98.0) == []
+    assert _hits(engine, 106.0) == [(ABOVE, 99.0), (ABOVE, 100.0), (ABOVE, 105.0)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_the_original_single_threshold_alerts(seed):
+    rng = random.Random(seed)
+    above = [float(rng.randint(90, 110)) for _ in range(rng.randint(1, 8))]
+    below = [float(rng.randint(90, 110)) for _ in range(rng.randint(1, 8))]
+    cooldown = rng.choice([0.0, 5.0, 10.0])
+    clock = FakeClock()
+    engine = AlertEngine(cooldown=cooldown, clock=clock)
+    engine.set_levels(above, below)
+    reference = ReferenceAlerts(above, below, cooldown, clock)
+    price = 100.0
+    for _ in range(2000):
+        # Half-unit steps land exactly on the whole-number levels now and then.
+        price = min(115.0, max(85.0, price + rng.choice([-1.5, -1.0, -0.5, 0.0, 0.5, 1.0, 1.5, rng.uniform(-6, 6)])))
+        clock.now += rng.choice([0.0, 0.5, 1.0, 3.0])
+        if rng.random() < 0.02:
+            # Live edits, as a config reload makes them.
+            direction, level = rng.choice(DIRECTIONS), float(rng.randint(90, 110))
+            if rng.random() < 0.5:
+                engine.add_level(direction, level)
+                reference.add(direction, level)
+            else:
+                engine.remove_level(direction, level)
+                reference.remove(direction, level)
+        assert _hits(engine, price) == reference.update(price)
+
+
+def test_move_rule_fires_once_per_move_and_rearms():
+    clock = FakeClock()
+    engine = MoveAlertEngine([MoveRule(1.0, 60_000)], cooldown=0.0, clock=clock)
+    assert engine.update(100.0, 0) == []
+    hits = engine.update(101.0, 1_000)
+    assert [(hit.direction, hit.reference) for hit in hits] == [(ABOVE, 100.0)]
+    assert engine.update(101.5, 2_000) == []  # still over the low: not re-armed
+    assert engine.update(100.5, 3_000) == []  # under 1% over the low again: re-armed
+    assert [hit.direction for hit in engine.update(101.2, 4_000)] == [ABOVE]
+    # Once the low of 100 has left the window, moves are measured from 100.5.
+    assert engine.update(100.9, 61_000) == []
+    hits = engine.update(101.6, 62_000)
+    assert [(hit.direction, hit.reference) for hit in hits] == [(ABOVE, 100.5)]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_move_window_matches_brute_force_min_max(seed):
+    rng = random.Random(seed)
+    window_ms = rng.choice([1, 250, 1_000, 60_000])
+    window = _MoveWindow(window_ms)
+    seen: list[tuple[int, float]] = []
+    trade_time = 0
+    for _ in range(3000):
+        trade_time += rng.choice([0, 0, 1, 10, 100, 700])  # equal trade times are common
+        price = round(rng.uniform(99.0, 101.0), rng.choice([0, 1, 2]))  # and so are repeated prices
+        seen.append((trade_time, price))
+        in_window = [value for time, value in seen if time > trade_time - window_ms]
+        assert window.push(price, trade_time) == (min(in_window), max(in_window))
+        assert len(window.lows) <= len(in_window) and len(window.highs) <= len(in_window)
@@ -0,0 +1,27 @@
+from crypto_float_monitor.alerts import ABOVE, MoveAlertEngine, MoveRule
+from crypto_float_monitor.coalescing import PriceCoalescer
+
+
+def _bar(trades):
+    coalescer = PriceCoalescer()
+    for price, trade_time in trades:
+        coalescer.push("BTCUSDT", price, 1.0, trade_time)
+    return coalescer.drain()["BTCUSDT"]
+
+
+def test_timed_path_dates_each_extreme():
+    bar = _bar([(100.0, 10), (98.0, 20), (103.0, 30), (101.0, 40), (99.0, 50)])
+    assert bar.path() == (100.0, 98.0, 103.0, 99.0)
+    assert bar.timed_path() == ((100.0, 10), (98.0, 20), (103.0, 30), (99.0, 50))
+    bar = _bar([(100.0, 10), (103.0, 20), (98.0, 30), (99.0, 40)])
+    assert bar.timed_path() == ((100.0, 10), (103.0, 20), (98.0, 30), (99.0, 40))
+    assert _bar([(100.0, 10)]).timed_path() == ((100.0, 10),) * 4
+
+
+def test_move_window_sees_the_time_of_a_spike_inside_a_frame():
+    engine = MoveAlertEngine([MoveRule(1.0, 1_000)], cooldown=0.0, clock=lambda: 0.0)
+    engine.update(100.0, 0)
+    # Up 1.5% at 900 ms, inside the window; the frame's last trade is at 1500 ms, outside it.
+    bar = _bar([(101.5, 900), (101.4, 1_500)])
+    hits = [hit for price, trade_time in bar.timed_path() for hit in engine.update(price, trade_time)]
+    assert [(hit.direction, hit.price, hit.reference) for hit in hits] == [(ABOVE, 101.5, 100.0)]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from crypto_float_monitor import config
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+
+    def write(**values):
+        path = config.config_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**config.DEFAULT_CONFIG, **values}), encoding="utf-8")
+        return config.load_config(create=False)
+
+    return write
+
+
+@pytest.mark.parametrize(
+    ("value", "port"),
+    [
+        (9464, 9464),
+        ("9464", 9464),
+        (9464.0, 9464),
+        (0, 0),
+        (None, 0),
+        (float("nan"), 0),
+        (float("inf"), 0),
+        ("nan", 0),
+        ("-inf", 0),
+        (-1, 0),
+        (65536, 0),
+        (94.5, 0),
+        (True, 0),
+        ("port", 0),
+    ],
+)
+def test_metrics_port_is_a_valid_port_or_off(write_config, value, port):
+    assert write_config(metrics_port=value).metrics_port == port
+
+
+@pytest.mark.parametrize(
+    ("value", "refresh_hz"),
+    [
+        (60, 60.0),
+        ("10", 10.0),
+        (0, 0.0),
+        (None, 30.0),
+        (float("nan"), 30.0),
+        (float("inf"), 30.0),
+        ("nan", 30.0),
+        (-5, 30.0),
+        ("fast", 30.0),
+        (False, 30.0),
+    ],
+)
+def test_refresh_hz_falls_back_to_the_default_unless_zero_is_explicit(write_config, value, refresh_hz):
+    assert write_config(refresh_hz=value).refresh_hz == refresh_hz
+
+
+def test_alert_levels_drop_non_finite_values(write_config):
+    loaded = write_config(alert_above=[float("nan"), 100, "105", "inf", 99], alert_below=float("-inf"))
+    assert loaded.alert_above == (99.0, 100.0, 105.0)
+    assert loaded.alert_below == ()
+
+
+@pytest.mark.parametrize(
+    ("value", "capacity"),
+    [
+        (5000, 5000),
+        ("5000", 5000),
+        (2.5e4, 25_000),
+        (0, 1),
+        (-10, 1),
+        (1e12, config.MAX_HISTORY_CAPACITY),
+        (float("inf"), 100_000),
+        (float("nan"), 100_000),
+        ("-inf", 100_000),
+        (None, 100_000),
+        ("lots", 100_000),
+        (True, 100_000),
+    ],
+)
+def test_history_capacity_is_finite_and_bounded(write_config, value, capacity):
+    assert write_config(history_capacity=value).history_capacity == capacity
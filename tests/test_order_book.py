@@ -0,0 +1,92 @@
+import shutil
+import threading
+from pathlib import Path
+
+from crypto_float_monitor.decoders import DepthUpdate, decode_depth_update
+from crypto_float_monitor.order_book import DepthBooks, OrderBook, file_snapshot_source
+
+SNAPSHOT = Path(__file__).resolve().parent / "data" / "depth_snapshot.json"
+NEWER_SNAPSHOT = """{
+  "lastUpdateId": 111,
+  "bids": [["99.75", "1.0"], ["99.50", "2.0"]],
+  "asks": [["100.25", "0.5"], ["100.50", "1.0"]]
+}"""
+
+
+def _update(first, final, bids=(), asks=()):
+    return DepthUpdate("BTCUSDT", first, final, final, [list(level) for level in bids], [list(level) for level in asks])
+
+
+def test_decodes_raw_and_combined_diff_frames():
+    raw = '{"e":"depthUpdate","E":5,"s":"BTCUSDT","U":101,"u":103,"b":[["99.5","0"]],"a":[]}'
+    update = decode_depth_update(raw)
+    assert update == DepthUpdate("BTCUSDT", 101, 103, 5, [["99.5", "0"]], [])
+    assert decode_depth_update(f'{{"stream":"btcusdt@depth@100ms","data":{raw}}}') == update
+    assert decode_depth_update('{"e":"trade","p":"1"}') is None
+
+
+def test_book_applies_contiguous_diffs_and_reports_gaps():
+    book = OrderBook("BTCUSDT")
+    book.load_snapshot(file_snapshot_source(SNAPSHOT)("BTCUSDT"))
+    assert book.apply(_update(90, 100, bids=[("99.50", "9")]))  # already in the snapshot: ignored
+    assert book.bids.best() == (99.5, 2.0)
+    assert book.apply(_update(95, 102, bids=[("99.50", "0"), ("99.75", "1")], asks=[("100.50", "0")]))
+    assert book.bids.top(2) == [(99.75, 1.0), (99.0, 1.5)]
+    assert book.asks.best() == (101.0, 3.0)
+    assert book.last_update_id == 102
+    assert not book.apply(_update(104, 105))  # 103 is missing
+    assert book.last_update_id == 102
+
+
+def test_gap_resyncs_from_a_newer_snapshot(tmp_path):
+    shutil.copy(SNAPSHOT, tmp_path / "BTCUSDT.json")
+    load = file_snapshot_source(tmp_path)
+    fetches = []
+    fetched = threading.Condition()
+
+    def source(symbol):
+        snapshot = load(symbol)
+        with fetched:
+            fetches.append(snapshot.last_update_id)
+            fetched.notify_all()
+        return snapshot
+
+    tops = []
+    resyncs = []
+    synced = threading.Event()
+
+    def on_book(symbol, top):
+        tops.append(top)
+        synced.set()
+
+    books = DepthBooks(source, on_book=on_book, on_resync=resyncs.append, retry_delay=0.01)
+    try:
+        # Buffered while the first snapshot is fetched, then replayed on top of it.
+        books.handle(_update(95, 101, bids=[("99.50", "3")]))
+        assert synced.wait(5)
+        assert books.book("BTCUSDT").last_update_id == 101
+        assert tops[-1].bid_quantity == 3.0
+        books.handle(_update(102, 103, asks=[("100.50", "0")]))
+        assert books.top("BTCUSDT").ask == 101.0
+
+        # 104..109 never arrive: the book is dropped and synced again.
+        synced.clear()
+        books.handle(_update(110, 112, bids=[("99.75", "4")]))
+        assert resyncs == ["BTCUSDT"]
+        assert books.book("BTCUSDT") is None
+        with fetched:
+            # The fixture still says 100, older than the buffered event: it is fetched again...
+            assert fetched.wait_for(lambda: len(fetches) >= 3, 5)
+        assert not synced.is_set()
+        # ...until a snapshot that the buffered event continues appears.
+        (tmp_path / "BTCUSDT.json").write_text(NEWER_SNAPSHOT, encoding="utf-8")
+        assert synced.wait(5)
+        book = books.book("BTCUSDT")
+        assert book.last_update_id == 112
+        assert book.bids.top(2) == [(99.75, 4.0), (99.5, 2.0)]
+        assert books.top("BTCUSDT").ask == 100.25
+        books.handle(_update(113, 113, asks=[("100.25", "0")]))
+        assert books.top("BTCUSDT").ask == 100.5
+        assert resyncs == ["BTCUSDT"]
+    finally:
+        books.close()
@@ -0,0 +1,53 @@
+import pytest
+
+from crypto_float_monitor.decoders import TradeTick
+from crypto_float_monitor.process_stream import _HEADER, _SLOT, TickRing, process_stream_available
+
+pytestmark = pytest.mark.skipif(not process_stream_available(), reason="needs multiprocessing.shared_memory")
+
+
+@pytest.fixture
+def ring():
+    ring = TickRing.create(slots=8)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+def _tick(trade_id):
+    return TradeTick("BTCUSDT", 100.0 + trade_id, 0.5, 1_700_000_000_000 + trade_id, trade_id, trade_id % 2 == 0)
+
+
+def test_reader_gets_every_record_in_order(ring):
+    reader = TickRing.attach(ring.name)
+    try:
+        for trade_id in range(5):
+            ring.write("BTCUSDT", _tick(trade_id))
+        ticks, position = reader.read(0)
+        assert ticks == [_tick(trade_id) for trade_id in range(5)]
+        assert position == 5
+        ring.write("ETHUSDT", _tick(5))
+        ticks, position = reader.read(position)
+        assert ticks == [_tick(5)._replace(symbol="ETHUSDT")]
+        assert reader.read(position) == ([], 6)
+    finally:
+        reader.close()
+
+
+def test_lapped_reader_skips_to_the_oldest_record_left(ring):
+    for trade_id in range(20):
+        ring.write("BTCUSDT", _tick(trade_id))
+    ticks, position = ring.read(3)
+    assert [tick.trade_id for tick in ticks] == list(range(12, 20))
+    assert position == 20
+
+
+def test_torn_slot_is_skipped(ring):
+    for trade_id in range(4):
+        ring.write("BTCUSDT", _tick(trade_id))
+    # What the reader sees while the writer is half-way through slot 1: an odd sequence.
+    offset = _HEADER.size + 1 * _SLOT.size
+    ring._buffer[offset : offset + 8] = (3).to_bytes(8, "little")
+    ticks, position = ring.read(0)
+    assert [tick.trade_id for tick in ticks] == [0, 2, 3]
+    assert position == 4
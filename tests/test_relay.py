@@ -0,0 +1,82 @@
+import json
+import os
+import selectors
+import socket
+import threading
+
+import pytest
+
+from crypto_float_monitor import relay
+from crypto_float_monitor.decoders import TradeTick
+from crypto_float_monitor.stream_core import StreamSettings
+
+pytestmark = pytest.mark.skipif(not relay.relay_available(), reason="needs Unix sockets and fcntl")
+
+
+@pytest.fixture
+def hub(tmp_path):
+    lock_fd = os.open(tmp_path / "relay.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    hub = relay.RelayHub(StreamSettings(), lock_fd, tmp_path / "relay.sock")
+    yield hub
+    for subscriber in hub._subscribers:
+        subscriber.sock.close()
+    hub._selector.close()
+    os.close(lock_fd)
+    os.close(hub._wake_read)
+    os.close(hub._wake_write)
+
+
+def _subscribe(hub, sock):
+    # What _accept does, on one end of a socket pair instead of the listener.
+    sock.setblocking(False)
+    subscriber = relay._Subscriber(sock)
+    hub._subscribers = (*hub._subscribers, subscriber)
+    hub._selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, subscriber)
+    return subscriber
+
+
+def _control(method, symbols):
+    return json.dumps({"method": method, "params": [f"{symbol.lower()}@trade" for symbol in symbols]}).encode()
+
+
+def test_unsubscribe_while_publishing_does_not_deadlock(hub):
+    ours, theirs = socket.socketpair()
+    subscriber = _subscribe(hub, ours)
+    hub._control(subscriber, _control("SUBSCRIBE", ["AAAUSDT", "BBBUSDT"]))
+    stop = threading.Event()
+
+    def publish():
+        # The upstream thread: _handle_tick calls publish with the core's tick lock held.
+        trade_id = 0
+        while not stop.is_set():
+            trade_id += 1
+            hub._upstream._handle_tick(TradeTick("BBBUSDT", 100.0, 1.0, trade_id, trade_id, False))
+
+    def drain():
+        theirs.settimeout(0.05)
+        while not stop.is_set():
+            try:
+                theirs.recv(65536)
+            except OSError:
+                pass
+
+    def toggle():
+        # The hub thread, handling the subscriber's control frames.
+        for _ in range(300):
+            hub._control(subscriber, _control("UNSUBSCRIBE", ["AAAUSDT"]))
+            hub._control(subscriber, _control("SUBSCRIBE", ["AAAUSDT"]))
+
+    threads = [threading.Thread(target=target, daemon=True) for target in (publish, drain)]
+    for thread in threads:
+        thread.start()
+    controller = threading.Thread(target=toggle, daemon=True)
+    controller.start()
+    controller.join(timeout=20)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    theirs.close()
+
+    assert not controller.is_alive(), "hub thread stuck on the upstream tick lock"
+    assert not any(thread.is_alive() for thread in threads), "upstream thread stuck on the subscriber lock"
+    assert subscriber.symbols == {"AAAUSDT", "BBBUSDT"}